@@ -0,0 +1,331 @@
+"""
+라벨링/분석 핫패스 CPU 마이크로 벤치마크
+
+    python benchmarks/cpu.py                                  # 측정만
+    python benchmarks/cpu.py --save benchmarks/baselines/cpu.json
+    python benchmarks/cpu.py --compare benchmarks/baselines/cpu.json --threshold 0.1
+
+합성 한국어 채팅 코퍼스(small/medium/large)로 각 함수를 반복 실행해 연산 1회당 시간(ns)의
+중앙값/최솟값을 잽니다. --compare는 기준 파일과 중앙값을 비교해 threshold보다 느려진
+항목을 표시하고 종료 코드 1을 반환합니다. 기준값은 같은 머신에서 만든 것과만 비교하세요.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from core.labeling.rule_engine import KEYWORDS, label_message  # noqa: E402
+from providers.fake_client import fake_completion  # noqa: E402
+from schemas.labeling import HistoryMessage  # noqa: E402
+from schemas.labeling_trait_vector import LabeledMessage  # noqa: E402
+from services.analysis_cache import AnalysisCache  # noqa: E402
+from services.enhanced_couple_analysis_service import (  # noqa: E402
+    enhanced_couple_analysis_service,
+)
+from services.labeling_service import (  # noqa: E402
+    LabelingService,
+    build_labeling_prompt,
+)
+from services.labeling_trait_vector_service import (  # noqa: E402
+    LabelingTraitVectorService,
+    build_labeling_and_summary_prompt,
+)
+
+SIZES = {"small": 100, "medium": 1_000, "large": 10_000}
+
+_FILLERS = [
+    "오늘 회사에서 회의가 길어졌어",
+    "저녁은 뭐 먹을까",
+    "주말에 영화 보러 갈래",
+    "방금 집에 도착했어",
+    "내일 아침 일찍 나가야 해",
+    "어제 얘기한 카페 가볼까",
+    "비 온다는데 우산 챙겨",
+    "요즘 너무 피곤하다",
+]
+_KEYWORD_PHRASES = sorted(
+    {kw for labels in KEYWORDS.values() for kws in labels.values() for kw in kws}
+)
+
+
+def make_corpus(n: int, seed: int = 0) -> List[HistoryMessage]:
+    """
+    합성 채팅 메시지 n개 (문장 1~3개, 약 60%는 키워드 포함, 시드가 같으면 같은 코퍼스)
+    """
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(n):
+        parts = rng.sample(_FILLERS, rng.randint(1, 3))
+        if rng.random() < 0.6:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(_KEYWORD_PHRASES))
+        messages.append(
+            HistoryMessage(sender=rng.choice(["male", "female"]), text=" ".join(parts))
+        )
+    return messages
+
+
+# (벤치마크 이름, 준비 함수) — 준비 함수는 (측정할 함수, 함수 1회당 연산 수)를 반환
+Case = Tuple[str, Callable[[], Tuple[Callable[[], Any], int]]]
+
+
+def _cases(size: str, n: int) -> List[Case]:
+    corpus = make_corpus(n)
+    texts = [m.text for m in corpus]
+
+    def rule_engine_label_message():
+        return (lambda: [label_message(t) for t in texts]), n
+
+    def label_message_history():
+        return (lambda: LabelingService.label_message_history(corpus)), n
+
+    def compute_trait_vector():
+        labeled = [
+            LabeledMessage(**r) for r in LabelingService.label_message_history(corpus)
+        ]
+        return (
+            lambda: LabelingTraitVectorService.compute_trait_vector("u1", labeled)
+        ), n
+
+    def build_prompt():
+        return (lambda: build_labeling_prompt(KEYWORDS, corpus)), 1
+
+    def parse_labeling_response():
+        # 라벨링 + 요약 응답 파싱 후 LabeledMessage 변환 (label_trait_vector 경로)
+        response = fake_completion(build_labeling_and_summary_prompt(KEYWORDS, corpus))
+
+        def run():
+            result = json.loads(response)
+            return [LabeledMessage(**m) for m in result["messages"]]
+
+        return run, n
+
+    return [
+        (f"rule_engine.label_message/{size}", rule_engine_label_message),
+        (f"labeling_service.label_message_history/{size}", label_message_history),
+        (f"trait_vector.compute_trait_vector/{size}", compute_trait_vector),
+        (f"labeling_service.build_labeling_prompt/{size}", build_prompt),
+        (f"parse.labeling_response/{size}", parse_labeling_response),
+    ]
+
+
+def _fixed_cases() -> List[Case]:
+    def parse_couple_analysis():
+        response = fake_completion(
+            '다음 형식으로 응답해주세요: {"summary": "요약", "advice": "조언", '
+            '"compatibility_score": 85, "personality_analysis": {"user": '
+            '{"dominant_traits": ["특징1"], "strengths": ["강점1"]}}, '
+            '"relationship_insights": ["인사이트1"], '
+            '"improvement_suggestions": ["개선안1"]}'
+        )
+        return (
+            lambda: enhanced_couple_analysis_service._parse_json_response(response)
+        ), 1
+
+    def cache_keys(n: int = 1_000):
+        return [
+            AnalysisCache.generate_key({"name": f"user{i}", "mbti": "INTJ"}, {"i": i})
+            for i in range(n)
+        ]
+
+    def cache_set():
+        keys = cache_keys()
+
+        def run():
+            for key in keys:
+                AnalysisCache.set(key, {"score": 80})
+            AnalysisCache.clear()
+
+        return run, len(keys)
+
+    def cache_get_hit():
+        keys = cache_keys()
+        for key in keys:
+            AnalysisCache.set(key, {"score": 80})
+        return (lambda: [AnalysisCache.get(key) for key in keys]), len(keys)
+
+    def cache_generate_key():
+        return (
+            lambda: AnalysisCache.generate_key(
+                {"name": "김철수", "mbti": "INTJ", "age": 28},
+                {"name": "이영희", "mbti": "ENFP", "age": 26},
+            )
+        ), 1
+
+    return [
+        ("parse.couple_analysis_response", parse_couple_analysis),
+        ("analysis_cache.set", cache_set),
+        ("analysis_cache.get_hit", cache_get_hit),
+        ("analysis_cache.generate_key", cache_generate_key),
+    ]
+
+
+def measure(
+    func: Callable[[], Any], ops: int, min_time: float, repeats: int
+) -> Dict[str, float]:
+    """
+    전체 측정이 약 min_time초가 되도록 반복 횟수를 정한 뒤 repeats번 측정 (연산 1회당 ns)
+    """
+    target = min_time / repeats
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= target or loops >= 1 << 20:
+            break
+        loops *= 2
+    loops = max(1, int(loops * target / max(elapsed, 1e-9)))
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter_ns() - started) / (loops * ops))
+    return {
+        "median_ns": round(statistics.median(samples), 1),
+        "min_ns": round(min(samples), 1),
+        "loops": loops,
+        "ops": ops,
+    }
+
+
+def run_suite(
+    sizes: List[str],
+    name_filter: str = "",
+    min_time: float = 0.5,
+    repeats: int = 5,
+) -> Dict[str, Dict[str, float]]:
+    cases: List[Case] = []
+    for size in sizes:
+        cases.extend(_cases(size, SIZES[size]))
+    cases.extend(_fixed_cases())
+    results: Dict[str, Dict[str, float]] = {}
+    for name, setup in cases:
+        if name_filter and name_filter not in name:
+            continue
+        func, ops = setup()
+        try:
+            results[name] = measure(func, ops, min_time, repeats)
+        finally:
+            AnalysisCache.clear()
+    return results
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    중앙값 기준 변화율. threshold(0.1 = 10%)보다 느려지면 regression
+    """
+    rows = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            rows.append({"name": name, "change": None, "regression": False})
+            continue
+        change = result["median_ns"] / before["median_ns"] - 1
+        rows.append({"name": name, "change": change, "regression": change > threshold})
+    return rows
+
+
+def _environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} µs"
+    return f"{ns:.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CPU 마이크로 벤치마크")
+    parser.add_argument(
+        "--sizes", default="small,medium,large", help="코퍼스 크기 (쉼표 구분)"
+    )
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 있는 항목만")
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="항목당 측정 시간(초)"
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", help="결과를 기준 파일(JSON)로 저장")
+    parser.add_argument("--compare", help="비교할 기준 파일(JSON)")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="regression 판정 기준 (0.1 = 10%%)"
+    )
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes.split(",") if s]
+    unknown = set(sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"알 수 없는 크기: {', '.join(sorted(unknown))}")
+
+    results = run_suite(sizes, args.filter, args.min_time, args.repeats)
+    report = {"environment": _environment(), "results": results}
+
+    rows = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        rows = {r["name"]: r for r in compare(baseline, results, args.threshold)}
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for name, result in results.items():
+            line = (
+                f"{name:<52} {_format_ns(result['median_ns']):>10}/op "
+                f"(min {_format_ns(result['min_ns'])})"
+            )
+            row = rows.get(name) if rows else None
+            if row is not None and row["change"] is not None:
+                flag = "  REGRESSION" if row["regression"] else ""
+                line += f"  {row['change']:+.1%}{flag}"
+            print(line)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if rows and any(r["regression"] for r in rows.values()):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""
+OpenAI / Anthropic API 형식을 흉내 내는 로컬 LLM 스텁 서버 (부하 테스트용, 네트워크 불필요)
+
+    python benchmarks/llm_stub.py --port 9100 --latency-ms 800 --jitter-ms 300 \\
+        --error-rate 0.02
+
+앱을 스텁에 연결:
+
+    OPENAI_API_BASE=http://127.0.0.1:9100/v1 OPENAI_API_KEY=stub \\
+    CLAUDE_API_BASE=http://127.0.0.1:9100/v1 CLAUDE_API_KEY=stub \\
+    PYTHONPATH=src python src/serve.py
+
+- POST /v1/chat/completions : OpenAI Chat Completions (stream=true면 SSE 청크 + [DONE])
+- POST /v1/messages         : Anthropic Messages
+                              (stream=true면 message_start ... message_stop 이벤트)
+
+응답 본문은 providers.fake_client.fake_completion과 같으므로 서비스가 파싱하는 JSON 형식을 지킴.
+지연은 첫 토큰까지의 시간, --stream-interval-ms는 스트리밍 청크 간격.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+
+from config import settings  # noqa: E402
+from providers import fake_client  # noqa: E402
+
+
+def _text(content: Any) -> str:
+    # content는 문자열 또는 [{"type": "text", "text": ...}] 블록 목록
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") for block in content or [] if isinstance(block, dict)
+    )
+
+
+def _prompt(messages: List[Dict[str, Any]]) -> str:
+    # 응답 형식은 마지막 user 메시지로 결정 (서비스 프롬프트는 모두 마지막 메시지에 있음)
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return _text(message.get("content"))
+    return ""
+
+
+def _sse(data: Dict[str, Any], event: str = "") -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _pace(chunks: List[str]) -> AsyncIterator[str]:
+    interval = settings.FAKE_LLM_STREAM_INTERVAL_MS / 1000
+    for i, chunk in enumerate(chunks):
+        if i and interval > 0:
+            await asyncio.sleep(interval)
+        yield chunk
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="LLM stub")
+
+    @app.get("/health")
+    async def health() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "gpt-3.5-turbo")
+        prompt = _prompt(body.get("messages", []))
+        await asyncio.sleep(fake_client.simulated_latency(prompt))
+        if fake_client.should_fail():
+            return JSONResponse(
+                {"error": {"message": "simulated failure", "type": "server_error"}},
+                status_code=500,
+            )
+        text = fake_client.fake_completion(prompt)
+        usage = {
+            "prompt_tokens": fake_client.count_tokens(prompt),
+            "completion_tokens": fake_client.count_tokens(text),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage")
+
+        def chunk(delta: Dict[str, Any], finish_reason=None) -> str:
+            return _sse(
+                {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                }
+            )
+
+        async def events() -> AsyncIterator[str]:
+            yield chunk({"role": "assistant", "content": ""})
+            async for piece in _pace(fake_client.chunk_text(text)):
+                yield chunk({"content": piece})
+            yield chunk({}, "stop")
+            if include_usage:
+                yield _sse(
+                    {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [],
+                        "usage": usage,
+                    }
+                )
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/messages")
+    async def messages(request: Request):
+        body = await request.json()
+        model = body.get("model", "claude-3-opus-20240229")
+        prompt = _prompt(body.get("messages", []))
+        await asyncio.sleep(fake_client.simulated_latency(prompt))
+        if fake_client.should_fail():
+            return JSONResponse(
+                {
+                    "type": "error",
+                    "error": {"type": "api_error", "message": "simulated failure"},
+                },
+                status_code=500,
+            )
+        text = fake_client.fake_completion(prompt)
+        input_tokens = fake_client.count_tokens(_text(body.get("system")) + prompt)
+        output_tokens = fake_client.count_tokens(text)
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+
+        if not body.get("stream"):
+            return {
+                "id": message_id,
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+            }
+
+        async def events() -> AsyncIterator[str]:
+            yield _sse(
+                {
+                    "type": "message_start",
+                    "message": {
+                        "id": message_id,
+                        "type": "message",
+                        "role": "assistant",
+                        "model": model,
+                        "content": [],
+                        "stop_reason": None,
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+                    },
+                },
+                "message_start",
+            )
+            yield _sse(
+                {
+                    "type": "content_block_start",
+                    "index": 0,
+                    "content_block": {"type": "text", "text": ""},
+                },
+                "content_block_start",
+            )
+            yield _sse({"type": "ping"}, "ping")
+            async for piece in _pace(fake_client.chunk_text(text)):
+                yield _sse(
+                    {
+                        "type": "content_block_delta",
+                        "index": 0,
+                        "delta": {"type": "text_delta", "text": piece},
+                    },
+                    "content_block_delta",
+                )
+            yield _sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+            yield _sse(
+                {
+                    "type": "message_delta",
+                    "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                    "usage": {"output_tokens": output_tokens},
+                },
+                "message_delta",
+            )
+            yield _sse({"type": "message_stop"}, "message_stop")
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="로컬 LLM 스텁 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument(
+        "--latency-ms", type=float, default=settings.FAKE_LLM_LATENCY_MS
+    )
+    parser.add_argument(
+        "--jitter-ms", type=float, default=settings.FAKE_LLM_LATENCY_JITTER_MS
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=settings.FAKE_LLM_ERROR_RATE
+    )
+    parser.add_argument(
+        "--stream-interval-ms",
+        type=float,
+        default=settings.FAKE_LLM_STREAM_INTERVAL_MS,
+    )
+    parser.add_argument(
+        "--chunk-chars", type=int, default=settings.FAKE_LLM_STREAM_CHUNK_CHARS
+    )
+    args = parser.parse_args()
+
+    settings.FAKE_LLM_LATENCY_MS = args.latency_ms
+    settings.FAKE_LLM_LATENCY_JITTER_MS = args.jitter_ms
+    settings.FAKE_LLM_ERROR_RATE = args.error_rate
+    settings.FAKE_LLM_STREAM_INTERVAL_MS = args.stream_interval_ms
+    settings.FAKE_LLM_STREAM_CHUNK_CHARS = args.chunk_chars
+
+    import uvicorn
+
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""
+엔드투엔드 부하 테스트 (실제 ASGI 앱 + 로컬 LLM 스텁)
+
+    python benchmarks/loadtest.py --levels 1,8,32,64 --duration 15
+    python benchmarks/loadtest.py --mix chat=1,batch=0 --llm-latency-ms 1500 --json
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000   # 이미 떠 있는 서버 대상
+
+기본 모드는 main.app을 같은 프로세스에서 ASGI로 직접 호출하고, LLM 호출은 실제 OpenAI
+클라이언트가 benchmarks/llm_stub.py(별도 프로세스)로 보냅니다. 동시 사용자 수(level)를
+늘려 가며 각 단계에서 처리량, p50/p95/p99 지연, 오류율, 워커 포화도를 보고합니다.
+
+워커 포화도:
+- 기본 모드: 동기 핸들러가 도는 스레드풀 사용률 (사용 중 스레드 / 전체, 평균과 최대)
+- --url 모드: /metrics의 http_requests_in_flight 평균 (응답한 워커 프로세스 기준)
+
+같은 --seed면 같은 요청 순서와 본문을 사용합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+_TEXTS = [
+    "사랑해 보고 싶어",
+    "왜 연락 안 해?",
+    "고마워 덕분이야",
+    "오늘 회사에서 회의가 길어졌어",
+    "요즘 너무 불안해",
+    "주말에 영화 보러 갈래",
+    "몇 번이나 말했잖아",
+    "밥은 먹었어?",
+]
+_MBTIS = ["INTJ", "ENFP", "ISTJ", "ESFP", "INFP", "ENTJ"]
+
+
+def _messages(rng: random.Random, n: int) -> List[Dict[str, str]]:
+    return [
+        {"sender": rng.choice(["male", "female"]), "text": rng.choice(_TEXTS)}
+        for _ in range(n)
+    ]
+
+
+def _person(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "id": f"user-{rng.randrange(1000)}",
+        "name": rng.choice(["김철수", "이영희", "박민수", "최지은"]),
+        "age": rng.randint(20, 40),
+        "mbti": rng.choice(_MBTIS),
+        "interests": rng.sample(["독서", "게임", "여행", "음악", "운동"], 2),
+    }
+
+
+# 트래픽 프로필: 이름 → (메서드, 경로, 본문 생성 함수)
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def chat_request(rng: random.Random) -> Request:
+    prompt = f"연인과 {rng.choice(['다툰 뒤', '기념일에', '바쁠 때'])} 어떻게 대화하면 좋을까?"
+    return "POST", "/chat", {"prompt": prompt, "model": "openai"}
+
+
+def batch_request(rng: random.Random) -> Request:
+    couples = [
+        {"user_data": _person(rng), "partner_data": _person(rng)} for _ in range(3)
+    ]
+    return (
+        "POST",
+        "/api/v1/batch-couple-analysis",
+        {"couples": couples, "analysis_type": "comprehensive"},
+    )
+
+
+def labeling_request(rng: random.Random) -> Request:
+    return "POST", "/label/history", {"messages": _messages(rng, 20)}
+
+
+def personality_request(rng: random.Random) -> Request:
+    user_id = f"user-{rng.randrange(1000)}"
+    facet = rng.choice(["mbti", "communication", "love-language"])
+    if facet == "communication":
+        return (
+            "POST",
+            "/analyze-communication",
+            {"userId": user_id, "messages": _messages(rng, 5)},
+        )
+    data = {
+        "answers": [rng.randint(1, 5) for _ in range(8)],
+        "note": rng.choice(_TEXTS),
+    }
+    return "POST", f"/analyze-{facet}", {"userId": user_id, "data": data}
+
+
+PROFILES: Dict[str, Callable[[random.Random], Request]] = {
+    "chat": chat_request,
+    "batch": batch_request,
+    "labeling": labeling_request,
+    "personality": personality_request,
+}
+DEFAULT_MIX = "chat=3,batch=1,labeling=4,personality=2"
+
+
+@dataclass
+class Sample:
+    profile: str
+    status: int  # 0 = 연결 오류/타임아웃, 4xx/5xx도 오류로 집계
+    latency: float
+
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    duration: float
+    samples: List[Sample] = field(default_factory=list)
+    saturation: List[float] = field(default_factory=list)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    선형 보간 백분위수 (q: 0~100)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _latency_stats(samples: List[Sample]) -> Dict[str, Any]:
+    latencies = [s.latency for s in samples]
+    errors = sum(1 for s in samples if s.status == 0 or s.status >= 400)
+    return {
+        "requests": len(samples),
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "p50_ms": round(1000 * percentile(latencies, 50), 1),
+        "p95_ms": round(1000 * percentile(latencies, 95), 1),
+        "p99_ms": round(1000 * percentile(latencies, 99), 1),
+    }
+
+
+def summarize(result: LevelResult) -> Dict[str, Any]:
+    summary = {
+        "concurrency": result.concurrency,
+        "throughput_rps": round(len(result.samples) / result.duration, 2),
+        **_latency_stats(result.samples),
+        "saturation_mean": (
+            round(statistics.fmean(result.saturation), 3) if result.saturation else None
+        ),
+        "saturation_max": (
+            round(max(result.saturation), 3) if result.saturation else None
+        ),
+        "profiles": {},
+    }
+    for profile in sorted({s.profile for s in result.samples}):
+        summary["profiles"][profile] = _latency_stats(
+            [s for s in result.samples if s.profile == profile]
+        )
+    return summary
+
+
+def parse_mix(mix: str) -> List[Tuple[str, float]]:
+    weights = []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in PROFILES:
+            raise ValueError(f"알 수 없는 프로필: {name}")
+        if float(weight or 1) > 0:
+            weights.append((name, float(weight or 1)))
+    if not weights:
+        raise ValueError("가중치가 0보다 큰 프로필이 없습니다.")
+    return weights
+
+
+# ---- 실행 ---------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(latency_ms: float, jitter_ms: float, error_rate: float):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "benchmarks", "llm_stub.py"),
+            "--port",
+            str(port),
+            "--latency-ms",
+            str(latency_ms),
+            "--jitter-ms",
+            str(jitter_ms),
+            "--error-rate",
+            str(error_rate),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("LLM 스텁이 시작되지 않았습니다.")
+        try:
+            httpx.get(f"{base}/health", timeout=1).raise_for_status()
+            return proc, f"{base}/v1"
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    proc.kill()
+    raise TimeoutError("LLM 스텁이 30초 안에 응답하지 않았습니다.")
+
+
+# 포화도 측정 함수 (이벤트 루프 안에서 주기적으로 호출)
+Probe = Callable[[], Awaitable[float]]
+
+
+async def _no_probe() -> float:
+    return 0.0
+
+
+def _in_process_client(llm_base: str) -> Tuple[httpx.AsyncClient, Probe]:
+    # 앱 설정은 import 시점에 환경 변수에서 읽으므로 import 전에 스텁 주소를 지정
+    os.environ.update(
+        {
+            "OPENAI_API_BASE": llm_base,
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "stub",
+            "CLAUDE_API_BASE": llm_base,
+            "CLAUDE_API_KEY": os.environ.get("CLAUDE_API_KEY") or "stub",
+            "LLM_WARMUP": "false",
+        }
+    )
+    sys.path.insert(0, SRC)
+    import anyio.to_thread
+
+    from main import app
+
+    async def saturation() -> float:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        return limiter.borrowed_tokens / limiter.total_tokens
+
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest", timeout=120
+    )
+    return client, saturation
+
+
+_IN_FLIGHT = re.compile(r"^http_requests_in_flight\{[^}]*\} (\S+)$", re.M)
+
+
+def _remote_saturation(client: httpx.AsyncClient) -> Probe:
+    # /metrics 조회 자체도 진행 중 요청 1개로 잡히므로 뺌
+    async def saturation() -> float:
+        text = (await client.get("/metrics", timeout=5)).text
+        return max(0.0, sum(float(v) for v in _IN_FLIGHT.findall(text)) - 1)
+
+    return saturation
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    concurrency: int,
+    duration: float,
+    mix: List[Tuple[str, float]],
+    seed: int,
+    saturation: Probe,
+) -> LevelResult:
+    result = LevelResult(concurrency, duration)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    deadline = time.perf_counter() + duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(seed * 10_007 + index)
+        while time.perf_counter() < deadline:
+            profile = rng.choices(names, weights)[0]
+            method, path, body = PROFILES[profile](rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            result.samples.append(
+                Sample(profile, status, time.perf_counter() - started)
+            )
+
+    async def sampler() -> None:
+        while time.perf_counter() < deadline:
+            try:
+                result.saturation.append(await saturation())
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+
+    started = time.perf_counter()
+    await asyncio.gather(sampler(), *(user(i) for i in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+async def run(args) -> List[Dict[str, Any]]:
+    mix = parse_mix(args.mix)
+    stub = None
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=120)
+        saturation = _remote_saturation(client)
+    else:
+        stub, llm_base = start_stub(
+            args.llm_latency_ms, args.llm_jitter_ms, args.llm_error_rate
+        )
+        client, saturation = _in_process_client(llm_base)
+    try:
+        if args.warmup > 0:
+            await run_level(client, 2, args.warmup, mix, args.seed, _no_probe)
+        summaries = []
+        for level in args.levels:
+            result = await run_level(
+                client, level, args.duration, mix, args.seed, saturation
+            )
+            summaries.append(summarize(result))
+            if not args.json:
+                print_level(summaries[-1])
+        return summaries
+    finally:
+        await client.aclose()
+        if stub is not None:
+            stub.terminate()
+            stub.wait(timeout=10)
+
+
+def print_level(summary: Dict[str, Any]) -> None:
+    saturation = (
+        f"{summary['saturation_mean']:.2f}/{summary['saturation_max']:.2f}"
+        if summary["saturation_mean"] is not None
+        else "-"
+    )
+    print(
+        f"c={summary['concurrency']:<4} {summary['throughput_rps']:>8.1f} req/s  "
+        f"p50 {summary['p50_ms']:>8.1f}  p95 {summary['p95_ms']:>8.1f}  "
+        f"p99 {summary['p99_ms']:>8.1f} ms  "
+        f"err {summary['error_rate']:.2%}  sat {saturation}"
+    )
+    for name, stats in summary["profiles"].items():
+        print(
+            f"    {name:<12} n={stats['requests']:<6} p50 {stats['p50_ms']:>8.1f}  "
+            f"p95 {stats['p95_ms']:>8.1f}  p99 {stats['p99_ms']:>8.1f} ms  "
+            f"err {stats['error_rate']:.2%}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="엔드투엔드 부하 테스트")
+    parser.add_argument(
+        "--levels",
+        type=lambda s: [int(x) for x in s.split(",")],
+        default=[1, 8, 32],
+        help="동시 사용자 수 단계 (쉼표 구분)",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="단계별 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2, help="워밍업 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="프로필=가중치 목록")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--url", help="이미 실행 중인 서버 주소 (지정하면 스텁을 띄우지 않음)"
+    )
+    parser.add_argument("--llm-latency-ms", type=float, default=500)
+    parser.add_argument("--llm-jitter-ms", type=float, default=200)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    summaries = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(summaries, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+콜드 스타트 벤치마크: 앱 import 시간, 프로세스 시작 → 첫 응답까지의 시간, 첫 요청 지연
+
+    python benchmarks/startup.py --runs 5
+    python benchmarks/startup.py --server serve --json
+
+매 측정마다 새 프로세스를 띄우므로 OS 페이지 캐시 외의 워밍업 효과는 없습니다.
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = SRC
+    return env
+
+
+def measure_import() -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=SRC,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(url: str, body: bytes = b"") -> int:
+    request = urllib.request.Request(
+        url,
+        data=body or None,
+        headers={"content-type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        response.read()
+        return response.status
+
+
+def measure_first_request(server: str, timeout: float = 60.0) -> Dict[str, float]:
+    """
+    서버 프로세스 시작 → /health 첫 200 응답(ready)까지의 시간과 이후 첫 요청 지연
+    """
+    port = _free_port()
+    if server == "serve":
+        cmd = [sys.executable, "serve.py", "--workers", "1", "--port", str(port)]
+    else:
+        cmd = [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+        ]
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        cmd,
+        cwd=SRC,
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"{timeout}초 안에 서버가 응답하지 않았습니다.")
+            if proc.poll() is not None:
+                raise RuntimeError(f"서버가 종료되었습니다 (code={proc.returncode})")
+            try:
+                _request(f"{base}/health/")
+                break
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+        ready = time.perf_counter() - started
+
+        t = time.perf_counter()
+        _request(
+            f"{base}/label/single",
+            json.dumps({"sender": "male", "text": "사랑해 보고 싶어"}).encode(),
+        )
+        first_request = time.perf_counter() - t
+        return {"ready": ready, "first_request": first_request}
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median_ms": round(1000 * statistics.median(samples), 1),
+        "min_ms": round(1000 * min(samples), 1),
+        "max_ms": round(1000 * max(samples), 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--server",
+        choices=["uvicorn", "serve"],
+        default="uvicorn",
+        help="측정할 서버 진입점 (serve = preload-and-fork 서버, 워커 1개)",
+    )
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    servers = [measure_first_request(args.server) for _ in range(args.runs)]
+    result = {
+        "import_main": summarize(imports),
+        "process_start_to_ready": summarize([s["ready"] for s in servers]),
+        "first_request": summarize([s["first_request"] for s in servers]),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for name, stats in result.items():
+            print(
+                f"{name:<24} median {stats['median_ms']:>8.1f} ms  "
+                f"(min {stats['min_ms']:.1f}, max {stats['max_ms']:.1f})"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
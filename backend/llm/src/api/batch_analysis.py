@@ -2,6 +2,8 @@ import logging
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 
+from core.metrics import CANCELLED_WORK
+from core.request_context import RequestCancelled, current_request, raise_if_cancelled
 from schemas.enhanced_couple_analysis import (
     CoupleAnalysisBatchRequest,
     CoupleAnalysisBatchResponse,
@@ -26,7 +28,9 @@ def batch_couple_analysis(
         results = []
         success_count = 0
 
-        for couple_data in request.couples:
+        for index, couple_data in enumerate(request.couples):
+            # 클라이언트가 끊었으면 남은 항목은 분석하지 않음
+            raise_if_cancelled("batch_item", amount=len(request.couples) - index)
             try:
                 user_data = couple_data.get("user_data", {})
                 partner_data = couple_data.get("partner_data", {})
@@ -39,9 +43,18 @@ def batch_couple_analysis(
                     results.append(cached_result)
                     success_count += 1
                 else:
-                    result = enhanced_couple_analysis_service.analyze_couple(
-                        user_data, partner_data
-                    )
+                    try:
+                        result = enhanced_couple_analysis_service.analyze_couple(
+                            user_data, partner_data
+                        )
+                    except RequestCancelled:
+                        # 분석 도중 끊긴 경우 뒤에 남은 항목도 건너뛴 작업으로 기록
+                        CANCELLED_WORK.inc(
+                            current_request().resolve_route(),
+                            "batch_item",
+                            amount=len(request.couples) - index - 1,
+                        )
+                        raise
                     results.append(result)
                     success_count += 1
 
@@ -1,8 +1,13 @@
+import logging
+
 from fastapi import APIRouter
 
+from core.log import log_payload
 from schemas.chat import ChatHistoryRequest, ChatRequest, ChatResponse
 from services.chat_service import chat_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     tags=["AI Chat"],
 )
@@ -24,6 +29,6 @@ def chat(request: ChatRequest):
     description="대화 히스토리(메시지 목록)를 LLM에 보내고 답변을 받는 API입니다.",
 )
 def chat_history(request: ChatHistoryRequest):
-    print("LLM에 전달된 messages:", request.messages)
+    log_payload(logger, "LLM에 전달된 messages", request.messages)
     response = chat_service.chat_history(request.messages, request.model)
     return ChatResponse(response=response)
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from core.request_context import (
+    CLIENT_CLOSED_STATUS,
+    RequestCancelled,
+    RequestContext,
+    request_scope,
+    should_sample,
+)
+from core.usage import TokenBudgetExceeded, usage_meter
+from schemas.chat import LLMMessage
+from schemas.chat_session import (
+    ChatSessionCreateRequest,
+    ChatSessionCreateResponse,
+    ChatSessionFrame,
+    ChatSessionMessageRequest,
+    ChatSessionMessageResponse,
+)
+from services.chat_session import (
+    ChatSession,
+    ChatSessionNotFound,
+    chat_session_store,
+)
+
+router = APIRouter(
+    tags=["AI Chat"],
+)
+
+WS_ROUTE = "/chat-sessions/ws"
+# 턴을 처리하는 동안 쌓아 둘 수 있는 클라이언트 메시지 수 (넘으면 읽기를 멈춤)
+WS_INBOX_SIZE = 8
+
+
+@router.post(
+    "/chat-sessions",
+    response_model=ChatSessionCreateResponse,
+    summary="채팅 세션 생성",
+    description="서버가 대화를 보관하는 채팅 세션을 만듭니다. 이후에는 새 메시지만 보내면 됩니다.",
+)
+def create_chat_session(request: ChatSessionCreateRequest):
+    session = chat_session_store.create(request.kind, request.model, request.messages)
+    return ChatSessionCreateResponse(
+        session_id=session.session_id, messages=len(session.messages)
+    )
+
+
+@router.post(
+    "/chat-sessions/{session_id}/messages",
+    response_model=ChatSessionMessageResponse,
+    summary="채팅 세션에 새 메시지 전송",
+    description="지난 턴 이후의 새 메시지만 보내고 LLM 답변을 받습니다. 세션이 만료되었으면 404입니다.",
+)
+def send_chat_session_message(session_id: str, request: ChatSessionMessageRequest):
+    if not request.messages:
+        raise HTTPException(status_code=422, detail="새 메시지가 없습니다.")
+    try:
+        session = chat_session_store.get(session_id)
+    except ChatSessionNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    response = chat_session_store.send(session, request.messages, "http")
+    return ChatSessionMessageResponse(
+        session_id=session_id, response=response, messages=len(session.messages)
+    )
+
+
+@router.delete("/chat-sessions/{session_id}", summary="채팅 세션 삭제")
+def delete_chat_session(session_id: str) -> Dict[str, Any]:
+    return {"deleted": chat_session_store.delete(session_id)}
+
+
+async def _send_error(websocket: WebSocket, code: str, detail: str) -> None:
+    await websocket.send_json({"type": "error", "code": code, "detail": detail})
+
+
+@router.websocket(WS_ROUTE)
+async def chat_session_socket(websocket: WebSocket) -> None:
+    """
+    채팅 세션 WebSocket: 연결 하나에서 새 메시지를 보내고 답변을 받음 (ChatSessionFrame 참고)
+
+    서버 → 클라이언트: {"type": "session"|"reply"|"error", ...}. 답변 중 연결이 끊기면 진행 중인
+    LLM 호출을 멈추고 그 턴은 대화에 남기지 않으며, 세션 ID로 다시 연결해 이어갈 수 있음
+    """
+    await websocket.accept()
+    inbox: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=WS_INBOX_SIZE)
+    turn: Optional[RequestContext] = None
+
+    async def read() -> None:
+        # 턴 처리 중에도 연결 종료를 바로 알 수 있도록 따로 읽음
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                text = message.get("text")
+                if text is None:
+                    text = (message.get("bytes") or b"").decode("utf-8", "replace")
+                await inbox.put(text)
+        finally:
+            if turn is not None:
+                turn.cancelled.set()
+            await inbox.put(None)
+
+    reader = asyncio.ensure_future(read())
+    session: Optional[ChatSession] = None
+    try:
+        while True:
+            text = await inbox.get()
+            if text is None:
+                return
+            try:
+                frame = ChatSessionFrame(**json.loads(text))
+            except (ValueError, TypeError, ValidationError) as e:
+                await _send_error(websocket, "invalid_frame", str(e))
+                continue
+
+            if frame.type == "start":
+                try:
+                    if frame.session_id:
+                        session = chat_session_store.get(frame.session_id)
+                    else:
+                        session = chat_session_store.create(
+                            frame.kind, frame.model, frame.messages
+                        )
+                except ChatSessionNotFound as e:
+                    await _send_error(websocket, "session_not_found", str(e))
+                    continue
+                await websocket.send_json(
+                    {
+                        "type": "session",
+                        "session_id": session.session_id,
+                        "messages": len(session.messages),
+                    }
+                )
+                continue
+
+            if session is None:
+                await _send_error(
+                    websocket, "no_session", "먼저 start로 세션을 시작하세요."
+                )
+                continue
+            delta = list(frame.messages)
+            if frame.content:
+                delta.append(LLMMessage(role="user", content=frame.content))
+            if not delta:
+                await _send_error(websocket, "invalid_frame", "새 메시지가 없습니다.")
+                continue
+            try:
+                chat_session_store.get(session.session_id)  # 마지막 사용 시각 갱신
+            except ChatSessionNotFound as e:
+                session = None
+                await _send_error(websocket, "session_not_found", str(e))
+                continue
+
+            turn = RequestContext(
+                uuid.uuid4().hex,
+                method="WS",
+                path=WS_ROUTE,
+                sampled=should_sample(),
+                token_budget=settings.REQUEST_TOKEN_BUDGET,
+            )
+            turn.route = WS_ROUTE
+            request_id = turn.request_id
+            status = 200
+            try:
+                with request_scope(turn):
+                    response = await run_in_threadpool(
+                        chat_session_store.send, session, delta, "ws"
+                    )
+            except RequestCancelled:
+                status = CLIENT_CLOSED_STATUS
+                return
+            except TokenBudgetExceeded as e:
+                status = 429
+                await _send_error(websocket, "token_budget_exceeded", str(e))
+                continue
+            finally:
+                usage_meter.finish_request(
+                    turn, status, time.perf_counter() - turn.started, None
+                )
+                turn = None
+
+            if response.startswith("❌"):
+                await _send_error(websocket, "llm_error", response)
+                continue
+            await websocket.send_json(
+                {
+                    "type": "reply",
+                    "session_id": session.session_id,
+                    "request_id": request_id,
+                    "content": response,
+                    "messages": len(session.messages),
+                }
+            )
+    except WebSocketDisconnect:
+        return
+    finally:
+        reader.cancel()
@@ -0,0 +1,76 @@
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from schemas.compatibility import (
+    CompatibilityBatchRequest,
+    CompatibilityBatchResponse,
+    CompatibilityScoreRequest,
+    CompatibilityScoreResponse,
+)
+from schemas.labeling_trait_vector import TraitVector
+from services.compatibility_scorer import compatibility_scorer
+from services.trait_store import get_trait_store, trait_vector_to_array
+
+router = APIRouter(tags=["Compatibility"])
+
+
+def _resolve(
+    vector: Optional[TraitVector], user_id: Optional[str]
+) -> Optional[np.ndarray]:
+    if vector is not None:
+        return trait_vector_to_array(vector)
+    return get_trait_store().get_array(user_id) if user_id else None
+
+
+@router.post(
+    "/compatibility-score",
+    response_model=CompatibilityScoreResponse,
+    summary="로컬 궁합 점수",
+    description="두 사람의 성향 벡터로 LLM 없이 궁합 점수와 구성 요소(감정 균형, 애착 조합, 소통 불일치)를 계산합니다.",
+)
+def compatibility_score(request: CompatibilityScoreRequest):
+    user = _resolve(request.user_trait_vector, request.user_id)
+    partner = _resolve(request.partner_trait_vector, request.partner_id)
+    if user is None or partner is None:
+        raise HTTPException(status_code=404, detail="성향 벡터가 없습니다.")
+    breakdown = compatibility_scorer.score_batch(user[None, :], partner[None, :])
+    return {name: float(values[0]) for name, values in breakdown.items()}
+
+
+@router.post(
+    "/compatibility-score/batch",
+    response_model=CompatibilityBatchResponse,
+    summary="로컬 궁합 점수 일괄 계산",
+    description="여러 커플의 궁합 점수를 한 번에 계산합니다. top_k를 주면 점수 상위 커플만 반환합니다.",
+)
+def compatibility_score_batch(request: CompatibilityBatchRequest):
+    users: List[np.ndarray] = []
+    partners: List[np.ndarray] = []
+    indices: List[int] = []
+    missing: List[int] = []
+    for i, pair in enumerate(request.pairs):
+        user = _resolve(pair.user_trait_vector, pair.user_id)
+        partner = _resolve(pair.partner_trait_vector, pair.partner_id)
+        if user is None or partner is None:
+            missing.append(i)
+            continue
+        users.append(user)
+        partners.append(partner)
+        indices.append(i)
+
+    results = []
+    if indices:
+        breakdown = compatibility_scorer.score_batch(
+            np.stack(users), np.stack(partners)
+        )
+        order = range(len(indices))
+        if request.top_k:
+            scores = breakdown["compatibility_score"]
+            order = np.argsort(-scores, kind="stable")[: request.top_k].tolist()
+        for j in order:
+            item = {name: float(values[j]) for name, values in breakdown.items()}
+            item["index"] = indices[j]
+            results.append(item)
+    return {"results": results, "missing": missing}
@@ -1,5 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
+from core.labeling.rule_engine import keyword_registry
+from core.streaming import DuplexStreamingResponse, iter_request_body
 from schemas.labeling import (
     HistoryLabelingResult,
     HistoryRequest,
@@ -27,8 +29,44 @@ def label_message_history(request: HistoryRequest):
     """
     메시지 히스토리(여러 개) 룰 기반 라벨링
     """
-    results = LabelingService.label_message_history(request.messages)
-    return {"results": results}
+    keywords = keyword_registry.active
+    results = LabelingService.label_message_history(request.messages, keywords)
+    return {"results": results, "keyword_version": keywords.version}
+
+
+@router.post("/label/history/stream", tags=["Labeling"])
+def label_message_history_stream(request: Request) -> DuplexStreamingResponse:
+    """
+    NDJSON 메시지 스트림 룰 기반 라벨링
+
+    요청 본문은 한 줄에 메시지 하나({"sender": ..., "text": ...})인 NDJSON이며,
+    라벨링 결과도 메시지마다 한 줄씩 처리되는 즉시 NDJSON으로 반환
+    (사용한 키워드 사전 버전은 X-Keyword-Version 헤더로 전달)
+    """
+    keywords = keyword_registry.active
+    return DuplexStreamingResponse(
+        LabelingService.stream_ndjson_history(iter_request_body(request), keywords),
+        media_type="application/x-ndjson",
+        headers={"X-Keyword-Version": keywords.version},
+    )
+
+
+@router.get("/label/keywords", tags=["Labeling"])
+def get_keyword_version():
+    """
+    현재 사용 중인 키워드 사전 버전
+    """
+    keywords = keyword_registry.active
+    return {"version": keywords.version, "path": keyword_registry.path}
+
+
+@router.post("/label/keywords/reload", tags=["Labeling"])
+def reload_keywords():
+    """
+    키워드 사전 파일을 즉시 다시 읽어 교체 (변경 확인 간격을 기다리지 않음)
+    """
+    keywords = keyword_registry.reload(force=True)
+    return {"version": keywords.version, "path": keyword_registry.path}
 
 
 @router.post(
@@ -38,9 +76,10 @@ def label_with_llm_history(request: HistoryRequest):
     """
     LLM을 이용한 메시지(히스토리) 라벨링
     """
-    results = LabelingService.label_with_llm(request.messages)
+    keywords = keyword_registry.active
+    results = LabelingService.label_with_llm(request.messages, keywords=keywords)
     if isinstance(results, list):
-        return {"results": results}
+        return {"results": results, "keyword_version": keywords.version}
     return results
 
 
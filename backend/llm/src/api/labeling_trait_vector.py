@@ -1,7 +1,20 @@
-from fastapi import APIRouter
+from typing import Literal
 
-from schemas.labeling_trait_vector import LabelingTraitVectorRequest
+from fastapi import APIRouter, HTTPException, Query
+
+from schemas.labeling_trait_vector import (
+    LabelingTraitVectorRequest,
+    SimilarTraitVectorsBatchRequest,
+    SimilarTraitVectorsBatchResponse,
+    SimilarTraitVectorsResponse,
+    TraitVector,
+)
 from services.labeling_trait_vector_service import LabelingTraitVectorService
+from services.trait_similarity import (
+    get_similarity_index,
+    refresh_similarity_index,
+)
+from services.trait_store import get_trait_store
 
 router = APIRouter(tags=["Labeling Trait Vector"])
 
@@ -16,3 +29,69 @@ def labeling_trait_vector(request: LabelingTraitVectorRequest):
     메시지 히스토리 기반 라벨링 + 성향 벡터 + 분석 요약 통합
     """
     return LabelingTraitVectorService.label_trait_vector(request)
+
+
+@router.get(
+    "/trait-vectors/{user_id}",
+    response_model=TraitVector,
+    summary="저장된 성향 벡터 조회",
+    description="성향 벡터 저장소에 보관된 사용자의 최신 성향 벡터를 반환합니다.",
+)
+def get_trait_vector(user_id: str):
+    trait_vector = get_trait_store().get(user_id)
+    if trait_vector is None:
+        raise HTTPException(status_code=404, detail="성향 벡터가 없습니다.")
+    return trait_vector
+
+
+@router.get(
+    "/trait-vectors/{user_id}/similar",
+    response_model=SimilarTraitVectorsResponse,
+    summary="비슷한 성향의 사용자 조회",
+    description="소통/애착 성향 벡터가 가장 가까운 사용자 top-k를 반환합니다.",
+)
+def get_similar_trait_vectors(
+    user_id: str,
+    k: int = Query(10, ge=1, le=100),
+    metric: Literal["cosine", "euclidean"] = "cosine",
+):
+    neighbors = get_similarity_index(metric).query_user(user_id, k)
+    if neighbors is None:
+        # 다른 워커가 저장한 사용자일 수 있으므로 저장소의 새 행을 반영하고 다시 조회
+        neighbors = refresh_similarity_index(metric).query_user(user_id, k)
+    if neighbors is None:
+        raise HTTPException(status_code=404, detail="성향 벡터가 없습니다.")
+    return {
+        "user_id": user_id,
+        "metric": metric,
+        "neighbors": [{"user_id": uid, "distance": d} for uid, d in neighbors],
+    }
+
+
+@router.post(
+    "/trait-vectors/similar",
+    response_model=SimilarTraitVectorsBatchResponse,
+    summary="비슷한 성향의 사용자 일괄 조회",
+    description="여러 사용자의 top-k 이웃을 한 번에 조회합니다. 없는 사용자는 결과에서 제외됩니다.",
+)
+def get_similar_trait_vectors_batch(request: SimilarTraitVectorsBatchRequest):
+    store = get_trait_store()
+    user_ids = [uid for uid in request.user_ids if store.row_of(uid) is not None]
+    results = []
+    if user_ids:
+        vectors = store.matrix[[store.row_of(uid) for uid in user_ids]]
+        index = get_similarity_index(request.metric)
+        if any(uid not in index for uid in user_ids):
+            index = refresh_similarity_index(request.metric)
+        neighbor_ids, distances = index.query_batch(vectors, request.k, user_ids)
+        for uid, ids, dist in zip(user_ids, neighbor_ids, distances):
+            results.append(
+                {
+                    "user_id": uid,
+                    "metric": request.metric,
+                    "neighbors": [
+                        {"user_id": n, "distance": float(d)} for n, d in zip(ids, dist)
+                    ],
+                }
+            )
+    return {"results": results}
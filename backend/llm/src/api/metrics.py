@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Prometheus 스크레이프용 메트릭 (텍스트 형식, 프로세스 단위)
+    """
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,23 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from services.model_router import model_router
+
+router = APIRouter(prefix="/model-routes", tags=["model routing"])
+
+
+@router.get("/")
+def get_model_routes() -> Dict[str, Any]:
+    """
+    현재 모델 라우팅 테이블 (route별 tier/생성 파라미터, tier별 provider 모델)
+    """
+    return model_router.active.to_json()
+
+
+@router.post("/reload")
+def reload_model_routes() -> Dict[str, Any]:
+    """
+    MODEL_ROUTES_PATH 파일을 즉시 다시 읽어 교체 (변경 확인 간격을 기다리지 않음)
+    """
+    return model_router.reload(force=True).to_json()
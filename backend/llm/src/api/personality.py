@@ -60,9 +60,8 @@ def analyze(request: Dict[str, Any] = Body(...)):
             # 기타 형식 - 전체를 JSON으로 변환하여 프롬프트로 사용
             prompt = f"다음 데이터를 분석해주세요: {str(request)}"
 
-        logger.info(f"분석 프롬프트: {prompt}")
+        # 프롬프트/응답 로그는 서비스에서 샘플링해 남김
         response = personality_service.analyze(prompt)
-        logger.info(f"분석 응답: {response}")
 
         # 응답이 JSON 문자열인지 확인
         if isinstance(response, str):
@@ -16,7 +16,7 @@ class PromptRequest(BaseModel):
 @router.post("/ask")
 async def ask_prompt(request: PromptRequest) -> Dict[str, Any]:
     try:
-        response = llm_provider.ask(request.prompt, request.model)
+        response = llm_provider.ask(request.prompt, request.model, route="chat")
         return {"response": response, "model": request.model}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,26 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException
+
+from core.usage import usage_meter
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+
+@router.get("/")
+def get_usage() -> Dict[str, Any]:
+    """
+    LLM 토큰 사용량/예상 비용 누적값 (라우트×모델별, 모델별, 이 워커 프로세스 기준)
+    """
+    return usage_meter.snapshot()
+
+
+@router.get("/requests/{request_id}")
+def get_request_usage(request_id: str) -> Dict[str, Any]:
+    """
+    최근 요청 하나의 LLM 사용량 (X-Request-ID 기준)
+    """
+    entry = usage_meter.find_request(request_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="최근 요청 목록에 없는 요청입니다.")
+    return entry
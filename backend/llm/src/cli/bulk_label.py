@@ -0,0 +1,342 @@
+"""
+대화 내보내기(JSONL)를 오프라인으로 일괄 라벨링하고 사용자별 성향 벡터를 계산하는 CLI
+
+    PYTHONPATH=src python -m cli.bulk_label exports/*.jsonl -o data/traits.npz
+
+입력 한 줄 = 메시지 하나 ({"user_id": "...", "text": "..."}; user_id가 없으면 sender 사용)
+입력은 청크 단위로 스트리밍하여 프로세스 풀에서 룰 엔진으로 라벨링하고, 사용자별 라벨 집계만
+부모 프로세스로 모읍니다. 주기적으로 체크포인트를 남기므로 중단된 작업은 같은 명령으로 이어서
+실행할 수 있습니다.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.labeling.keyword_registry import CompiledKeywords
+from core.labeling.label_codes import MAX_LABEL_ID, iter_label_ids
+from core.labeling.rule_engine import keyword_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_CHECKPOINT_EVERY = 32
+# 사용자별 집계 행: [메시지 수, 라벨 ID 0..MAX_LABEL_ID 등장 횟수]
+AGGREGATE_WIDTH = MAX_LABEL_ID + 2
+
+ChunkResult = Tuple[Dict[str, List[int]], int]
+
+
+def iter_chunks(path: str, start: int, chunk_bytes: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    파일을 줄 경계에서 자른 청크로 읽음 → (청크 끝 오프셋, 청크 바이트)
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                return
+            rest = f.readline()  # 줄 중간에서 잘리지 않도록 줄 끝까지 이어 읽음
+            data += rest
+            offset += len(data)
+            yield offset, data
+
+
+def label_chunk(data: bytes, user_key: str, keywords: CompiledKeywords) -> ChunkResult:
+    """
+    (워커) 청크 안의 메시지를 라벨링하고 사용자별 집계 행과 잘못된 줄 수를 반환
+    """
+    aggregates: Dict[str, List[int]] = {}
+    errors = 0
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            user_id = record.get(user_key) or record["sender"]
+            text = record["text"]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            errors += 1
+            continue
+        row = aggregates.get(user_id)
+        if row is None:
+            row = aggregates[user_id] = [0] * AGGREGATE_WIDTH
+        row[0] += 1
+        for lid in iter_label_ids(keywords.label_mask(str(text))):
+            row[lid + 1] += 1
+    return aggregates, errors
+
+
+def _label_task(task: Tuple[bytes, str, CompiledKeywords]) -> ChunkResult:
+    return label_chunk(*task)
+
+
+def trait_rows(batch: Tuple[List[str], np.ndarray]) -> Tuple[List[str], np.ndarray]:
+    """
+    (워커) 사용자별 집계 행 → 성향 벡터 행렬 (TRAIT_FIELDS 순서, float32)
+    """
+    # 워커에서만 필요한 무거운 의존성은 여기서 불러옴
+    from services.labeling_trait_vector_service import LabelingTraitVectorService
+    from services.trait_store import TRAIT_DIM, trait_vector_to_array
+
+    user_ids, aggregates = batch
+    rows = np.empty((len(user_ids), TRAIT_DIM), dtype=np.float32)
+    for i, (user_id, aggregate) in enumerate(zip(user_ids, aggregates)):
+        vector = LabelingTraitVectorService.compute_trait_vector_from_counts(
+            user_id, int(aggregate[0]), aggregate[1:].tolist()
+        )
+        rows[i] = trait_vector_to_array(vector)
+    return user_ids, rows
+
+
+class BulkLabelJob:
+    """
+    입력 파일 목록 → 사용자별 라벨 집계 → 성향 벡터 (체크포인트로 재개 가능)
+    """
+
+    def __init__(
+        self,
+        inputs: Sequence[str],
+        output: str,
+        workers: int = 0,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        user_key: str = "user_id",
+    ) -> None:
+        self.inputs = list(inputs)
+        self.output = output
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.checkpoint_every = checkpoint_every
+        self.user_key = user_key
+        self.checkpoint_path = f"{output}.checkpoint.npz"
+        # 작업 전체를 시작 시점의 키워드 사전 버전 하나로 처리
+        self.keywords = keyword_registry.active
+
+        self._index: Dict[str, int] = {}
+        self._user_ids: List[str] = []
+        self._aggregates = np.zeros((1024, AGGREGATE_WIDTH), dtype=np.int64)
+        self._offsets: Dict[str, int] = {path: 0 for path in self.inputs}
+        self.errors = 0
+
+    # ---- 실행 -------------------------------------------------------------
+
+    def run(self, store_path: Optional[str] = None) -> Tuple[List[str], np.ndarray]:
+        directory = os.path.dirname(self.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load_checkpoint()
+        pool = multiprocessing.Pool(self.workers) if self.workers > 0 else None
+        try:
+            self._label_inputs(pool)
+            user_ids, rows = self._compute_traits(pool)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        self._write_output(user_ids, rows)
+        if store_path:
+            from services.trait_store import TraitStore
+
+            store = TraitStore(store_path)
+            store.put_arrays(user_ids, rows)
+            store.flush()
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        logger.info(
+            f"일괄 라벨링 완료: 사용자 {len(user_ids)}명, 잘못된 줄 {self.errors}개"
+        )
+        return user_ids, rows
+
+    def _label_inputs(self, pool: Optional["multiprocessing.pool.Pool"]) -> None:
+        for path in self.inputs:
+            start = self._offsets[path]
+            if start >= os.path.getsize(path):
+                continue
+            chunks = iter_chunks(path, start, self.chunk_bytes)
+            offsets: List[int] = []
+
+            def tasks() -> Iterator[Tuple[bytes, str, CompiledKeywords]]:
+                for end, data in chunks:
+                    offsets.append(end)
+                    yield data, self.user_key, self.keywords
+
+            # 순서를 보장하는 imap이라 처리된 청크까지의 오프셋이 연속적임
+            results = (
+                pool.imap(_label_task, tasks())
+                if pool is not None
+                else map(_label_task, tasks())
+            )
+            for done, (aggregates, errors) in enumerate(results, start=1):
+                self._merge(aggregates)
+                self.errors += errors
+                self._offsets[path] = offsets[done - 1]
+                if done % self.checkpoint_every == 0:
+                    self._save_checkpoint()
+            self._save_checkpoint()
+
+    def _compute_traits(
+        self, pool: Optional["multiprocessing.pool.Pool"]
+    ) -> Tuple[List[str], np.ndarray]:
+        from services.trait_store import TRAIT_DIM
+
+        n = len(self._user_ids)
+        batch_size = max(1, min(10_000, n // max(1, self.workers * 4) or 1))
+        batches = [
+            (self._user_ids[i : i + batch_size], self._aggregates[i : i + batch_size])
+            for i in range(0, n, batch_size)
+        ]
+        results = (
+            pool.imap(trait_rows, batches)
+            if pool is not None
+            else map(trait_rows, batches)
+        )
+        rows = np.empty((n, TRAIT_DIM), dtype=np.float32)
+        position = 0
+        for _, batch_rows in results:
+            rows[position : position + len(batch_rows)] = batch_rows
+            position += len(batch_rows)
+        return list(self._user_ids), rows
+
+    # ---- 집계 -------------------------------------------------------------
+
+    def _merge(self, aggregates: Dict[str, List[int]]) -> None:
+        new_ids = [u for u in aggregates if u not in self._index]
+        required = len(self._user_ids) + len(new_ids)
+        if required > len(self._aggregates):
+            capacity = max(required, 2 * len(self._aggregates))
+            grown = np.zeros((capacity, AGGREGATE_WIDTH), dtype=np.int64)
+            grown[: len(self._user_ids)] = self._aggregates[: len(self._user_ids)]
+            self._aggregates = grown
+        for user_id in new_ids:
+            self._index[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+        rows = np.fromiter(
+            (self._index[u] for u in aggregates), dtype=np.int64, count=len(aggregates)
+        )
+        self._aggregates[rows] += np.array(list(aggregates.values()), dtype=np.int64)
+
+    # ---- 입출력 -----------------------------------------------------------
+
+    def _progress(self) -> Dict[str, object]:
+        return {
+            "inputs": {
+                path: {"offset": self._offsets[path], "size": os.path.getsize(path)}
+                for path in self.inputs
+            },
+            "user_key": self.user_key,
+            "keyword_version": self.keywords.version,
+            "errors": self.errors,
+        }
+
+    def _save_checkpoint(self) -> None:
+        n = len(self._user_ids)
+        tmp_path = f"{self.checkpoint_path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            user_ids=np.array(self._user_ids, dtype=str),
+            aggregates=self._aggregates[:n],
+            progress=np.array(json.dumps(self._progress())),
+        )
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _load_checkpoint(self) -> None:
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with np.load(self.checkpoint_path) as checkpoint:
+            progress = json.loads(str(checkpoint["progress"]))
+            if progress["user_key"] != self.user_key or set(progress["inputs"]) != set(
+                self.inputs
+            ):
+                raise ValueError(
+                    f"체크포인트의 입력이 현재 명령과 다릅니다: {self.checkpoint_path}"
+                )
+            if progress["keyword_version"] != self.keywords.version:
+                raise ValueError(
+                    f"체크포인트의 키워드 사전 버전({progress['keyword_version']})이 "
+                    f"현재 버전({self.keywords.version})과 다릅니다."
+                )
+            for path, state in progress["inputs"].items():
+                if os.path.getsize(path) < state["size"]:
+                    raise ValueError(f"체크포인트 이후 입력 파일이 줄었습니다: {path}")
+                self._offsets[path] = state["offset"]
+            self._user_ids = checkpoint["user_ids"].tolist()
+            self._aggregates = checkpoint["aggregates"].astype(np.int64)
+        if not len(self._aggregates):
+            self._aggregates = np.zeros((1024, AGGREGATE_WIDTH), dtype=np.int64)
+        self._index = {u: i for i, u in enumerate(self._user_ids)}
+        self.errors = progress["errors"]
+        logger.info(f"체크포인트에서 재개: 사용자 {len(self._user_ids)}명")
+
+    def _write_output(self, user_ids: List[str], rows: np.ndarray) -> None:
+        """
+        열 단위 .npz 출력: user_id, message_count, 라벨 집계, 성향 필드별 열
+        """
+        from services.trait_store import TRAIT_FIELDS
+
+        n = len(user_ids)
+        columns = {name: rows[:, i] for i, name in enumerate(TRAIT_FIELDS)}
+        tmp_path = f"{self.output}.tmp.npz"
+        np.savez(
+            tmp_path,
+            user_id=np.array(user_ids, dtype=str),
+            keyword_version=np.array(self.keywords.version),
+            label_counts=self._aggregates[:n, 1:],
+            **columns,
+        )
+        os.replace(tmp_path, self.output)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli.bulk_label",
+        description="JSONL 대화 내보내기를 일괄 라벨링하고 사용자별 성향 벡터를 계산합니다.",
+    )
+    parser.add_argument("inputs", nargs="+", help="입력 JSONL 파일")
+    parser.add_argument("-o", "--output", required=True, help="출력 .npz 경로")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="워커 프로세스 수 (0이면 현재 프로세스에서 실행)",
+    )
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help="체크포인트를 남길 청크 간격",
+    )
+    parser.add_argument(
+        "--user-key", default="user_id", help="사용자 식별 필드 (없으면 sender)"
+    )
+    parser.add_argument("--store", help="결과를 함께 기록할 성향 벡터 저장소 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if not args.output.endswith(".npz"):
+        parser.error("출력 경로는 .npz 이어야 합니다.")
+    job = BulkLabelJob(
+        args.inputs,
+        args.output,
+        workers=args.workers,
+        chunk_bytes=args.chunk_bytes,
+        checkpoint_every=args.checkpoint_every,
+        user_key=args.user_key,
+    )
+    job.run(store_path=args.store)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
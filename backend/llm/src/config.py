@@ -5,6 +5,121 @@ class Settings:
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
     CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY", "")
     DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "openai")
+    # 모델 라우팅 테이블 JSON 파일 (비우면 services/model_router.py의 기본 테이블)과 변경 확인 간격(초)
+    MODEL_ROUTES_PATH = os.getenv("MODEL_ROUTES_PATH", "")
+    MODEL_ROUTES_CHECK_INTERVAL = float(os.getenv("MODEL_ROUTES_CHECK_INTERVAL", "5"))
+    # OpenAI 호환 API 주소 (비우면 기본값, 로컬 스텁 서버로 부하 테스트할 때 지정)
+    OPENAI_API_BASE = os.getenv("OPENAI_API_BASE", "")
+    # 서버 시작 후 백그라운드에서 LLM provider를 미리 초기화할지 여부
+    LLM_WARMUP = os.getenv("LLM_WARMUP", "true").lower() == "true"
+    # 트레이싱: span을 묶어 POST할 수집기 주소 (비우면 트레이싱 끔)
+    TRACE_EXPORT_URL = os.getenv("TRACE_EXPORT_URL", "")
+    # 요청 단위 샘플링 비율 (오류가 난 span은 항상 기록)
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.05"))
+    TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", "10000"))
+    TRACE_BATCH_SIZE = int(os.getenv("TRACE_BATCH_SIZE", "256"))
+    TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "2"))
+    # LangSmith: 키가 있을 때만 샘플링된 요청의 LangChain 호출에 트레이서를 붙임
+    LANGCHAIN_API_KEY = os.getenv("LANGCHAIN_API_KEY", "")
+    LANGCHAIN_PROJECT = os.getenv("LANGCHAIN_PROJECT", "saiondo-llm")
+    # 로깅: 레벨, 출력 형식(json | console), 비동기 큐 크기 (가득 차면 버림)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    # 프롬프트/응답 본문 로그: 기록할 요청 비율과 라우트별 비율("/analyze=0.1,/chat=0"),
+    # 남길 앞부분 글자 수 (0이면 길이와 해시만). LOG_LEVEL=DEBUG면 전체 본문을 기록
+    LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+    LOG_PAYLOAD_ROUTE_SAMPLE_RATES = os.getenv("LOG_PAYLOAD_ROUTE_SAMPLE_RATES", "")
+    LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", "200"))
+    # 요청 하나가 쓸 수 있는 LLM 토큰 수 기본값 (0이면 제한 없음, X-Token-Budget 헤더로 더 낮출 수 있음)
+    REQUEST_TOKEN_BUDGET = int(os.getenv("REQUEST_TOKEN_BUDGET", "0"))
+    # LLM 호출 헤징: 켜면 provider/모델별 최근 호출 시간의 분위수(0~1)가 지나도 끝나지 않은 호출을
+    # 한 번 더 보내 먼저 온 응답을 사용. 헤지는 일반 호출 수의 BUDGET_RATIO 비율까지만 보냄
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+    LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "200"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05"))
+    LLM_HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "64"))
+    # 헤지를 보낼 provider (비우면 원래 호출과 같은 provider/모델)
+    LLM_HEDGE_PROVIDER = os.getenv("LLM_HEDGE_PROVIDER", "")
+    # 처리 중 클라이언트 연결이 끊기면 남은 LLM 호출/배치 항목/그래프 단계를 건너뜀
+    CANCEL_ON_DISCONNECT = os.getenv("CANCEL_ON_DISCONNECT", "true").lower() == "true"
+    # 요청 마감 시간(초, 0이면 없음)과 라우트별 값("/enhanced-couple-analysis=60,/chat=20").
+    # X-Request-Timeout-Ms 헤더가 더 짧으면 헤더 값을 따름. LLM 호출은 남은 시간을 timeout으로 쓰고,
+    # 남은 시간이 그 모델의 최근 호출 시간 중앙값(최소 LLM_MIN_CALL_SECONDS)보다 짧으면 건너뜀
+    REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "0"))
+    REQUEST_ROUTE_TIMEOUTS = os.getenv("REQUEST_ROUTE_TIMEOUTS", "")
+    LLM_MIN_CALL_SECONDS = float(os.getenv("LLM_MIN_CALL_SECONDS", "1"))
+    # provider/모델별로 기억할 최근 LLM 호출 시간 수 (헤징 지연, 마감 시간 판단에 사용)
+    LLM_LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+    # 요청 수락 제어: 우선순위 클래스별 "동시 처리 수/대기열 길이/최대 대기 초" (앞이 우선순위 높음),
+    # 경로 접두사별 클래스, 워커 전체 동시 처리 수, LLM 지연 허용 배수 (core/admission.py 참고)
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_CLASSES = os.getenv(
+        "ADMISSION_CLASSES", "interactive=32/64/5,analysis=16/32/10,batch=4/4/0.5"
+    )
+    ADMISSION_ROUTE_CLASSES = os.getenv(
+        "ADMISSION_ROUTE_CLASSES",
+        "/chat=interactive,/prompt=interactive,/feedback=interactive,"
+        "/api/v1/batch-couple-analysis=batch,/compatibility-score/batch=batch",
+    )
+    ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "40"))
+    ADMISSION_LATENCY_TOLERANCE = float(os.getenv("ADMISSION_LATENCY_TOLERANCE", "1.5"))
+    # Idempotency-Key를 지원하는 경로, 응답 보관 시간(초)과 최대 개수, 처리 중인 같은 키를
+    # 기다릴 최대 시간(초), 저장할 응답 본문 최대 크기(바이트)
+    IDEMPOTENCY_PATHS = os.getenv(
+        "IDEMPOTENCY_PATHS",
+        "/analyze,/api/v1/enhanced-couple-analysis,/labeling-trait-vector",
+    )
+    IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "3600"))
+    IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    IDEMPOTENCY_WAIT_TIMEOUT = float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", "120"))
+    IDEMPOTENCY_MAX_BODY_BYTES = int(
+        os.getenv("IDEMPOTENCY_MAX_BODY_BYTES", str(1024 * 1024))
+    )
+    # 대화 메모리: /chat-history, 관계 코치, 피드백 대화의 예상 토큰 수가 이 값을 넘으면 오래된 대화를
+    # 요약으로 접음 (0이면 끔). 접을 때 최근 대화는 RECENT_TOKENS 이내(최소 MIN_RECENT_MESSAGES개)를
+    # 그대로 남기고, 요약은 SUMMARY_CHARS자 이내로 만들어 최대 SUMMARY_CACHE_SIZE개 캐시함
+    CONVERSATION_TOKEN_BUDGET = int(os.getenv("CONVERSATION_TOKEN_BUDGET", "3000"))
+    CONVERSATION_RECENT_TOKENS = int(os.getenv("CONVERSATION_RECENT_TOKENS", "1500"))
+    CONVERSATION_MIN_RECENT_MESSAGES = int(
+        os.getenv("CONVERSATION_MIN_RECENT_MESSAGES", "4")
+    )
+    CONVERSATION_SUMMARY_CHARS = int(os.getenv("CONVERSATION_SUMMARY_CHARS", "600"))
+    CONVERSATION_SUMMARY_CACHE_SIZE = int(
+        os.getenv("CONVERSATION_SUMMARY_CACHE_SIZE", "1000")
+    )
+    # 서버 측 채팅 세션: 마지막 사용 후 보관 시간(초), 최대 세션 수, 세션당 보관할 최대 메시지 수
+    CHAT_SESSION_TTL = float(os.getenv("CHAT_SESSION_TTL", "1800"))
+    CHAT_SESSION_MAX_SESSIONS = int(os.getenv("CHAT_SESSION_MAX_SESSIONS", "10000"))
+    CHAT_SESSION_MAX_MESSAGES = int(os.getenv("CHAT_SESSION_MAX_MESSAGES", "200"))
+    # 토큰 사용량 조회 API에 보관할 최근 요청 수
+    USAGE_RECENT_REQUESTS = int(os.getenv("USAGE_RECENT_REQUESTS", "1000"))
+    # 가짜 LLM(DEFAULT_MODEL=fake, benchmarks/llm_stub.py) 동작: 응답 지연(ms)과 지터,
+    # 오류 비율, 스트리밍 청크 간격(ms)/크기(글자 수), 응답 결정용 시드
+    FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+    FAKE_LLM_LATENCY_JITTER_MS = float(os.getenv("FAKE_LLM_LATENCY_JITTER_MS", "0"))
+    FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0"))
+    FAKE_LLM_STREAM_INTERVAL_MS = float(os.getenv("FAKE_LLM_STREAM_INTERVAL_MS", "20"))
+    FAKE_LLM_STREAM_CHUNK_CHARS = int(os.getenv("FAKE_LLM_STREAM_CHUNK_CHARS", "8"))
+    FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+    # 운영 서버(serve.py) 설정
+    SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+    # 워커 재시작 기준 요청 수 (0이면 재시작 안 함) 및 워커별 무작위 추가분
+    WORKER_MAX_REQUESTS = int(os.getenv("WORKER_MAX_REQUESTS", "0"))
+    WORKER_MAX_REQUESTS_JITTER = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", "0"))
+    WORKER_GRACEFUL_TIMEOUT = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+    # 성향 벡터 저장소(메모리 맵 파일) 디렉터리
+    TRAIT_STORE_PATH = os.getenv("TRAIT_STORE_PATH", "data/trait_store")
+    # 버전 있는 라벨링 키워드 사전 JSON 파일 (비우면 코드의 기본 사전 사용)
+    LABEL_KEYWORDS_PATH = os.getenv("LABEL_KEYWORDS_PATH", "")
+    # 키워드 사전 파일 변경 확인 간격(초)
+    LABEL_KEYWORDS_CHECK_INTERVAL = float(
+        os.getenv("LABEL_KEYWORDS_CHECK_INTERVAL", "5")
+    )
 
 
 settings = Settings()
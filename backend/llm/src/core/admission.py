@@ -0,0 +1,299 @@
+"""
+요청 수락 제어 (admission control)와 부하 차단 (load shedding)
+
+요청 경로로 우선순위 클래스(interactive > analysis > batch)를 정하고, 클래스마다 동시 처리 수,
+대기열 길이, 최대 대기 시간을 둠. 워커 전체 동시 처리 수(ADMISSION_MAX_CONCURRENCY,
+기본값은 anyio 스레드풀 크기)가 찼을 때 자리가 나면 우선순위가 높은 클래스의 대기 요청부터 들여보냄.
+대기열이 가득 찼거나 최대 대기 시간이 지나면 바로 503 + Retry-After로 거절함.
+
+최근 LLM 호출 시간이 장기 평균의 ADMISSION_LATENCY_TOLERANCE배를 넘으면 그 비율만큼
+interactive를 제외한 클래스의 동시 처리 수를 줄임 (LLM이 느려질수록 배치부터 덜 받음)
+
+    ADMISSION_CLASSES="interactive=32/64/5,analysis=16/32/10,batch=4/4/0.5"
+    (클래스=동시 처리 수/대기열 길이/최대 대기 초, 앞에 쓴 클래스가 우선순위가 높음)
+    ADMISSION_ROUTE_CLASSES="/chat=interactive,/api/v1/batch-couple-analysis=batch"
+    (경로 접두사=클래스, 맞는 접두사가 없으면 analysis)
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Optional, Tuple
+
+from config import settings
+from core.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_LIMIT,
+    ADMISSION_QUEUE_WAIT,
+    ADMISSION_QUEUED,
+    ADMISSION_SHED,
+)
+
+DEFAULT_CLASS = "analysis"
+
+# 제한하지 않는 경로 (헬스체크, 메트릭, 관리용 API, 문서)
+EXEMPT_PREFIXES = (
+    "/health",
+    "/metrics",
+    "/usage",
+    "/model-routes",
+    "/label/keywords",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+)
+
+
+@lru_cache(maxsize=8)
+def _parse_classes(spec: str) -> Tuple[Tuple[str, int, int, float], ...]:
+    # "interactive=32/64/5,..." → ((이름, 동시 처리 수, 대기열 길이, 최대 대기 초), ...)
+    classes = []
+    for part in spec.split(","):
+        name, _, values = part.strip().partition("=")
+        if not name:
+            continue
+        limit, queue, wait = values.split("/")
+        classes.append((name, int(limit), int(queue), float(wait)))
+    return tuple(classes)
+
+
+@lru_cache(maxsize=8)
+def _parse_route_classes(spec: str) -> Tuple[Tuple[str, str], ...]:
+    # 긴 접두사부터 비교하도록 정렬
+    routes = []
+    for part in spec.split(","):
+        prefix, _, name = part.strip().rpartition("=")
+        if prefix:
+            routes.append((prefix, name))
+    return tuple(sorted(routes, key=lambda route: -len(route[0])))
+
+
+class _Class:
+    """
+    우선순위 클래스 하나의 설정과 상태 (이벤트 루프에서만 접근하므로 잠금 없음)
+    """
+
+    __slots__ = ("name", "limit", "max_queue", "max_wait", "adaptive", "running")
+
+    def __init__(
+        self, name: str, limit: int, max_queue: int, max_wait: float, adaptive: bool
+    ) -> None:
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.adaptive = adaptive
+        self.running = 0
+
+
+class AdmissionController:
+    """
+    우선순위 클래스별 동시 처리 수 제한과 우선순위 대기열
+    """
+
+    def __init__(
+        self,
+        classes: Tuple[Tuple[str, int, int, float], ...],
+        max_concurrency: int,
+        latency_tolerance: float = 1.5,
+    ) -> None:
+        # 첫 번째(가장 높은 우선순위) 클래스는 LLM 지연에 따라 줄이지 않음
+        self.classes: Dict[str, _Class] = {
+            name: _Class(name, limit, queue, wait, adaptive=index > 0)
+            for index, (name, limit, queue, wait) in enumerate(classes)
+        }
+        self.max_concurrency = max_concurrency
+        self.latency_tolerance = latency_tolerance
+        self.running = 0
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {
+            name: deque() for name in self.classes
+        }
+        # LLM 호출 시간 지수 이동 평균 (단기/장기)
+        self._latency_short: Optional[float] = None
+        self._latency_long: Optional[float] = None
+
+    # ---- LLM 지연 기반 적응형 제한 ----------------------------------------
+
+    def observe_llm_latency(self, seconds: float) -> None:
+        """
+        LLM 호출 하나의 소요 시간 기록 (LLMProvider가 호출, 스레드에서 호출될 수 있음)
+        """
+        short, long = self._latency_short, self._latency_long
+        self._latency_short = seconds if short is None else short * 0.9 + seconds * 0.1
+        self._latency_long = seconds if long is None else long * 0.995 + seconds * 0.005
+
+    def gradient(self) -> float:
+        """
+        0.25~1.0: 최근 LLM 호출 시간이 장기 평균 × 허용 배수보다 길어진 만큼 줄어듦
+        """
+        short, long = self._latency_short, self._latency_long
+        if not short or not long:
+            return 1.0
+        return max(0.25, min(1.0, long * self.latency_tolerance / short))
+
+    def effective_limit(self, cls: _Class) -> int:
+        if not cls.adaptive:
+            return cls.limit
+        return max(1, int(cls.limit * self.gradient()))
+
+    def retry_after(self) -> int:
+        """
+        거절 응답의 Retry-After(초): 최근 LLM 호출 시간을 올림 (최소 1초)
+        """
+        return max(1, math.ceil(self._latency_short or 1.0))
+
+    # ---- 수락/반환 ------------------------------------------------------
+
+    def classify(self, path: str) -> Optional[str]:
+        """
+        요청 경로의 클래스 이름 (제한하지 않는 경로면 None)
+        """
+        if path == "/" or path.startswith(EXEMPT_PREFIXES):
+            return None
+        for prefix, name in _parse_route_classes(settings.ADMISSION_ROUTE_CLASSES):
+            if path.startswith(prefix) and name in self.classes:
+                return name
+        return DEFAULT_CLASS if DEFAULT_CLASS in self.classes else None
+
+    def _has_room(self, cls: _Class) -> bool:
+        return (
+            self.running < self.max_concurrency
+            and cls.running < self.effective_limit(cls)
+        )
+
+    def _start(self, cls: _Class) -> None:
+        self.running += 1
+        cls.running += 1
+
+    async def acquire(self, name: str) -> Optional[str]:
+        """
+        처리 자리를 얻으면 None, 거절하면 사유(queue_full | timeout)를 반환
+        """
+        cls = self.classes[name]
+        waiters = self._waiters[name]
+        if not waiters and self._has_room(cls):
+            self._start(cls)
+            ADMISSION_QUEUE_WAIT.observe(0.0, name)
+            return None
+        if len(waiters) >= cls.max_queue:
+            ADMISSION_SHED.inc(name, "queue_full")
+            return "queue_full"
+
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), cls.max_wait)
+        except asyncio.TimeoutError:
+            if not future.done():
+                waiters.remove(future)
+                future.cancel()
+                ADMISSION_SHED.inc(name, "timeout")
+                return "timeout"
+        except asyncio.CancelledError:
+            # 대기 중 연결 종료 등으로 취소: 이미 자리를 받았으면 돌려줌
+            if future.done() and not future.cancelled():
+                self.release(name)
+            elif future in waiters:
+                waiters.remove(future)
+            raise
+        ADMISSION_QUEUE_WAIT.observe(time.perf_counter() - started, name)
+        return None
+
+    def release(self, name: str) -> None:
+        cls = self.classes[name]
+        self.running -= 1
+        cls.running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # 빈 자리를 우선순위가 높은 클래스의 대기 요청부터 채움
+        for name, cls in self.classes.items():
+            waiters = self._waiters[name]
+            while waiters and self._has_room(cls):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                self._start(cls)
+                future.set_result(None)
+            if self.running >= self.max_concurrency:
+                return
+
+    def register_metrics(self) -> None:
+        """
+        클래스별 처리 중/대기 중 요청 수와 현재 제한을 /metrics 조회 시점에 계산
+        """
+        for name, cls in self.classes.items():
+            ADMISSION_IN_FLIGHT.set_function(lambda cls=cls: cls.running, name)
+            ADMISSION_QUEUED.set_function(
+                lambda name=name: len(self._waiters[name]), name
+            )
+            ADMISSION_LIMIT.set_function(
+                lambda cls=cls: self.effective_limit(cls), name
+            )
+
+
+class AdmissionMiddleware:
+    """
+    요청 경로의 클래스로 수락 여부를 정하는 ASGI 미들웨어 (거절하면 503 + Retry-After)
+    """
+
+    def __init__(self, app, controller: Optional["AdmissionController"] = None) -> None:
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope, receive, send) -> None:
+        # preflight(OPTIONS)는 LLM을 부르지 않으므로 자리를 차지하지 않음
+        if (
+            scope["type"] != "http"
+            or scope.get("method") == "OPTIONS"
+            or not settings.ADMISSION_ENABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+        name = self.controller.classify(scope.get("path", ""))
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+        reason = await self.controller.acquire(name)
+        if reason is not None:
+            await self._reject(send, name, reason)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(name)
+
+    async def _reject(self, send, name: str, reason: str) -> None:
+        body = json.dumps(
+            {
+                "detail": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요.",
+                "priority_class": name,
+                "reason": reason,
+            },
+            ensure_ascii=False,
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.controller.retry_after()).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+# 싱글턴 인스턴스
+admission_controller = AdmissionController(
+    _parse_classes(settings.ADMISSION_CLASSES),
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    latency_tolerance=settings.ADMISSION_LATENCY_TOLERANCE,
+)
+admission_controller.register_metrics()
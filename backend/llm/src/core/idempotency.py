@@ -0,0 +1,283 @@
+"""
+Idempotency-Key 처리 (분석 API 재시도 시 LLM 작업을 다시 하지 않음)
+
+IDEMPOTENCY_PATHS의 POST 요청에 Idempotency-Key 헤더가 있으면 응답(상태 코드, 헤더, 본문)을
+키별로 IDEMPOTENCY_TTL초 동안 보관하고, 같은 키로 다시 오면 저장된 응답을 그대로(바이트 단위로)
+돌려줌 (Idempotent-Replayed: true 헤더 추가).
+
+- 같은 키의 첫 요청이 아직 처리 중이면 새로 처리하지 않고 끝날 때까지 기다렸다가 그 결과를 돌려줌
+  (IDEMPOTENCY_WAIT_TIMEOUT초가 지나면 409)
+- 같은 키로 다른 본문을 보내면 422
+- 저장소가 처리 중인 키로 가득 차 있으면 새 키는 503 (처리 중인 항목은 지우지 않음)
+- 5xx 응답, 예외, 처리 중 취소는 저장하지 않으므로 다음 재시도가 새로 처리함
+- 키가 있는 요청은 클라이언트가 끊겨도 취소하지 않고 끝까지 처리해 결과를 저장함
+  (타임아웃으로 끊고 재시도하는 호출자가 결과를 받을 수 있도록)
+- 저장소는 프로세스 메모리이므로 serve.py 멀티 워커에서는 같은 워커로 온 재시도만 재사용됨
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Tuple
+
+from config import settings
+from core.metrics import IDEMPOTENCY_ENTRIES, IDEMPOTENCY_REQUESTS
+from core.request_context import current_request
+
+IDEMPOTENCY_KEY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+Key = Tuple[str, str]
+Headers = List[Tuple[bytes, bytes]]
+
+
+@lru_cache(maxsize=8)
+def _paths(spec: str) -> FrozenSet[str]:
+    return frozenset(path.strip() for path in spec.split(",") if path.strip())
+
+
+class _Entry:
+    """
+    키 하나의 처리 상태 (status가 None이면 처리 중)
+    """
+
+    __slots__ = ("fingerprint", "done", "status", "headers", "body", "expires_at")
+
+    def __init__(self, fingerprint: str) -> None:
+        self.fingerprint = fingerprint
+        self.done = asyncio.Event()
+        self.status: Optional[int] = None
+        self.headers: Headers = []
+        self.body = b""
+        self.expires_at = float("inf")
+
+
+class IdempotencyStore:
+    """
+    (경로, 키)별 응답 저장소 (이벤트 루프에서만 접근하므로 잠금 없음)
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Key) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def begin(self, key: Key, fingerprint: str) -> Optional[_Entry]:
+        """
+        키의 처리 시작을 기록 (저장소가 처리 중인 항목으로 가득 차 있으면 None)
+        """
+        self._evict(self.max_entries - 1)
+        if len(self._entries) >= self.max_entries:
+            return None
+        entry = self._entries[key] = _Entry(fingerprint)
+        return entry
+
+    def complete(
+        self, key: Key, entry: _Entry, status: int, headers: Headers, body: bytes
+    ) -> None:
+        entry.status = status
+        entry.headers = headers
+        entry.body = body
+        entry.expires_at = time.monotonic() + self.ttl
+        if self._entries.get(key) is entry:
+            self._entries.move_to_end(key)
+        entry.done.set()
+
+    def abandon(self, key: Key, entry: _Entry) -> None:
+        # 저장하지 않고 지움 (기다리던 재시도 중 하나가 새로 처리함)
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set()
+
+    def _evict(self, limit: int) -> None:
+        # 오래된 완료 항목부터 만료/개수 초과분을 지움 (처리 중인 항목을 지우면 중복 실행되므로 둠)
+        now = time.monotonic()
+        excess = len(self._entries) - limit
+        evicted = []
+        for key, entry in self._entries.items():
+            if entry.status is None:
+                continue
+            if entry.expires_at > now and excess <= 0:
+                break
+            evicted.append(key)
+            excess -= 1
+        for key in evicted:
+            self._entries.pop(key).done.set()
+
+
+async def _send_json(send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key가 있는 분석 API 요청의 응답을 저장/재사용하는 ASGI 미들웨어
+    """
+
+    def __init__(self, app, store: Optional[IdempotencyStore] = None) -> None:
+        self.app = app
+        self.store = store if store is not None else idempotency_store
+
+    async def __call__(self, scope, receive, send) -> None:
+        key = self._key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+        if len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, "Idempotency-Key가 너무 깁니다.")
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            return  # 본문을 받기 전에 연결이 끊김
+        fingerprint = hashlib.sha256(body).hexdigest()
+        store_key = (path, key)
+        waited = False
+        while True:
+            entry = self.store.get(store_key)
+            if entry is None:
+                entry = self.store.begin(store_key, fingerprint)
+                if entry is None:
+                    IDEMPOTENCY_REQUESTS.inc(path, "full")
+                    await _send_json(
+                        send,
+                        503,
+                        "처리 중인 요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                    )
+                    return
+                break
+            if entry.fingerprint != fingerprint:
+                IDEMPOTENCY_REQUESTS.inc(path, "mismatch")
+                await _send_json(
+                    send, 422, "같은 Idempotency-Key로 다른 요청 본문을 보냈습니다."
+                )
+                return
+            if entry.status is not None:
+                IDEMPOTENCY_REQUESTS.inc(path, "replayed")
+                await self._replay(entry, send)
+                return
+            # 첫 요청이 처리 중이면 끝날 때까지 기다림 (저장되지 않고 끝나면 새로 처리)
+            if not waited:
+                IDEMPOTENCY_REQUESTS.inc(path, "waited")
+                waited = True
+            try:
+                await asyncio.wait_for(
+                    entry.done.wait(), settings.IDEMPOTENCY_WAIT_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                IDEMPOTENCY_REQUESTS.inc(path, "conflict")
+                await _send_json(
+                    send, 409, "같은 Idempotency-Key의 요청이 아직 처리 중입니다."
+                )
+                return
+
+        IDEMPOTENCY_REQUESTS.inc(path, "new")
+        await self._run_and_store(scope, receive, send, store_key, entry, body)
+
+    def _key(self, scope) -> Optional[str]:
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            return None
+        if scope.get("path") not in _paths(settings.IDEMPOTENCY_PATHS):
+            return None
+        for name, value in scope.get("headers", ()):
+            if name == IDEMPOTENCY_KEY_HEADER.encode():
+                return value.decode("latin-1").strip() or None
+        return None
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _run_and_store(
+        self, scope, receive, send, store_key: Key, entry: _Entry, body: bytes
+    ) -> None:
+        ctx = current_request()
+        if ctx is not None:
+            # 재시도가 결과를 받을 수 있도록 클라이언트가 끊겨도 끝까지 처리
+            ctx.cancel_on_disconnect = False
+        body_sent = False
+        status: Optional[int] = None
+        headers: Headers = []
+        chunks: List[bytes] = []
+        size = 0
+
+        async def receive_buffered():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def send_and_capture(message) -> None:
+            nonlocal status, headers, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", ()))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                    chunks.append(chunk)
+            await send(message)
+
+        stored = False
+        try:
+            await self.app(scope, receive_buffered, send_and_capture)
+            if (
+                status is not None
+                and status < 500
+                and size <= settings.IDEMPOTENCY_MAX_BODY_BYTES
+            ):
+                self.store.complete(store_key, entry, status, headers, b"".join(chunks))
+                stored = True
+        finally:
+            if not stored:
+                self.store.abandon(store_key, entry)
+
+    @staticmethod
+    async def _replay(entry: _Entry, send) -> None:
+        headers = [*entry.headers, (REPLAYED_HEADER.encode(), b"true")]
+        await send(
+            {"type": "http.response.start", "status": entry.status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": entry.body})
+
+
+# 싱글턴 인스턴스
+idempotency_store = IdempotencyStore(
+    settings.IDEMPOTENCY_TTL, settings.IDEMPOTENCY_MAX_ENTRIES
+)
+IDEMPOTENCY_ENTRIES.set_function(lambda: len(idempotency_store))
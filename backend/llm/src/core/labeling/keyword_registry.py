@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .label_codes import LABEL_CATEGORIES, label_bit
+
+logger = logging.getLogger(__name__)
+
+KeywordDict = Dict[str, Dict[Enum, List[str]]]
+
+
+class CompiledKeywords:
+    """
+    한 버전의 키워드 사전과 컴파일된 매처 (생성 후 변경하지 않음)
+
+    요청은 시작할 때 registry.active 를 한 번 읽어 끝까지 같은 버전으로 처리하므로,
+    새 버전으로 교체되어도 진행 중인 요청은 이전 버전으로 마무리됨
+    """
+
+    __slots__ = ("version", "keywords", "_compiled")
+
+    def __init__(self, version: str, keywords: KeywordDict) -> None:
+        self.version = version
+        self.keywords = keywords
+        # (라벨 비트, 키워드 튜플) 목록. 라벨 ID 순서로 정렬해 두고 매칭 시 그대로 순회
+        self._compiled: Tuple[Tuple[int, Tuple[str, ...]], ...] = tuple(
+            sorted(
+                (
+                    (label_bit(category, label), tuple(words))
+                    for category, label_dict in keywords.items()
+                    for label, words in label_dict.items()
+                    if words
+                ),
+                key=lambda item: item[0],
+            )
+        )
+
+    def label_mask(self, message: str) -> int:
+        """
+        입력 메시지에 키워드가 포함된 라벨들을 비트마스크로 반환
+        """
+        mask = 0
+        for bit, keywords in self._compiled:
+            for kw in keywords:
+                if kw in message:
+                    mask |= bit
+                    break  # 한 라벨에 여러 키워드가 있어도 한 번만 추가
+        return mask
+
+    @classmethod
+    def from_json(cls, data: Mapping) -> "CompiledKeywords":
+        """
+        {"version": "...", "keywords": {카테고리: {라벨 이름 또는 값: [키워드, ...]}}}
+        """
+        version = data.get("version")
+        if not version:
+            raise ValueError("키워드 사전에 version이 없습니다.")
+        keywords: KeywordDict = {}
+        for category, label_dict in data.get("keywords", {}).items():
+            enum = LABEL_CATEGORIES.get(category)
+            if enum is None:
+                raise ValueError(f"알 수 없는 카테고리: {category}")
+            by_text = {m.name: m for m in enum}
+            by_text.update({m.value: m for m in enum})
+            keywords[category] = {}
+            for label, words in label_dict.items():
+                member = by_text.get(label)
+                if member is None:
+                    raise ValueError(f"알 수 없는 라벨: {category}.{label}")
+                if not isinstance(words, Sequence) or isinstance(words, str):
+                    raise ValueError(f"키워드 목록이 아닙니다: {category}.{label}")
+                keywords[category][member] = [str(w) for w in words if w]
+        return cls(str(version), keywords)
+
+    def to_json(self) -> dict:
+        return {
+            "version": self.version,
+            "keywords": {
+                category: {label.name: list(words) for label, words in labels.items()}
+                for category, labels in self.keywords.items()
+            },
+        }
+
+
+class KeywordRegistry:
+    """
+    현재 사용 중인 키워드 사전 버전 관리
+
+    path가 있으면 파일의 키워드 사전을 쓰고, 파일이 바뀌면(mtime) 새 버전을 한 번 컴파일한
+    뒤 참조 하나만 바꿔 끼움. 새 파일이 잘못되었으면 기존 버전을 그대로 유지함.
+    """
+
+    def __init__(
+        self,
+        default: CompiledKeywords,
+        path: Optional[str] = None,
+        check_interval: float = 5.0,
+    ) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self._active = default
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        if path:
+            self.reload()
+
+    @property
+    def active(self) -> CompiledKeywords:
+        """
+        현재 버전 (파일 변경은 check_interval 간격으로만 확인)
+        """
+        if self.path and time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._active
+
+    @property
+    def version(self) -> str:
+        return self.active.version
+
+    def reload(self, force: bool = False) -> CompiledKeywords:
+        """
+        파일이 바뀌었으면 새 버전을 컴파일해 교체하고 현재 버전을 반환
+        """
+        if not self.path:
+            return self._active
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as e:
+                logger.error(f"키워드 사전 파일을 읽을 수 없습니다: {e}")
+                return self._active
+            if not force and mtime == self._mtime:
+                return self._active
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    compiled = CompiledKeywords.from_json(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"키워드 사전 로드 실패, 기존 버전 유지: {e}")
+                return self._active
+            self._mtime = mtime
+            if compiled.version != self._active.version:
+                logger.info(
+                    f"키워드 사전 교체: {self._active.version} → {compiled.version}"
+                )
+            self._active = compiled
+            return compiled
+
+    def swap(self, compiled: CompiledKeywords) -> None:
+        """
+        컴파일된 버전으로 직접 교체 (테스트/관리용)
+        """
+        with self._lock:
+            self._active = compiled
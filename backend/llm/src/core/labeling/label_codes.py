@@ -0,0 +1,131 @@
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Tuple, Type
+
+from .labels import (
+    AttachmentPattern,
+    CommunicationStyle,
+    EmotionExpression,
+    RelationshipAttitude,
+    SelfAssertion,
+    TopicContext,
+)
+
+# 카테고리별 라벨 Enum (순서 = 카테고리 번호, 새 카테고리는 맨 뒤에만 추가)
+LABEL_CATEGORIES: Dict[str, Type[Enum]] = {
+    "emotion_expression": EmotionExpression,
+    "self_assertion": SelfAssertion,
+    "relationship_attitude": RelationshipAttitude,
+    "communication_style": CommunicationStyle,
+    "attachment_pattern": AttachmentPattern,
+    "topic_context": TopicContext,
+}
+
+# 카테고리당 예약된 ID 개수. 라벨 ID = 카테고리 번호 * 10 + Enum 내 순서이므로
+# 각 Enum 끝에 라벨을 추가해도 기존 ID는 바뀌지 않음 (전체 60비트 → uint64에 들어감)
+CATEGORY_STRIDE = 10
+
+LABEL_IDS: Dict[Tuple[str, Enum], int] = {}
+LABEL_BY_ID: Dict[int, Tuple[str, Enum]] = {}
+# 라벨 값("애정 표현")과 이름("affection") 모두 ID로 조회 가능
+_ID_BY_TEXT: Dict[Tuple[str, str], int] = {}
+
+for _cat_index, (_category, _enum) in enumerate(LABEL_CATEGORIES.items()):
+    for _member_index, _member in enumerate(_enum):
+        if _member_index >= CATEGORY_STRIDE:
+            raise ValueError(f"{_category} 라벨 수가 {CATEGORY_STRIDE}개를 넘습니다.")
+        _label_id = _cat_index * CATEGORY_STRIDE + _member_index
+        LABEL_IDS[(_category, _member)] = _label_id
+        LABEL_BY_ID[_label_id] = (_category, _member)
+        _ID_BY_TEXT[(_category, _member.value)] = _label_id
+        _ID_BY_TEXT[(_category, _member.name)] = _label_id
+
+MAX_LABEL_ID = max(LABEL_BY_ID)
+
+
+def label_id(category: str, label: Enum) -> int:
+    """
+    (카테고리, 라벨) → 라벨 ID
+    """
+    return LABEL_IDS[(category, label)]
+
+
+def label_bit(category: str, label: Enum) -> int:
+    """
+    (카테고리, 라벨) → 비트마스크의 해당 비트
+    """
+    return 1 << LABEL_IDS[(category, label)]
+
+
+def iter_label_ids(mask: int) -> Iterator[int]:
+    """
+    비트마스크에 포함된 라벨 ID를 오름차순으로 반환
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def mask_to_labels(mask: int) -> Dict[str, List[str]]:
+    """
+    비트마스크 → API 응답용 {카테고리: [라벨 값, ...]} 딕셔너리
+    """
+    result: Dict[str, List[str]] = {}
+    for lid in iter_label_ids(mask):
+        category, member = LABEL_BY_ID[lid]
+        result.setdefault(category, []).append(member.value)
+    return result
+
+
+def labels_to_mask(labels: Dict[str, Iterable[str]]) -> int:
+    """
+    {카테고리: [라벨 값 또는 이름, ...]} 딕셔너리 → 비트마스크
+
+    알 수 없는 카테고리/라벨은 무시 (LLM 응답 라벨도 그대로 받을 수 있음)
+    """
+    mask = 0
+    for category, values in labels.items():
+        if not isinstance(values, (list, tuple, set)):
+            continue
+        for value in values:
+            lid = _ID_BY_TEXT.get((category, value))
+            if lid is not None:
+                mask |= 1 << lid
+    return mask
+
+
+def count_labels(masks: Iterable[int]) -> List[int]:
+    """
+    여러 메시지의 비트마스크에서 라벨 ID별 등장 횟수 집계
+    """
+    counts = [0] * (MAX_LABEL_ID + 1)
+    for mask in masks:
+        for lid in iter_label_ids(mask):
+            counts[lid] += 1
+    return counts
+
+
+class LabeledMessageRecord:
+    """
+    라벨링된 메시지의 내부 표현 (라벨 집합은 비트마스크로 보관)
+    """
+
+    __slots__ = ("sender", "text", "mask")
+
+    def __init__(self, sender: str, text: str, mask: int) -> None:
+        self.sender = sender
+        self.text = text
+        self.mask = mask
+
+    def has(self, category: str, label: Enum) -> bool:
+        return bool(self.mask & label_bit(category, label))
+
+    def to_dict(self) -> dict:
+        """
+        API 응답 형식({"sender", "text", "labels"})으로 변환
+        """
+        return {
+            "sender": self.sender,
+            "text": self.text,
+            "labels": mask_to_labels(self.mask),
+        }
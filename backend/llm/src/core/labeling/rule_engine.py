@@ -1,5 +1,9 @@
-from typing import Any, Dict
+from typing import Optional
 
+from config import settings
+
+from .keyword_registry import CompiledKeywords, KeywordRegistry
+from .label_codes import mask_to_labels
 from .labels import (
     AttachmentPattern,
     CommunicationStyle,
@@ -9,7 +13,7 @@ from .labels import (
     TopicContext,
 )
 
-# 각 카테고리별 키워드 사전
+# 각 카테고리별 기본 키워드 사전 (운영 중 조정은 LABEL_KEYWORDS_PATH 파일로)
 KEYWORDS = {
     "emotion_expression": {
         EmotionExpression.affection: ["사랑해", "보고 싶어", "소중해"],
@@ -66,19 +70,33 @@ KEYWORDS = {
 }
 
 
-def label_message(message: str) -> dict:
+# 키워드 사전 파일이 없을 때 쓰는 기본 버전
+BUILTIN_KEYWORDS = CompiledKeywords("builtin", KEYWORDS)
+
+# 현재 키워드 사전 버전 (LABEL_KEYWORDS_PATH 파일이 바뀌면 실행 중에 교체됨)
+keyword_registry = KeywordRegistry(
+    BUILTIN_KEYWORDS,
+    path=settings.LABEL_KEYWORDS_PATH or None,
+    check_interval=settings.LABEL_KEYWORDS_CHECK_INTERVAL,
+)
+
+
+def label_message_mask(
+    message: str, keywords: Optional[CompiledKeywords] = None
+) -> int:
+    """
+    입력 메시지에 키워드가 포함된 라벨들을 비트마스크로 반환
+
+    keywords를 주지 않으면 현재 버전을 사용. 여러 메시지를 처리할 때는 호출하는 쪽에서
+    keyword_registry.active 를 한 번 읽어 넘겨야 중간에 버전이 섞이지 않음
+    """
+    if keywords is None:
+        keywords = keyword_registry.active
+    return keywords.label_mask(message)
+
+
+def label_message(message: str, keywords: Optional[CompiledKeywords] = None) -> dict:
     """
     입력 메시지에서 각 카테고리별로 키워드가 포함되어 있으면 해당 라벨을 반환
     """
-    result = {}
-    keywords_dict: Dict[str, Any] = dict(KEYWORDS)
-    for category, label_dict in keywords_dict.items():
-        matched = []
-        for label, keywords in label_dict.items():
-            for kw in keywords:
-                if kw in message:
-                    matched.append(label.value)
-                    break  # 한 라벨에 여러 키워드가 있어도 한 번만 추가
-        if matched:
-            result[category] = matched
-    return result
+    return mask_to_labels(label_message_mask(message, keywords))
@@ -0,0 +1,244 @@
+"""
+구조화 로깅 (structlog + 큐 기반 비동기 핸들러)
+
+- 모든 로거(표준 logging, structlog, uvicorn)의 레코드는 bounded 큐에 넣기만 하고,
+  백그라운드 스레드가 JSON(LOG_FORMAT=json) 또는 사람이 읽는 형식(console)으로 변환해 stderr에 씀.
+  큐가 가득 차면 버림 (요청 스레드는 로그 출력 I/O를 기다리지 않음)
+- 프롬프트/LLM 응답 같은 큰 본문은 log_payload로만 기록: 라우트별 비율로 샘플링된 요청에서
+  앞부분 LOG_PAYLOAD_MAX_CHARS 글자 + 길이 + 해시만 남기고, DEBUG 레벨이면 전체 본문을 남김
+"""
+
+import atexit
+import copy
+import hashlib
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import structlog
+
+from config import settings
+from core.metrics import LOG_RECORDS_DROPPED
+from core.request_context import current_request
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 필드로 보고 출력에 포함)
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "request_id",
+    "color_message",  # uvicorn이 붙이는 색상 메시지
+    "_logger",
+    "_name",
+}
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    요청 스레드에서는 메시지 인자와 요청 ID만 확정하고 포맷은 리스너 스레드에 맡김
+    """
+
+    def __init__(self, queue_size: int) -> None:
+        self.queue_size = queue_size
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        super().__init__(queue.Queue(queue_size))
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.args and not isinstance(record.msg, dict):
+            # 인자로 넘긴 객체가 나중에 바뀌어도 호출 시점의 메시지가 남도록
+            record.msg = record.getMessage()
+            record.args = None
+        ctx = current_request()
+        record.request_id = ctx.request_id if ctx is not None else None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        # 큐에 남은 레코드가 출력될 때까지 기다림 (테스트/종료용)
+        if self._pid != os.getpid():
+            return
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _ensure_listener(self) -> None:
+        # fork된 워커에서는 부모의 리스너 스레드가 없으므로 프로세스마다 새로 시작
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = logging.handlers.QueueListener(
+                self.queue, _output_handler()
+            )
+            self.listener.start()
+            if self._pid is None:
+                atexit.register(self.flush)
+            self._pid = os.getpid()
+
+
+def _record_fields(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    record: logging.LogRecord = event_dict["_record"]
+    event_dict["timestamp"] = datetime.fromtimestamp(
+        record.created, timezone.utc
+    ).isoformat(timespec="milliseconds")
+    event_dict["level"] = record.levelname.lower()
+    event_dict["logger"] = record.name
+    event_dict["pid"] = record.process
+    if getattr(record, "request_id", None):
+        event_dict["request_id"] = record.request_id
+    if not event_dict["_from_structlog"]:
+        for key, value in vars(record).items():
+            if key not in _RESERVED and key not in event_dict:
+                event_dict[key] = value
+    return event_dict
+
+
+def _output_handler() -> logging.Handler:
+    if settings.LOG_FORMAT == "console":
+        renderer: Any = structlog.dev.ConsoleRenderer(colors=False)
+        processors = [_record_fields]
+    else:
+        renderer = structlog.processors.JSONRenderer(ensure_ascii=False, default=str)
+        processors = [_record_fields, structlog.processors.format_exc_info]
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            processors=[
+                *processors,
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                renderer,
+            ]
+        )
+    )
+    return handler
+
+
+_handler: Optional[_QueueHandler] = None
+
+
+def configure_logging() -> None:
+    """
+    루트 로거에 큐 핸들러를 연결 (여러 번 호출해도 한 번만 설정)
+    """
+    global _handler
+    if _handler is not None:
+        return
+    _handler = _QueueHandler(settings.LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+    # uvicorn CLI가 붙인 동기 핸들러 대신 같은 큐로 보냄
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+
+def flush_logs() -> None:
+    """
+    큐에 남은 로그를 모두 출력 (테스트/종료용)
+    """
+    if _handler is not None:
+        _handler.flush()
+
+
+# ---- 큰 본문(프롬프트/응답) 로깅 ----------------------------------------------
+
+
+@lru_cache(maxsize=8)
+def _route_rates(spec: str) -> Dict[str, float]:
+    # "/analyze=0.1,/chat-history=0" 형식
+    rates = {}
+    for part in spec.split(","):
+        route, _, rate = part.strip().rpartition("=")
+        if route:
+            rates[route] = float(rate)
+    return rates
+
+
+def payload_sampled() -> bool:
+    """
+    이 요청의 본문을 로그에 남길지 여부 (요청마다 한 번 정하고 요청 안에서는 같은 결정을 따름)
+    """
+    ctx = current_request()
+    if ctx is not None and ctx.log_sampled is not None:
+        return ctx.log_sampled
+    route = ctx.resolve_route() if ctx is not None else ""
+    rate = _route_rates(settings.LOG_PAYLOAD_ROUTE_SAMPLE_RATES).get(
+        route, settings.LOG_PAYLOAD_SAMPLE_RATE
+    )
+    sampled = rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+    if ctx is not None:
+        ctx.log_sampled = sampled
+    return sampled
+
+
+def summarize_payload(text: Any, max_chars: Optional[int] = None) -> Dict[str, Any]:
+    """
+    본문 요약: 길이, SHA-256 앞 16자리, 앞부분 max_chars 글자 (0이면 미리보기 없음)
+    """
+    text = text if isinstance(text, str) else str(text)
+    if max_chars is None:
+        max_chars = settings.LOG_PAYLOAD_MAX_CHARS
+    summary: Dict[str, Any] = {
+        "chars": len(text),
+        "sha256": hashlib.sha256(text.encode()).hexdigest()[:16],
+    }
+    if max_chars > 0:
+        summary["preview"] = text if len(text) <= max_chars else text[:max_chars] + "…"
+    return summary
+
+
+def log_payload(
+    logger: logging.Logger,
+    event: str,
+    text: Any,
+    level: int = logging.INFO,
+    **fields: Any,
+) -> None:
+    """
+    프롬프트/응답 같은 큰 본문 로그
+
+    - DEBUG 레벨이 켜져 있으면 샘플링과 관계없이 전체 본문을 기록 (INFO 이하는 DEBUG로)
+    - INFO는 샘플링된 요청만, WARNING 이상은 항상 기록하되 본문은 요약만 남김
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        full_level = level if level >= logging.WARNING else logging.DEBUG
+        logger.log(full_level, event, extra={"payload": text, **fields})
+        return
+    if not logger.isEnabledFor(level):
+        return
+    if level < logging.WARNING and not payload_sampled():
+        return
+    logger.log(level, event, extra={"payload": summarize_payload(text), **fields})
@@ -0,0 +1,387 @@
+"""
+Prometheus 텍스트 형식 메트릭 (외부 의존성 없음)
+
+기록은 스레드별 샤드에만 쓰므로 요청 경로에서 잠금이 없음 (스레드가 처음 기록할 때만
+샤드 등록용 잠금을 잡음). /metrics 조회 시 샤드를 합산함. 스레드가 끝나면 그 샤드는
+누적값에 합치고 지우므로 스레드 풀이 스레드를 바꿔도 샤드가 계속 늘지 않음.
+메트릭은 프로세스 단위이므로 serve.py 멀티 워커에서는 응답한 워커의 값만 보임.
+"""
+
+import abc
+import itertools
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 120)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _ShardOwner:
+    """
+    스레드 로컬에 두는 샤드 소유자 (스레드가 끝나 사라지면 샤드를 누적값에 합침)
+    """
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self) -> None:
+        self.shard: dict = {}
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        registry: Optional["Registry"] = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._local = threading.local()
+        self._shards: Dict[int, dict] = {}
+        # 끝난 스레드들의 샤드를 합친 값
+        self._retired: dict = {}
+        self._shard_ids = itertools.count()
+        self._shards_lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def _shard(self) -> dict:
+        owner = getattr(self._local, "owner", None)
+        if owner is None:
+            owner = self._local.owner = _ShardOwner()
+            with self._shards_lock:
+                shard_id = next(self._shard_ids)
+                self._shards[shard_id] = owner.shard
+            weakref.finalize(owner, self._retire, shard_id)
+        return owner.shard
+
+    def _retire(self, shard_id: int) -> None:
+        with self._shards_lock:
+            shard = self._shards.pop(shard_id, None)
+            if shard:
+                self._merge(self._retired, shard)
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            shards = [self._retired, *self._shards.values()]
+            return [dict(shard) for shard in shards]
+
+    @abc.abstractmethod
+    def _merge(self, into: dict, shard: dict) -> None:
+        """
+        샤드 값을 into에 더함 (into의 값은 제자리에서 바꾸지 않고 새 값으로 교체)
+        """
+
+    @abc.abstractmethod
+    def samples(self) -> List[str]:
+        """
+        Prometheus 텍스트 형식의 샘플 줄 목록
+        """
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return sum(shard.get(labels, 0.0) for shard in self._snapshot())
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        for labels, value in shard.items():
+            into[labels] = into.get(labels, 0.0) + value
+
+    def _totals(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in sorted(self._totals().items())
+        ]
+
+
+class Gauge(Counter):
+    """
+    inc/dec로 바뀌는 값(진행 중인 요청 수 등) 또는 조회 시점에 계산하는 값(set_function)
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        registry: Optional["Registry"] = None,
+    ) -> None:
+        super().__init__(name, documentation, label_names, registry)
+        self._functions: Dict[Labels, Callable[[], float]] = {}
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, function: Callable[[], float], *labels: str) -> None:
+        self._functions[labels] = function
+
+    def _totals(self) -> Dict[Labels, float]:
+        totals = super()._totals()
+        for labels, function in list(self._functions.items()):
+            totals[labels] = float(function())
+        return totals
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_BUCKETS,
+        registry: Optional["Registry"] = None,
+    ) -> None:
+        super().__init__(name, documentation, label_names, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [버킷별 개수..., +Inf 개수, 합계]
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, *labels: str) -> int:
+        return sum(sum(s[labels][:-1]) for s in self._snapshot() if labels in s)
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        for labels, state in shard.items():
+            total = into.get(labels)
+            into[labels] = (
+                list(state) if total is None else [a + b for a, b in zip(total, state)]
+            )
+
+    def samples(self) -> List[str]:
+        merged: Dict[Labels, List[float]] = {}
+        for shard in self._snapshot():
+            for labels, state in shard.items():
+                total = merged.setdefault(labels, [0.0] * len(state))
+                for i, v in enumerate(list(state)):
+                    total[i] += v
+        names = self.label_names + ("le",)
+        lines: List[str] = []
+        for labels, state in sorted(merged.items()):
+            cumulative = 0.0
+            for bound, n in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += n
+                le = _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, labels + (le,))} "
+                    f"{_format_value(cumulative)}"
+                )
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{label_str} {_format_value(cumulative)}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+# ---- HTTP ---------------------------------------------------------------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (라우트 템플릿 기준)",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "처리 중인 HTTP 요청 수", ("method",)
+)
+
+# ---- LLM ----------------------------------------------------------------
+
+LLM_CALL_DURATION = Histogram(
+    "llm_call_duration_seconds",
+    "LLM 호출 시간 (provider/model/호출 위치별)",
+    ("provider", "model", "call_site", "outcome"),
+    buckets=LLM_BUCKETS,
+)
+LLM_CALLS_IN_FLIGHT = Gauge(
+    "llm_calls_in_flight", "진행 중인 LLM 호출 수", ("provider",)
+)
+LLM_PARSE_FAILURES = Counter(
+    "llm_response_parse_failures_total",
+    "LLM 응답 JSON 파싱 실패 수",
+    ("call_site",),
+)
+LLM_FALLBACKS = Counter(
+    "llm_fallbacks_total",
+    "LLM 결과 대신 기본값/룰 기반 결과를 반환한 수",
+    ("call_site",),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM 토큰 사용량 (type=input|output|cache_read|cache_write, 요청이 들어온 라우트 기준)",
+    ("route", "model", "type"),
+)
+LLM_COST = Counter(
+    "llm_cost_usd_total", "LLM 예상 비용(USD), 라우트/모델별", ("route", "model")
+)
+LLM_BUDGET_EXCEEDED = Counter(
+    "llm_token_budget_exceeded_total",
+    "요청 토큰 예산 초과로 중단된 LLM 호출 수",
+    ("route",),
+)
+LLM_HEDGES = Counter(
+    "llm_hedges_total",
+    "LLM 헤지 호출 수 (result=sent|won|budget_exhausted)",
+    ("call_site", "result"),
+)
+CANCELLED_WORK = Counter(
+    "cancelled_work_total",
+    "클라이언트 연결 종료로 중단/생략한 작업 수 (kind=request|llm_call|batch_item|graph_step)",
+    ("route", "kind"),
+)
+LLM_DEADLINE_SKIPPED = Counter(
+    "llm_deadline_skipped_total",
+    "요청 마감 시간 안에 끝낼 수 없어 건너뛴 LLM 호출 수",
+    ("route", "call_site"),
+)
+CONVERSATION_SUMMARIES = Counter(
+    "conversation_summaries_total",
+    "대화 메모리 요약 사용 결과 (result=cached|refreshed|failed)",
+    ("route", "result"),
+)
+CONVERSATION_PROMPT_TOKENS = Histogram(
+    "conversation_prompt_tokens",
+    "대화 메모리를 거쳐 LLM에 보낸 대화의 예상 토큰 수",
+    ("route",),
+    buckets=TOKEN_BUCKETS,
+)
+
+# ---- 수락 제어 ------------------------------------------------------------
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "우선순위 클래스별 처리 중인 요청 수", ("class",)
+)
+ADMISSION_QUEUED = Gauge(
+    "admission_queued", "우선순위 클래스별 대기 중인 요청 수", ("class",)
+)
+ADMISSION_LIMIT = Gauge(
+    "admission_limit", "우선순위 클래스별 현재 동시 처리 수 제한", ("class",)
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "수락될 때까지 대기한 시간", ("class",)
+)
+ADMISSION_SHED = Counter(
+    "admission_shed_total",
+    "503으로 거절한 요청 수 (reason=queue_full|timeout)",
+    ("class", "reason"),
+)
+
+# ---- Idempotency-Key -----------------------------------------------------
+
+IDEMPOTENCY_REQUESTS = Counter(
+    "idempotency_requests_total",
+    "Idempotency-Key 요청 처리 결과 (result=new|replayed|waited|mismatch|conflict|full)",
+    ("path", "result"),
+)
+IDEMPOTENCY_ENTRIES = Gauge("idempotency_entries", "보관 중인 Idempotency-Key 수")
+
+# ---- 채팅 세션 -----------------------------------------------------------
+
+CHAT_SESSIONS = Gauge("chat_sessions", "보관 중인 채팅 세션 수")
+CHAT_SESSION_TURNS = Counter(
+    "chat_session_turns_total",
+    "채팅 세션 턴 처리 수 (transport=ws|http, result=ok|error)",
+    ("transport", "result"),
+)
+
+# ---- 캐시 ---------------------------------------------------------------
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "캐시 조회 수 (result=hit|miss)", ("cache", "result")
+)
+CACHE_ENTRIES = Gauge("cache_entries", "캐시 항목 수", ("cache",))
+
+# ---- 로깅 ---------------------------------------------------------------
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "로그 큐가 가득 차 버린 레코드 수"
+)
+
+
+def record_request(ctx, status: int, duration: float, error) -> None:
+    """
+    RequestContextMiddleware 종료 훅: 요청 처리 시간 기록
+    """
+    HTTP_REQUESTS_IN_FLIGHT.dec(ctx.method)
+    HTTP_REQUEST_DURATION.observe(duration, ctx.method, ctx.route, str(status))
+
+
+def record_request_start(ctx) -> None:
+    """
+    RequestContextMiddleware 시작 훅
+    """
+    HTTP_REQUESTS_IN_FLIGHT.inc(ctx.method)
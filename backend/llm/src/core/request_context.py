@@ -0,0 +1,415 @@
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+from config import settings
+from core.metrics import CANCELLED_WORK
+
+REQUEST_ID_HEADER = "x-request-id"
+TOKEN_BUDGET_HEADER = "x-token-budget"
+MODEL_TIER_HEADER = "x-model-tier"
+# 호출자가 응답을 기다릴 남은 시간(ms)과, 마감 시간 때문에 건너뛴 단계 목록(응답 헤더)
+TIMEOUT_HEADER = "x-request-timeout-ms"
+DEGRADED_HEADER = "x-degraded"
+
+# 클라이언트가 응답 전에 연결을 끊은 요청의 상태 코드 (nginx 관례)
+CLIENT_CLOSED_STATUS = 499
+
+
+class RequestCancelled(BaseException):
+    """
+    클라이언트 연결이 끊겨 요청 처리를 중단함
+
+    asyncio.CancelledError처럼 BaseException을 상속하므로 서비스의 `except Exception`
+    fallback 처리에 잡히지 않고 RequestContextMiddleware까지 올라감
+    """
+
+
+class TokenBudgetExceeded(BaseException):
+    """
+    요청 토큰 예산을 다 써서 더 이상 LLM을 호출하지 않음
+
+    RequestCancelled와 같은 이유로 BaseException을 상속하고, 응답 전이면
+    RequestContextMiddleware가 429로 응답함
+    """
+
+    def __init__(self, tokens_used: int, token_budget: int) -> None:
+        super().__init__(
+            f"요청 토큰 예산을 초과했습니다 ({tokens_used}/{token_budget} tokens)"
+        )
+        self.tokens_used = tokens_used
+        self.token_budget = token_budget
+
+
+class RequestContext:
+    """
+    요청 하나의 실행 문맥 (요청 ID, 라우트, 트레이스 샘플링 여부 등)
+
+    contextvars로 전달되므로 threadpool에서 실행되는 동기 핸들러/서비스에서도
+    current_request()로 같은 객체를 볼 수 있음
+    """
+
+    __slots__ = (
+        "request_id",
+        "method",
+        "path",
+        "route",
+        "sampled",
+        "span_id",
+        "started",
+        "scope",
+        "token_budget",
+        "tokens_used",
+        "cost_usd",
+        "llm_calls",
+        "log_sampled",
+        "model_tier",
+        "cancelled",
+        "cancel_on_disconnect",
+        "timeout",
+        "deadline",
+        "degraded",
+    )
+
+    def __init__(
+        self,
+        request_id: str,
+        method: str = "",
+        path: str = "",
+        sampled: bool = False,
+        scope: Optional[dict] = None,
+        token_budget: int = 0,
+        model_tier: Optional[str] = None,
+        timeout: float = 0.0,
+    ) -> None:
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        # 라우팅 후 경로 템플릿(/trait-vectors/{user_id})으로 갱신 (메트릭 라벨 수 제한)
+        self.route = "unmatched"
+        self.sampled = sampled
+        self.span_id = uuid.uuid4().hex[:16]
+        self.started = time.perf_counter()
+        self.scope = scope
+        # 요청 하나가 쓸 수 있는 LLM 토큰 수 (0이면 제한 없음)와 지금까지 사용량
+        self.token_budget = token_budget
+        self.tokens_used = 0
+        self.cost_usd = 0.0
+        self.llm_calls = 0
+        # 프롬프트/응답 본문 로그 샘플링 여부 (처음 본문을 기록할 때 라우트 기준으로 정함)
+        self.log_sampled: Optional[bool] = None
+        # 요청이 고른 모델 tier (X-Model-Tier, 없으면 route별 기본 tier)
+        self.model_tier = model_tier
+        # 클라이언트 연결이 끊기면 설정됨 (동기 코드에서 확인하거나 wait로 기다림)
+        self.cancelled = threading.Event()
+        # False면 연결이 끊겨도 끝까지 처리 (Idempotency-Key 요청: 재시도가 결과를 받음)
+        self.cancel_on_disconnect = True
+        # 호출자가 준 제한 시간(초, 0이면 없음). 마감 시각(perf_counter 기준)은 라우트별
+        # 기본값과 함께 처음 필요할 때 정함 (제한이 없으면 inf)
+        self.timeout = timeout
+        self.deadline: Optional[float] = None
+        # 마감 시간 안에 끝낼 수 없어 건너뛴 단계(call_site) 목록
+        self.degraded: Optional[List[str]] = None
+
+    def resolve_route(self) -> str:
+        """
+        라우팅이 끝났으면 경로 템플릿을 반영해 반환 (핸들러 실행 중에도 사용 가능)
+        """
+        if self.route == "unmatched" and self.scope is not None:
+            route = self.scope.get("route")
+            if route is not None:
+                self.route = getattr(route, "path", self.route)
+        return self.route
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _current_request.get()
+
+
+@contextmanager
+def request_scope(ctx: RequestContext) -> Iterator[RequestContext]:
+    """
+    HTTP 요청 밖의 작업 단위(WebSocket 메시지 하나 처리 등)를 요청 문맥으로 실행
+
+    (run_in_threadpool은 contextvars를 복사하므로 스레드에서 실행되는 서비스도 같은 문맥을 봄)
+    """
+    token = _current_request.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current_request.reset(token)
+
+
+def raise_if_cancelled(kind: str, amount: int = 1) -> None:
+    """
+    클라이언트가 연결을 끊었으면 건너뛴 작업 수를 기록하고 RequestCancelled 발생
+
+    kind: llm_call | batch_item | graph_step (LLM 호출, 배치 항목, 그래프 단계 시작 전에 호출)
+    """
+    ctx = _current_request.get()
+    if ctx is not None and ctx.cancelled.is_set():
+        CANCELLED_WORK.inc(ctx.resolve_route(), kind, amount=amount)
+        raise RequestCancelled()
+
+
+def sleep_unless_cancelled(seconds: float) -> None:
+    """
+    time.sleep 대신 사용: 기다리는 중에 연결이 끊기면 바로 RequestCancelled 발생
+    """
+    ctx = _current_request.get()
+    if ctx is None:
+        time.sleep(seconds)
+    elif ctx.cancelled.wait(seconds):
+        raise_if_cancelled("llm_call")
+
+
+@lru_cache(maxsize=8)
+def _route_timeouts(spec: str) -> Dict[str, float]:
+    # "/enhanced-couple-analysis=60,/chat=20" 형식 (초)
+    timeouts = {}
+    for part in spec.split(","):
+        route, _, seconds = part.strip().rpartition("=")
+        if route:
+            timeouts[route] = float(seconds)
+    return timeouts
+
+
+def remaining_time() -> Optional[float]:
+    """
+    현재 요청의 마감까지 남은 시간(초, 이미 지났으면 음수). 마감 시간이 없으면 None
+
+    마감 시간은 X-Request-Timeout-Ms 헤더와 라우트별 기본값(REQUEST_ROUTE_TIMEOUTS,
+    없으면 REQUEST_TIMEOUT) 중 짧은 쪽이며, 요청이 미들웨어에 들어온 시점부터 잼
+    """
+    ctx = _current_request.get()
+    if ctx is None:
+        return None
+    if ctx.deadline is None:
+        default = _route_timeouts(settings.REQUEST_ROUTE_TIMEOUTS).get(
+            ctx.resolve_route(), settings.REQUEST_TIMEOUT
+        )
+        timeouts = [t for t in (ctx.timeout, default) if t > 0]
+        ctx.deadline = ctx.started + min(timeouts) if timeouts else math.inf
+    if ctx.deadline == math.inf:
+        return None
+    return ctx.deadline - time.perf_counter()
+
+
+def mark_degraded(step: str) -> None:
+    """
+    마감 시간 때문에 건너뛴 단계를 기록 (응답의 X-Degraded 헤더로 전달됨)
+    """
+    ctx = _current_request.get()
+    if ctx is None:
+        return
+    if ctx.degraded is None:
+        ctx.degraded = []
+    if step not in ctx.degraded:
+        ctx.degraded.append(step)
+
+
+def should_sample() -> bool:
+    """
+    헤드 기반 샘플링: 요청이 시작될 때 한 번 정하고 요청 안의 모든 span이 따름
+    """
+    rate = settings.TRACE_SAMPLE_RATE
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _timeout(scope) -> float:
+    """
+    X-Request-Timeout-Ms 헤더 값(초 단위로 변환, 없거나 잘못되면 0)
+    """
+    try:
+        return max(0.0, float(_header(scope, TIMEOUT_HEADER.encode()) or 0) / 1000)
+    except ValueError:
+        return 0.0
+
+
+def _token_budget(scope) -> int:
+    """
+    요청 토큰 예산: X-Token-Budget 헤더 값 (서버 기본값이 있으면 그보다 크게 잡을 수 없음)
+    """
+    default = settings.REQUEST_TOKEN_BUDGET
+    try:
+        requested = int(_header(scope, TOKEN_BUDGET_HEADER.encode()) or 0)
+    except ValueError:
+        requested = 0
+    if requested <= 0:
+        return default
+    return min(requested, default) if default > 0 else requested
+
+
+async def _send_budget_exceeded(send, exc: TokenBudgetExceeded) -> None:
+    body = json.dumps(
+        {
+            "detail": str(exc),
+            "tokens_used": exc.tokens_used,
+            "token_budget": exc.token_budget,
+        },
+        ensure_ascii=False,
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+# 요청 종료 훅: (문맥, 응답 상태 코드, 처리 시간(초), 예외 또는 None)
+RequestHook = Callable[[RequestContext, int, float, Optional[BaseException]], None]
+
+
+class RequestContextMiddleware:
+    """
+    요청마다 RequestContext를 만들고 X-Request-ID를 응답 헤더로 돌려주는 ASGI 미들웨어
+
+    요청이 시작되면 on_start 훅, 끝나면 on_finish 훅(트레이싱, 메트릭 등)을 순서대로 호출함.
+    CANCEL_ON_DISCONNECT이면 처리 중에 클라이언트 연결이 끊겼는지 감시해 ctx.cancelled를
+    설정하고 앱 task를 취소함 (스레드에서 실행 중인 동기 핸들러는 raise_if_cancelled로 멈춤)
+    """
+
+    def __init__(
+        self,
+        app,
+        on_start: Sequence[Callable[[RequestContext], None]] = (),
+        on_finish: Sequence[RequestHook] = (),
+    ) -> None:
+        self.app = app
+        self.on_start = tuple(on_start)
+        self.on_finish = tuple(on_finish)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _header(scope, REQUEST_ID_HEADER.encode()) or uuid.uuid4().hex
+        ctx = RequestContext(
+            request_id[:128],
+            method=scope.get("method", ""),
+            path=scope.get("path", ""),
+            sampled=should_sample(),
+            scope=scope,
+            token_budget=_token_budget(scope),
+            model_tier=_header(scope, MODEL_TIER_HEADER.encode()),
+            timeout=_timeout(scope),
+        )
+        token = _current_request.set(ctx)
+        for hook in self.on_start:
+            hook(ctx)
+        status = 500
+        started = False
+        error: Optional[BaseException] = None
+
+        async def send_with_request_id(message) -> None:
+            nonlocal status, started
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                started = True
+                ctx.resolve_route()
+                headers = list(message.get("headers", ()))
+                headers.append((REQUEST_ID_HEADER.encode(), ctx.request_id.encode()))
+                if ctx.degraded:
+                    degraded = ",".join(ctx.degraded)
+                    headers.append((DEGRADED_HEADER.encode(), degraded.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            if settings.CANCEL_ON_DISCONNECT:
+                await self._call_cancellable(ctx, scope, receive, send_with_request_id)
+            else:
+                await self.app(scope, receive, send_with_request_id)
+        except RequestCancelled:
+            # 응답을 받을 클라이언트가 없으므로 아무것도 보내지 않음
+            status = CLIENT_CLOSED_STATUS
+            CANCELLED_WORK.inc(ctx.resolve_route(), "request")
+        except TokenBudgetExceeded as e:
+            if started:
+                error = e
+                raise
+            await _send_budget_exceeded(send_with_request_id, e)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - ctx.started
+            ctx.resolve_route()
+            for hook in self.on_finish:
+                hook(ctx, status, duration, error)
+            _current_request.reset(token)
+
+    async def _call_cancellable(
+        self, ctx: RequestContext, scope, receive, send
+    ) -> None:
+        """
+        receive()를 별도 task가 계속 읽어 앱에 넘기면서 응답 완료 전 http.disconnect를 감지
+
+        본문 청크는 작은 bounded 큐로 넘기므로 앱이 본문을 읽는 속도를 넘어 버퍼링하지 않음
+        """
+        messages: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=4)
+        finished = False
+
+        async def pump() -> None:
+            while True:
+                message = await receive()
+                await messages.put(message)
+                if message["type"] == "http.disconnect":
+                    if not finished and ctx.cancel_on_disconnect:
+                        ctx.cancelled.set()
+                        app_task.cancel()
+                    return
+
+        async def receive_from_pump() -> dict:
+            if pump_task.done() and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        async def send_and_track(message) -> None:
+            nonlocal finished
+            if message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                finished = True
+            await send(message)
+
+        app_task = asyncio.ensure_future(
+            self.app(scope, receive_from_pump, send_and_track)
+        )
+        pump_task = asyncio.ensure_future(pump())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            # 서버 종료 등 바깥에서 취소된 경우는 그대로 전달
+            if not ctx.cancelled.is_set():
+                raise
+            raise RequestCancelled() from None
+        finally:
+            pump_task.cancel()
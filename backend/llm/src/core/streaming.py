@@ -0,0 +1,42 @@
+from typing import Iterator
+
+import anyio.from_thread
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from starlette.types import Receive, Scope, Send
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 동시에 응답을 내보내는 스트리밍 응답
+
+    기본 StreamingResponse는 응답 중 receive()로 연결 종료를 감시하는데,
+    그러면 아직 읽지 않은 요청 본문 메시지를 가로채 핸들러가 멈춤.
+    여기서는 감시를 하지 않고, 연결 종료는 본문 읽기/전송 실패로 감지함
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+def iter_request_body(request: Request) -> Iterator[bytes]:
+    """
+    요청 본문을 동기 이터레이터로 제공 (워커 스레드에서 소비해야 함)
+
+    StreamingResponse가 동기 제너레이터를 스레드풀에서 돌리므로,
+    동기 파이프라인이 청크가 필요할 때마다 이벤트 루프에서 하나씩 받아옴
+    """
+    chunks = request.stream()
+    while True:
+        try:
+            chunk = anyio.from_thread.run(chunks.__anext__)
+        except StopAsyncIteration:
+            return
+        if chunk:
+            yield chunk
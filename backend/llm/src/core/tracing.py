@@ -0,0 +1,266 @@
+"""
+샘플링 기반 비동기 트레이싱
+
+- 요청 시작 시 TRACE_SAMPLE_RATE 확률로 샘플링 여부를 정하고(헤드 기반), 요청 안의 span은
+  그 결정을 따름. 오류가 난 span은 샘플링과 관계없이 항상 기록
+- span은 프로세스 내부의 bounded 큐에 넣기만 하고, 백그라운드 스레드가 묶어서 TRACE_EXPORT_URL로
+  전송. 큐가 가득 차면 버림 (요청 경로는 트레이싱 백엔드 상태와 무관하게 절대 막히지 않음)
+- TRACE_EXPORT_URL이 없으면 span을 만들지 않음 (LangSmith 콜백도 LANGCHAIN_API_KEY가 있고
+  샘플링된 요청에만 붙임)
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from config import settings
+from core.request_context import RequestContext, current_request, should_sample
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """
+    기록 중인 span (with tracer.span(...) as span: span.set(...))
+    """
+
+    __slots__ = ("name", "attributes", "error")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: str) -> None:
+        self.error = error
+
+
+class _NoopSpan(Span):
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        pass
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, error: str) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class TraceExporter:
+    """
+    bounded 큐 + 배치 전송 스레드
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 2.0,
+        timeout: float = 2.0,
+    ) -> None:
+        self.endpoint = endpoint
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timeout = timeout
+        self.dropped = 0  # 큐가 가득 차 버린 span 수
+        self.failed = 0  # 전송 실패로 버린 span 수
+        self.exported = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        span 하나를 큐에 넣음 (가득 차 있으면 기다리지 않고 버림)
+        """
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """
+        큐에 남은 span을 전송될 때까지 기다림 (테스트/종료용)
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _ensure_thread(self) -> None:
+        # fork된 워커에서는 부모의 스레드가 없으므로 프로세스마다 새로 시작
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(self.queue_size)
+            self._thread = threading.Thread(
+                target=self._run, name="trace-exporter", daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._send(batch)
+                self.exported += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.debug(f"트레이스 전송 실패 ({len(batch)}개 버림): {e}")
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    def _send(self, batch: List[Dict[str, Any]]) -> None:
+        response = requests.post(
+            self.endpoint, json={"spans": batch}, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+
+class Tracer:
+    def __init__(self, exporter: Optional[TraceExporter]) -> None:
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        span 기록. 샘플링되지 않은 요청이면 오류가 난 경우에만 내보냄
+        """
+        if self.exporter is None:
+            yield _NOOP_SPAN
+            return
+        ctx = current_request()
+        span = Span(name, attributes)
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            sampled = ctx.sampled if ctx is not None else should_sample()
+            if sampled or span.error:
+                self.exporter.submit(
+                    _record(ctx, span, started_at, time.perf_counter() - started, False)
+                )
+
+    def record_request(
+        self,
+        ctx: RequestContext,
+        status: int,
+        duration: float,
+        error: Optional[BaseException],
+    ) -> None:
+        """
+        RequestContextMiddleware 종료 훅: 요청 전체(root span) 기록
+        """
+        if self.exporter is None:
+            return
+        failed = error is not None or status >= 500
+        if not (ctx.sampled or failed):
+            return
+        span = Span(
+            "http.request",
+            {"http.method": ctx.method, "http.route": ctx.route, "http.status": status},
+        )
+        if failed:
+            span.error = f"{type(error).__name__}: {error}" if error else str(status)
+        started_at = time.time() - duration
+        self.exporter.submit(_record(ctx, span, started_at, duration, True))
+
+
+def _record(
+    ctx: Optional[RequestContext],
+    span: Span,
+    started_at: float,
+    duration: float,
+    root: bool,
+) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
+        "trace_id": ctx.request_id if ctx is not None else uuid.uuid4().hex,
+        "span_id": ctx.span_id if (root and ctx) else uuid.uuid4().hex[:16],
+        "parent_id": None if (root or ctx is None) else ctx.span_id,
+        "name": span.name,
+        "start_time": started_at,
+        "duration_ms": round(duration * 1000, 3),
+        "attributes": span.attributes,
+    }
+    if span.error:
+        record["error"] = span.error
+    return record
+
+
+_langsmith_tracer: Any = None
+
+
+def langchain_callbacks() -> List[Any]:
+    """
+    LangChain 호출에 붙일 콜백 (LangSmith 키가 있고 샘플링된 요청일 때만 트레이서 포함)
+    """
+    global _langsmith_tracer
+    if not settings.LANGCHAIN_API_KEY:
+        return []
+    ctx = current_request()
+    if not (ctx.sampled if ctx is not None else should_sample()):
+        return []
+    if _langsmith_tracer is None:
+        from langchain.callbacks.tracers.langchain import LangChainTracer
+
+        _langsmith_tracer = LangChainTracer(project_name=settings.LANGCHAIN_PROJECT)
+    return [_langsmith_tracer]
+
+
+def _build_tracer() -> Tracer:
+    if not settings.TRACE_EXPORT_URL:
+        return Tracer(None)
+    return Tracer(
+        TraceExporter(
+            settings.TRACE_EXPORT_URL,
+            queue_size=settings.TRACE_QUEUE_SIZE,
+            batch_size=settings.TRACE_BATCH_SIZE,
+            flush_interval=settings.TRACE_FLUSH_INTERVAL,
+        )
+    )
+
+
+# 싱글턴 인스턴스
+tracer = _build_tracer()
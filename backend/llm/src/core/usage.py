@@ -0,0 +1,258 @@
+"""
+LLM 토큰 사용량/비용 집계
+
+provider가 호출마다 record()로 사용량을 보고하면, 현재 요청(RequestContext)의 라우트와
+요청 ID에 귀속시켜 프로세스 내부에서 집계함. 요청별 토큰 예산을 넘으면 다음 LLM 호출
+전에 TokenBudgetExceeded를 발생시켜 더 이상 토큰을 쓰지 않게 함
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from config import settings
+from core.metrics import LLM_BUDGET_EXCEEDED, LLM_COST, LLM_TOKENS
+from core.request_context import RequestContext, TokenBudgetExceeded, current_request
+
+# 100만 토큰당 (입력, 출력) 가격(USD). 목록에 없는 모델은 비용 0으로 집계
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "claude-3-opus-20240229": (15.0, 75.0),
+    "claude-3-5-sonnet-20241022": (3.0, 15.0),
+    "claude-3-haiku-20240307": (0.25, 1.25),
+}
+# 프롬프트 캐시 토큰의 입력 가격 대비 배수 (캐시에서 읽기, 캐시에 쓰기)
+CACHE_READ_PRICE_RATIO = 0.1
+CACHE_WRITE_PRICE_RATIO = 1.25
+
+
+@dataclass
+class UsageRecord:
+    provider: str
+    model: str
+    input_tokens: int
+    output_tokens: int
+    latency_ms: float
+    cost_usd: float
+    route: str
+    request_id: Optional[str]
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_read_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> float:
+    """
+    예상 비용(USD). input_tokens는 캐시를 거치지 않은 입력 토큰 수
+    """
+    input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    cached = (
+        cache_read_tokens * CACHE_READ_PRICE_RATIO
+        + cache_write_tokens * CACHE_WRITE_PRICE_RATIO
+    )
+    return (
+        (input_tokens + cached) * input_price + output_tokens * output_price
+    ) / 1_000_000
+
+
+class _Totals:
+    __slots__ = (
+        "calls",
+        "input_tokens",
+        "output_tokens",
+        "cache_read_tokens",
+        "cache_write_tokens",
+        "cost_usd",
+        "latency_ms",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.cost_usd = 0.0
+        self.latency_ms = 0.0
+
+    def add(self, record: UsageRecord) -> None:
+        self.calls += 1
+        self.input_tokens += record.input_tokens
+        self.output_tokens += record.output_tokens
+        self.cache_read_tokens += record.cache_read_tokens
+        self.cache_write_tokens += record.cache_write_tokens
+        self.cost_usd += record.cost_usd
+        self.latency_ms += record.latency_ms
+
+    def merge(self, other: "_Totals") -> None:
+        self.calls += other.calls
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cache_write_tokens += other.cache_write_tokens
+        self.cost_usd += other.cost_usd
+        self.latency_ms += other.latency_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "total_tokens": self.input_tokens + self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "avg_latency_ms": (
+                round(self.latency_ms / self.calls, 1) if self.calls else 0.0
+            ),
+        }
+
+
+class UsageMeter:
+    """
+    라우트/모델별 누적 사용량과 최근 요청별 사용량 (프로세스 단위)
+    """
+
+    def __init__(self, recent_size: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._by_route_model: Dict[Tuple[str, str], _Totals] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=recent_size)
+
+    def check_budget(self) -> None:
+        """
+        LLM 호출 전에 호출. 현재 요청이 토큰 예산을 다 썼으면 TokenBudgetExceeded
+        """
+        ctx = current_request()
+        if ctx is None or ctx.token_budget <= 0:
+            return
+        if ctx.tokens_used >= ctx.token_budget:
+            LLM_BUDGET_EXCEEDED.inc(ctx.resolve_route())
+            raise TokenBudgetExceeded(ctx.tokens_used, ctx.token_budget)
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency: float,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> UsageRecord:
+        """
+        provider 호출 한 번의 사용량 기록 (latency는 초 단위)
+
+        input_tokens는 프롬프트 캐시를 거치지 않은 입력 토큰 수이며, 캐시에서 읽거나 캐시에 쓴
+        입력 토큰은 cache_read_tokens/cache_write_tokens로 따로 받아 할인/할증된 가격으로 집계함
+        """
+        ctx = current_request()
+        route = ctx.resolve_route() if ctx is not None else "background"
+        record = UsageRecord(
+            provider=provider,
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_ms=round(latency * 1000, 1),
+            cost_usd=estimate_cost(
+                model,
+                input_tokens,
+                output_tokens,
+                cache_read_tokens,
+                cache_write_tokens,
+            ),
+            route=route,
+            request_id=ctx.request_id if ctx is not None else None,
+            cache_read_tokens=cache_read_tokens,
+            cache_write_tokens=cache_write_tokens,
+        )
+        if ctx is not None:
+            ctx.tokens_used += (
+                input_tokens + output_tokens + cache_read_tokens + cache_write_tokens
+            )
+            ctx.cost_usd += record.cost_usd
+            ctx.llm_calls += 1
+        LLM_TOKENS.inc(route, model, "input", amount=input_tokens)
+        LLM_TOKENS.inc(route, model, "output", amount=output_tokens)
+        if cache_read_tokens or cache_write_tokens:
+            LLM_TOKENS.inc(route, model, "cache_read", amount=cache_read_tokens)
+            LLM_TOKENS.inc(route, model, "cache_write", amount=cache_write_tokens)
+        LLM_COST.inc(route, model, amount=record.cost_usd)
+        with self._lock:
+            totals = self._by_route_model.get((route, model))
+            if totals is None:
+                totals = self._by_route_model[(route, model)] = _Totals()
+            totals.add(record)
+        return record
+
+    def finish_request(
+        self,
+        ctx: RequestContext,
+        status: int,
+        duration: float,
+        error: Optional[BaseException],
+    ) -> None:
+        """
+        RequestContextMiddleware 종료 훅: LLM을 호출한 요청의 사용량을 최근 목록에 보관
+        """
+        if ctx.llm_calls == 0:
+            return
+        self._recent.append(
+            {
+                "request_id": ctx.request_id,
+                "method": ctx.method,
+                "route": ctx.route,
+                "status": status,
+                "llm_calls": ctx.llm_calls,
+                "total_tokens": ctx.tokens_used,
+                "cost_usd": round(ctx.cost_usd, 6),
+                "token_budget": ctx.token_budget or None,
+                "duration_ms": round(duration * 1000, 1),
+            }
+        )
+
+    def find_request(self, request_id: str) -> Optional[Dict[str, Any]]:
+        for entry in reversed(self._recent):
+            if entry["request_id"] == request_id:
+                return entry
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        전체 합계, 라우트×모델별, 모델별 누적 사용량
+        """
+        total = _Totals()
+        by_model: Dict[str, _Totals] = {}
+        with self._lock:
+            rows = sorted(self._by_route_model.items())
+            for (_, model), totals in rows:
+                total.merge(totals)
+                by_model.setdefault(model, _Totals()).merge(totals)
+            by_route = [
+                {"route": route, "model": model, **totals.to_dict()}
+                for (route, model), totals in rows
+            ]
+        return {
+            "total": total.to_dict(),
+            "by_route": by_route,
+            "by_model": [
+                {"model": model, **totals.to_dict()}
+                for model, totals in sorted(by_model.items())
+            ],
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_route_model.clear()
+            self._recent.clear()
+
+
+# 싱글턴 인스턴스
+usage_meter = UsageMeter(settings.USAGE_RECENT_REQUESTS)
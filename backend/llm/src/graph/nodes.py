@@ -1,22 +1,21 @@
-import os
-
-from dotenv import load_dotenv
-from langchain.callbacks.tracers.langchain import LangChainTracer
 from langchain.schema import HumanMessage
-from langchain_openai import ChatOpenAI
 
+from core.request_context import raise_if_cancelled
 from mcp.context import MCPContext
+from providers.openai_client import invoke_openai
+from services.llm_provider import skip_for_deadline
+from services.model_router import model_router
 
-load_dotenv()
-
-# LangSmith 트레이서 활성화
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_API_KEY"] = os.getenv("LANGCHAIN_API_KEY", "")
-os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT", "default")
 
-tracer = LangChainTracer()  # 트레이서 인스턴스 생성
-
-llm = ChatOpenAI(model="gpt-3.5-turbo", callbacks=[tracer])  # 콜백에 트레이서 추가
+def _invoke(prompt: str, step: str) -> str:
+    # 클라이언트가 끊었으면 이 단계부터 그래프 실행을 멈춤
+    raise_if_cancelled("graph_step")
+    # 그래프는 LangChain 메시지(AIMessage)를 그대로 쓰므로 provider는 OpenAI로 고정
+    target = model_router.resolve("analysis_graph", "openai")
+    # 요청 마감 시간 안에 끝낼 수 없는 단계는 실행하지 않음 (X-Degraded로 표시)
+    if skip_for_deadline(target, step) is not None:
+        return ""
+    return invoke_openai([HumanMessage(content=prompt)], target).content
 
 
 def trait_analysis(ctx: MCPContext) -> MCPContext:
@@ -30,14 +29,16 @@ def trait_analysis(ctx: MCPContext) -> MCPContext:
         f"성별: {ctx.user_gender}\n"
         f"아래 사람의 성향을 분석해줘:\n\n{ctx.user_prompt}"
     )
-    result = llm.invoke([HumanMessage(content=prompt)])
-    ctx.metadata["user_traits"] = result.content
+    result = _invoke(prompt, "trait_analysis")
+    ctx.metadata["user_traits"] = result
     return ctx
 
 
 def match_analysis(ctx: MCPContext) -> MCPContext:
     partner_mbti = ctx.metadata.get("partner_mbti", "알 수 없음")
-    relationship_duration = ctx.metadata.get("relationship_duration_months", "알 수 없음")
+    relationship_duration = ctx.metadata.get(
+        "relationship_duration_months", "알 수 없음"
+    )
     prompt = (
         f"사용자 성향: {ctx.metadata['user_traits']}\n"
         f"상대방 성향: {ctx.partner_prompt}\n"
@@ -45,8 +46,8 @@ def match_analysis(ctx: MCPContext) -> MCPContext:
         f"관계 기간(개월): {relationship_duration}\n"
         f"두 사람의 궁합을 분석해줘."
     )
-    result = llm.invoke([HumanMessage(content=prompt)])
-    ctx.metadata["match_result"] = result.content
+    result = _invoke(prompt, "match_analysis")
+    ctx.metadata["match_result"] = result
     return ctx
 
 
@@ -57,6 +58,6 @@ def generate_advice(ctx: MCPContext) -> MCPContext:
         f"아래 궁합 분석 결과를 바탕으로 관계 개선을 위한 조언을 해줘:\n\n"
         f"{ctx.metadata['match_result']}"
     )
-    result = llm.invoke([HumanMessage(content=prompt)])
-    ctx.metadata["advice"] = result.content
+    result = _invoke(prompt, "generate_advice")
+    ctx.metadata["advice"] = result
     return ctx
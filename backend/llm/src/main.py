@@ -1,4 +1,7 @@
-from typing import Any, Dict
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -7,23 +10,64 @@ from fastapi.middleware.cors import CORSMiddleware
 from api.batch_analysis import router as batch_analysis_router
 from api.chat import router as chat_router
 from api.chat_relationship_coach import router as chat_relationship_coach_router
+from api.chat_session import router as chat_session_router
+from api.compatibility import router as compatibility_router
 from api.couple_analysis import router as couple_analysis_router
 from api.enhanced_couple_analysis import router as enhanced_couple_analysis_router
 from api.feedback import router as feedback_router
 from api.health import router as health_router
 from api.labeling import router as labeling_router
 from api.labeling_trait_vector import router as labeling_trait_vector_router
+from api.metrics import router as metrics_router
+from api.model_routes import router as model_routes_router
 from api.personality import router as personality_router
 from api.prompt import router as prompt_router
+from api.usage import router as usage_router
+from config import settings
+from core.admission import AdmissionMiddleware
+from core.idempotency import IdempotencyMiddleware
+from core.log import configure_logging
+from core.metrics import record_request, record_request_start
+from core.request_context import RequestContextMiddleware
+from core.tracing import tracer
+from core.usage import usage_meter
 
 load_dotenv()
+configure_logging()
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up_providers() -> None:
+    from providers.openai_client import warm_up
+    from services.model_router import model_router
+
+    try:
+        warm_up(model_router.resolve("default", "openai"))
+    except Exception as e:
+        logger.warning(f"LLM provider 워밍업 실패 (첫 요청 때 다시 시도): {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # 포트 바인딩과 요청 수락을 막지 않도록 provider 초기화는 백그라운드에서 진행
+    if settings.LLM_WARMUP:
+        threading.Thread(
+            target=_warm_up_providers, name="llm-warmup", daemon=True
+        ).start()
+    yield
+
 
 app = FastAPI(
     title="SAIONDO LLM Backend",
     description="커플 분석, AI 챗, 피드백 등 다양한 LLM 기반 기능 제공",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# 우선순위 클래스별 수락 제어 (혼잡하면 503 + Retry-After, 요청 문맥 안에서 실행)
+# CORS보다 안쪽에 두어야 거절 응답에도 CORS 헤더가 붙음
+app.add_middleware(AdmissionMiddleware)
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -32,17 +76,31 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 분석 API의 Idempotency-Key 재시도는 저장된 응답으로 바로 응답 (수락 제어보다 먼저 확인)
+app.add_middleware(IdempotencyMiddleware)
+# 요청 ID/샘플링 문맥 (요청 시작/종료 시 메트릭, 트레이싱 훅 호출)
+app.add_middleware(
+    RequestContextMiddleware,
+    on_start=[record_request_start],
+    on_finish=[record_request, usage_meter.finish_request, tracer.record_request],
+)
+
 
 # 라우터 등록
 app.include_router(health_router)
+app.include_router(metrics_router)
+app.include_router(usage_router)
+app.include_router(model_routes_router)
 app.include_router(prompt_router)
 app.include_router(chat_router)
 app.include_router(chat_relationship_coach_router)
+app.include_router(chat_session_router)
 app.include_router(couple_analysis_router)
 app.include_router(enhanced_couple_analysis_router, prefix="/api/v1")
 app.include_router(batch_analysis_router, prefix="/api/v1")
 app.include_router(labeling_router)
 app.include_router(labeling_trait_vector_router)
+app.include_router(compatibility_router)
 app.include_router(feedback_router)
 app.include_router(personality_router)
 
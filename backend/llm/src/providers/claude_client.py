@@ -1,31 +1,120 @@
 import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 import requests
 from dotenv import load_dotenv
 
+from core.request_context import raise_if_cancelled, remaining_time
+from core.usage import usage_meter
+
+if TYPE_CHECKING:
+    from services.model_router import ModelTarget
+
 load_dotenv()
 
 CLAUDE_API_URL = os.getenv("CLAUDE_API_BASE", "https://api.anthropic.com/v1")
 CLAUDE_API_KEY = os.getenv("CLAUDE_API_KEY")
 
 
-def ask_claude(prompt: str) -> str:
+# 대화 첫 메시지가 assistant일 때(오래된 대화를 지운 세션 등) 앞에 넣는 user 메시지
+CONTINUATION_PROMPT = "(이전 대화에서 이어집니다)"
+
+
+def _content(message: Any) -> str:
+    # pydantic 메시지(LLMMessage)와 dict 모두 지원
+    return message.content if hasattr(message, "content") else message["content"]
+
+
+def _role(message: Any) -> str:
+    return message.role if hasattr(message, "role") else message["role"]
+
+
+def claude_messages(
+    messages: List[Any],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, str]]]:
+    """
+    system/user/assistant 메시지 목록을 Messages API의 (system 블록, messages)로 변환
+
+    - system 메시지는 모두 최상위 system 블록으로 옮김 (순서 유지). 첫 system 메시지(코치 프롬프트 등
+      매 턴 같은 내용)에는 cache_control을 붙여 provider의 프롬프트 캐시가 턴마다 재사용하게 함.
+      그 뒤의 system 메시지(대화 요약 등 바뀌는 내용)는 캐시 구간 뒤에 둠
+    - 연속된 같은 역할의 메시지는 하나로 합치고, 첫 메시지는 항상 user가 되게 함
+    """
+    system: List[Dict[str, Any]] = []
+    turns: List[Dict[str, str]] = []
+    for message in messages:
+        role, content = _role(message), _content(message)
+        if role == "system":
+            block: Dict[str, Any] = {"type": "text", "text": content}
+            if not system:
+                block["cache_control"] = {"type": "ephemeral"}
+            system.append(block)
+        elif role in ("user", "assistant"):
+            if turns and turns[-1]["role"] == role:
+                turns[-1]["content"] += "\n\n" + content
+            else:
+                turns.append({"role": role, "content": content})
+    if not turns or turns[0]["role"] != "user":
+        turns.insert(0, {"role": "user", "content": CONTINUATION_PROMPT})
+    return system, turns
+
+
+def _post_messages(payload: Dict[str, Any], target: "ModelTarget") -> str:
+    """
+    Messages API 호출 후 응답 텍스트 반환, 토큰 사용량(프롬프트 캐시 포함)을 현재 요청에 기록
+    """
     headers = {
         "x-api-key": CLAUDE_API_KEY,
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
 
-    payload = {
-        "model": "claude-3-opus-20240229",  # 최신 Claude 모델
-        "max_tokens": 1024,
-        "temperature": 0.7,
-        "messages": [{"role": "user", "content": prompt}],
-    }
-
+    usage_meter.check_budget()
+    raise_if_cancelled("llm_call")
+    # 요청 마감 시간이 있으면 남은 시간만큼만 기다림
+    remaining = remaining_time()
+    timeout = max(remaining, 0.001) if remaining is not None else None
     try:
-        res = requests.post(f"{CLAUDE_API_URL}/messages", headers=headers, json=payload)
+        started = time.perf_counter()
+        res = requests.post(
+            f"{CLAUDE_API_URL}/messages", headers=headers, json=payload, timeout=timeout
+        )
         res.raise_for_status()
-        return res.json()["content"][0]["text"]
+        data = res.json()
+        usage = data.get("usage") or {}
+        usage_meter.record(
+            "claude",
+            data.get("model", target.model),
+            usage.get("input_tokens", 0),
+            usage.get("output_tokens", 0),
+            time.perf_counter() - started,
+            cache_read_tokens=usage.get("cache_read_input_tokens") or 0,
+            cache_write_tokens=usage.get("cache_creation_input_tokens") or 0,
+        )
+        return data["content"][0]["text"]
     except Exception as e:
         return f"❌ Claude 오류: {e}"
+
+
+def ask_claude(prompt: str, target: "ModelTarget") -> str:
+    payload = {
+        "model": target.model,
+        "max_tokens": target.max_tokens,
+        "temperature": target.temperature,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    return _post_messages(payload, target)
+
+
+def ask_claude_history(messages: List[Any], target: "ModelTarget") -> str:
+    system, turns = claude_messages(messages)
+    payload: Dict[str, Any] = {
+        "model": target.model,
+        "max_tokens": target.max_tokens,
+        "temperature": target.temperature,
+        "messages": turns,
+    }
+    if system:
+        payload["system"] = system
+    return _post_messages(payload, target)
@@ -0,0 +1,221 @@
+"""
+네트워크 없이 동작하는 결정적(deterministic) 가짜 LLM (부하 테스트/로컬 벤치마크용)
+
+같은 프롬프트에는 항상 같은 응답을 돌려주며, 프롬프트 종류별로 서비스가 파싱하는 형식을 지킴:
+- 메시지 라벨링: 룰 기반 라벨러로 라벨링한 [{"sender", "text", "labels"}, ...]
+- 라벨링 + 요약: {"messages": [...], "summary": {...}}
+- 응답 JSON 예시가 들어 있는 프롬프트(커플 분석, 성향 분석 등): 마지막 예시 JSON의 구조를 그대로
+  쓰고 점수와 선택지("A/B/C") 값만 프롬프트 해시로 정함
+- 그 외: 짧은 문장
+
+지연/오류율/스트리밍 간격은 FAKE_LLM_* 설정으로 조절 (benchmarks/llm_stub.py도 같은 응답 사용)
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from config import settings
+from core.request_context import (
+    raise_if_cancelled,
+    remaining_time,
+    sleep_unless_cancelled,
+)
+from core.usage import usage_meter
+
+FAKE_MODEL = "fake-llm"
+
+_MESSAGE_LINE = re.compile(r"^\d+\. \((?P<sender>[^)]*)\) (?P<text>.*)$")
+# 프롬프트 예시 안의 ( "a" "b" ) 형태의 문자열 이어붙이기
+_PAREN_CONCAT = re.compile(r'\(\s*((?:"(?:[^"\\]|\\.)*"\s*)+)\)')
+
+_error_rng = random.Random(settings.FAKE_LLM_SEED)
+_error_rng_lock = threading.Lock()
+
+
+def _rng(prompt: str) -> random.Random:
+    digest = hashlib.blake2b(prompt.encode(), digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, "big") ^ settings.FAKE_LLM_SEED)
+
+
+def count_tokens(text: str) -> int:
+    """
+    토큰 수 근사치 (UTF-8 4바이트당 1토큰)
+    """
+    return max(1, len(text.encode()) // 4)
+
+
+def _json_blocks(text: str) -> List[str]:
+    """
+    문자열 안의 최상위 {...} 블록들 (문자열 리터럴 안의 괄호는 무시)
+    """
+    blocks: List[str] = []
+    depth = 0
+    start = 0
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                blocks.append(text[start : i + 1])
+    return blocks
+
+
+def _join_concat(match: "re.Match[str]") -> str:
+    parts = re.findall(r'"((?:[^"\\]|\\.)*)"', match.group(1))
+    return json.dumps("".join(parts), ensure_ascii=False)
+
+
+def _fill(template: Any, rng: random.Random) -> Any:
+    # 점수 필드만 바꾸고 나머지 구조/예시 문자열은 그대로 사용
+    if isinstance(template, dict):
+        return {key: _fill(value, rng) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_fill(value, rng) for value in template]
+    if isinstance(template, bool):
+        return template
+    if isinstance(template, int):
+        return rng.randint(50, 95) if 0 <= template <= 100 else template
+    if isinstance(template, float):
+        return round(rng.uniform(0.4, 0.95), 2) if 0 <= template <= 1 else template
+    if isinstance(template, str) and "/" in template and " " not in template:
+        return rng.choice(template.split("/"))
+    return template
+
+
+def _template_response(prompt: str, rng: random.Random) -> Optional[str]:
+    for block in reversed(_json_blocks(prompt)):
+        try:
+            template = json.loads(_PAREN_CONCAT.sub(_join_concat, block))
+        except json.JSONDecodeError:
+            continue
+        if isinstance(template, dict):
+            return json.dumps(_fill(template, rng), ensure_ascii=False)
+    return None
+
+
+def _labeled_messages(prompt: str) -> List[dict]:
+    from core.labeling.rule_engine import label_message
+
+    messages: List[dict] = []
+    in_messages = False
+    for line in prompt.splitlines():
+        if line.startswith("메시지 목록"):
+            in_messages = True
+            continue
+        match = _MESSAGE_LINE.match(line) if in_messages else None
+        if match is None:
+            continue
+        text = match.group("text")
+        messages.append(
+            {
+                "sender": match.group("sender"),
+                "text": text,
+                "labels": label_message(text),
+            }
+        )
+    return messages
+
+
+def fake_completion(prompt: str) -> str:
+    """
+    프롬프트 종류에 맞는 결정적 응답 텍스트
+    """
+    rng = _rng(prompt)
+    if "채팅 메시지 라벨링 및 요약" in prompt:
+        messages = _labeled_messages(prompt)
+        labels = sorted(
+            {
+                label
+                for message in messages
+                for values in message["labels"].values()
+                for label in values
+            }
+        )
+        summary = {
+            "text": f"메시지 {len(messages)}개 중 주요 감정/태도를 요약했습니다.",
+            "dominant_labels": labels[:3],
+        }
+        return json.dumps(
+            {"messages": messages, "summary": summary}, ensure_ascii=False
+        )
+    if "채팅 메시지 라벨링" in prompt:
+        return json.dumps(_labeled_messages(prompt), ensure_ascii=False)
+    templated = _template_response(prompt, rng)
+    if templated is not None:
+        return templated
+    return rng.choice(
+        [
+            "서로의 이야기를 끝까지 들어주는 시간을 가져보세요.",
+            "작은 감사 표현을 자주 나누면 관계가 더 단단해져요.",
+            "감정이 격해질 때는 잠시 쉬었다가 다시 대화해 보세요.",
+        ]
+    )
+
+
+def chunk_text(text: str, chunk_chars: int = 0) -> List[str]:
+    """
+    스트리밍 응답 조각 (FAKE_LLM_STREAM_CHUNK_CHARS 글자씩)
+    """
+    chunk_chars = chunk_chars or settings.FAKE_LLM_STREAM_CHUNK_CHARS
+    return [text[i : i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+
+
+def simulated_latency(prompt: str) -> float:
+    """
+    설정된 기본 지연 + 프롬프트별 결정적 지터(초)
+    """
+    base = settings.FAKE_LLM_LATENCY_MS
+    jitter = settings.FAKE_LLM_LATENCY_JITTER_MS
+    return max(0.0, base + _rng(prompt).uniform(-jitter, jitter)) / 1000
+
+
+def should_fail() -> bool:
+    rate = settings.FAKE_LLM_ERROR_RATE
+    if rate <= 0:
+        return False
+    with _error_rng_lock:
+        return _error_rng.random() < rate
+
+
+def ask_fake(prompt: str, model: str = FAKE_MODEL) -> str:
+    usage_meter.check_budget()
+    raise_if_cancelled("llm_call")
+    started = time.perf_counter()
+    delay = simulated_latency(prompt)
+    remaining = remaining_time()
+    if remaining is not None and delay > remaining:
+        # 실제 provider처럼 요청 마감 시간(timeout)까지만 기다리고 실패
+        sleep_unless_cancelled(max(remaining, 0.0))
+        return "❌ Fake 오류: 요청 시간 초과"
+    if delay:
+        sleep_unless_cancelled(delay)
+    if should_fail():
+        return "❌ Fake 오류: 시뮬레이션된 provider 오류"
+    text = fake_completion(prompt)
+    usage_meter.record(
+        "fake",
+        model,
+        count_tokens(prompt),
+        count_tokens(text),
+        time.perf_counter() - started,
+    )
+    return text
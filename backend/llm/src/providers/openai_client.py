@@ -1,60 +1,136 @@
+import logging
 import os
-from typing import Any, List, Union
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
 from dotenv import load_dotenv
-from langchain.callbacks.tracers.langchain import LangChainTracer
-from langchain.schema import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+
+from config import settings
+from core.request_context import raise_if_cancelled, remaining_time
+from core.tracing import langchain_callbacks
+from core.usage import usage_meter
+
+if TYPE_CHECKING:
+    from services.model_router import ModelTarget
 
 load_dotenv()
 
-openai_key = os.getenv("OPENAI_API_KEY")
-if not openai_key:
-    raise ValueError("OPENAI_API_KEY가 .env에 설정되어 있지 않아요, Oppa!")
+logger = logging.getLogger(__name__)
+
+# ChatOpenAI/LangSmith 트레이서는 처음 사용할 때 생성 (import 시점에는 만들지 않음)
+# (모델, temperature, max_tokens) 조합마다 하나씩 만들어 재사용 (HTTP 연결 풀 공유)
+_openai_llms: Dict[Tuple[str, float, int], Any] = {}
+_openai_llm_lock = threading.Lock()
+
+
+def get_openai_llm(target: "ModelTarget") -> Any:
+    """
+    라우팅된 모델/생성 파라미터의 ChatOpenAI 클라이언트 (처음 호출할 때 생성)
+    """
+    key = (target.model, target.temperature, target.max_tokens)
+    llm = _openai_llms.get(key)
+    if llm is None:
+        with _openai_llm_lock:
+            llm = _openai_llms.get(key)
+            if llm is None:
+                llm = _openai_llms[key] = _create_openai_llm(*key)
+    return llm
+
+
+def _create_openai_llm(model: str, temperature: float, max_tokens: int) -> Any:
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if not openai_key:
+        raise ValueError("OPENAI_API_KEY가 .env에 설정되어 있지 않아요, Oppa!")
 
-# LangSmith 트레이서 활성화
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_API_KEY"] = os.getenv("LANGCHAIN_API_KEY", "")
-os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGCHAIN_PROJECT", "saiondo-llm")
+    from langchain_openai import ChatOpenAI
 
-tracer = LangChainTracer()
+    logger.info(f"OpenAI 클라이언트 초기화: {model}")
+    # LangSmith 트레이서는 호출마다 샘플링 여부에 따라 붙임 (langchain_callbacks)
+    return ChatOpenAI(
+        temperature=temperature,
+        model=model,
+        max_tokens=max_tokens,
+        api_key=openai_key,
+        base_url=settings.OPENAI_API_BASE or None,
+    )
 
-openai_llm = ChatOpenAI(
-    temperature=0.7,
-    model="gpt-3.5-turbo",
-    api_key=openai_key,
-    callbacks=[tracer],
-)
 
+def invoke_openai(messages: List[Any], target: "ModelTarget") -> Any:
+    """
+    LangChain 메시지로 OpenAI를 호출하고 토큰 사용량을 현재 요청에 기록 (AIMessage 반환)
 
-def ask_openai(prompt: str) -> str:
+    요청 토큰 예산을 이미 다 썼으면 호출하지 않고 TokenBudgetExceeded를 발생시킴.
+    요청에 마감 시간이 있으면 남은 시간을 이 호출의 timeout으로 사용
+    """
+    usage_meter.check_budget()
+    raise_if_cancelled("llm_call")
+    openai_llm = get_openai_llm(target)
+    options: Dict[str, Any] = {}
+    remaining = remaining_time()
+    if remaining is not None:
+        options["timeout"] = max(remaining, 0.001)
+    started = time.perf_counter()
+    response = openai_llm.invoke(
+        messages, config={"callbacks": langchain_callbacks()}, **options
+    )
+    usage = getattr(response, "usage_metadata", None) or {}
+    usage_meter.record(
+        "openai",
+        (response.response_metadata or {}).get("model_name", target.model),
+        usage.get("input_tokens", 0),
+        usage.get("output_tokens", 0),
+        time.perf_counter() - started,
+    )
+    return response
+
+
+def ask_openai(prompt: str, target: "ModelTarget") -> str:
+    from langchain.schema import HumanMessage
+
+    get_openai_llm(target)  # API 키가 없으면 오류 문자열이 아니라 예외로 알림
     try:
         # __call__ 대신 invoke 사용 (deprecation warning 해결)
-        response = openai_llm.invoke([HumanMessage(content=prompt)])
-        return response.content
+        return invoke_openai([HumanMessage(content=prompt)], target).content
     except Exception as e:
         return f"❌ OpenAI 오류: {e}"
 
 
-def ask_openai_history(messages: List[Any]) -> str:
-    lc_messages: List[Union[HumanMessage, AIMessage, SystemMessage]] = []
+@lru_cache(maxsize=1024)
+def _lc_message(role: str, content: str) -> Any:
+    """
+    (역할, 내용)의 LangChain 메시지 (대화가 이어질 때 앞 메시지 객체를 다시 만들지 않도록 재사용)
+    """
+    from langchain.schema import AIMessage, HumanMessage, SystemMessage
+
+    if role == "user":
+        return HumanMessage(content=content)
+    if role == "assistant":
+        return AIMessage(content=content)
+    if role == "system":
+        return SystemMessage(content=content)
+    return None
+
+
+def ask_openai_history(messages: List[Any], target: "ModelTarget") -> str:
+    lc_messages: List[Any] = []
     for m in messages:
         role = m.role if hasattr(m, "role") else m["role"]
         content = m.content if hasattr(m, "content") else m["content"]
-        if role == "user":
-            lc_messages.append(HumanMessage(content=content))
-        elif role == "assistant":
-            lc_messages.append(AIMessage(content=content))
-        elif role == "system":
-            lc_messages.append(SystemMessage(content=content))
+        message = _lc_message(role, content)
+        if message is not None:
+            lc_messages.append(message)
+    get_openai_llm(target)
     try:
-        # __call__ 대신 invoke 사용
-        response = openai_llm.invoke(lc_messages)
-        return response.content
+        return invoke_openai(lc_messages, target).content
     except Exception as e:
         return f"❌ OpenAI 오류: {e}"
 
 
-print("LANGCHAIN_TRACING_V2:", os.environ.get("LANGCHAIN_TRACING_V2"))
-print("LANGCHAIN_API_KEY:", os.environ.get("LANGCHAIN_API_KEY"))
-print("LANGCHAIN_PROJECT:", os.environ.get("LANGCHAIN_PROJECT"))
+def warm_up(target: "ModelTarget") -> None:
+    """
+    무거운 LangChain 모듈 로드와 클라이언트 생성을 미리 수행 (서버 시작 후 백그라운드)
+    """
+    get_openai_llm(target)
+    from langchain.schema import HumanMessage  # noqa: F401
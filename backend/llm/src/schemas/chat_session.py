@@ -0,0 +1,47 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+from schemas.chat import LLMMessage
+
+
+class ChatSessionCreateRequest(BaseModel):
+    # chat: /chat-history와 같은 일반 채팅, coach: 관계 코치
+    kind: Literal["chat", "coach"] = "chat"
+    model: Literal["openai", "claude"] = "openai"
+    # 처음 대화 (system 프롬프트, 이전 대화 등)
+    messages: List[LLMMessage] = []
+
+
+class ChatSessionCreateResponse(BaseModel):
+    session_id: str
+    messages: int
+
+
+class ChatSessionMessageRequest(BaseModel):
+    # 지난 턴 이후의 새 메시지만 보냄
+    messages: List[LLMMessage]
+
+
+class ChatSessionMessageResponse(BaseModel):
+    session_id: str
+    response: str
+    messages: int
+
+
+class ChatSessionFrame(BaseModel):
+    """
+    WebSocket 클라이언트 메시지
+
+    - {"type": "start", "kind": "coach", "model": "openai", "messages": [...]}: 새 세션
+    - {"type": "start", "session_id": "..."}: 기존 세션 이어서 사용 (재연결)
+    - {"type": "message", "content": "..."}: 새 user 메시지
+    - {"type": "message", "messages": [...]}: 새 메시지 여러 개
+    """
+
+    type: Literal["start", "message"]
+    session_id: Optional[str] = None
+    kind: Literal["chat", "coach"] = "chat"
+    model: Literal["openai", "claude"] = "openai"
+    messages: List[LLMMessage] = []
+    content: Optional[str] = None
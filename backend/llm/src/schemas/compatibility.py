@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from schemas.labeling_trait_vector import TraitVector
+
+
+class CompatibilityScoreRequest(BaseModel):
+    """
+    두 사람의 성향 벡터를 직접 보내거나, 성향 벡터 저장소의 userId로 지정
+    """
+
+    user_trait_vector: Optional[TraitVector] = None
+    partner_trait_vector: Optional[TraitVector] = None
+    user_id: Optional[str] = None
+    partner_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_sources(self) -> "CompatibilityScoreRequest":
+        if not (self.user_trait_vector or self.user_id):
+            raise ValueError("user_trait_vector 또는 user_id가 필요합니다.")
+        if not (self.partner_trait_vector or self.partner_id):
+            raise ValueError("partner_trait_vector 또는 partner_id가 필요합니다.")
+        return self
+
+
+class CompatibilityScoreResponse(BaseModel):
+    compatibility_score: float = Field(
+        ge=0.0, le=100.0, description="궁합 점수 (0-100)"
+    )
+    emotional_balance: float = Field(description="감정 균형 (0-1, 높을수록 좋음)")
+    attachment_pairing: float = Field(description="애착 유형 조합 (0-1, 높을수록 좋음)")
+    communication_mismatch: float = Field(
+        description="소통 불일치 (0-1, 높을수록 나쁨)"
+    )
+
+
+class CompatibilityBatchRequest(BaseModel):
+    pairs: List[CompatibilityScoreRequest] = Field(description="커플 목록")
+    top_k: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="점수 상위 k개 커플만 반환 (없으면 입력 순서 전체)",
+    )
+
+
+class CompatibilityBatchItem(CompatibilityScoreResponse):
+    index: int = Field(description="요청 pairs 내 위치")
+
+
+class CompatibilityBatchResponse(BaseModel):
+    results: List[CompatibilityBatchItem]
+    missing: List[int] = Field(
+        default_factory=list, description="성향 벡터를 찾지 못한 pairs 위치"
+    )
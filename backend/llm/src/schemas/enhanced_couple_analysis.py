@@ -48,6 +48,9 @@ class PersonalityTraitSchema(BaseModel):
 
 
 class UserProfileData(BaseModel):
+    user_id: Optional[str] = Field(
+        default=None, description="성향 벡터 저장소의 userId (있으면 로컬 궁합 점수 활용)"
+    )
     name: str = Field(description="이름", examples=["김철수"])
     age: int = Field(ge=18, le=100, description="나이", examples=[28])
     mbti: MBTIType = Field(description="MBTI 성격 유형", examples=[MBTIType.INTJ])
@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -37,7 +37,9 @@ class SingleLabelingResult(BaseModel):
     sender: str
     text: str
     labels: dict
+    keyword_version: Optional[str] = None  # 라벨링에 사용한 키워드 사전 버전
 
 
 class HistoryLabelingResult(BaseModel):
     results: List[SingleLabelingResult]
+    keyword_version: Optional[str] = None
@@ -1,6 +1,6 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 # 입력 메시지
@@ -70,3 +70,26 @@ class LabelingTraitVectorResponse(BaseModel):
     labeled_messages: List[LabeledMessage]
     trait_vector: TraitVector
     summary: Dict[str, Any]  # 분석 요약 결과 (텍스트 또는 dict)
+    keyword_version: Optional[str] = None  # 라벨링에 사용한 키워드 사전 버전
+
+
+# 비슷한 성향의 사용자 조회
+class SimilarUser(BaseModel):
+    user_id: str
+    distance: float
+
+
+class SimilarTraitVectorsResponse(BaseModel):
+    user_id: str
+    metric: Literal["cosine", "euclidean"]
+    neighbors: List[SimilarUser]
+
+
+class SimilarTraitVectorsBatchRequest(BaseModel):
+    user_ids: List[str]
+    k: int = Field(10, ge=1, le=100)
+    metric: Literal["cosine", "euclidean"] = "cosine"
+
+
+class SimilarTraitVectorsBatchResponse(BaseModel):
+    results: List[SimilarTraitVectorsResponse]
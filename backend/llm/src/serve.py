@@ -0,0 +1,280 @@
+"""
+운영용 서버 진입점 (preload 후 fork하는 멀티 워커)
+
+    PYTHONPATH=src python src/serve.py --workers 4
+
+마스터 프로세스가 앱과 공유 읽기 전용 상태(컴파일된 키워드 매처, 성향 벡터 저장소 매핑 등)를
+한 번만 만든 뒤 gc.freeze()로 고정하고, 워커를 fork합니다. 워커는 같은 메모리 페이지를
+copy-on-write로 공유하고 마스터가 연 리슨 소켓에서 직접 요청을 받습니다.
+
+시그널:
+- SIGTERM / SIGINT: 워커가 처리 중인 요청을 마치도록 기다린 뒤 종료
+- SIGHUP: 워커를 하나씩 새로 fork해 교체 (새 워커가 뜬 뒤 이전 워커 종료)
+- SIGTTIN / SIGTTOU: 워커 수 1 증가 / 감소
+
+코드 변경은 프로세스(컨테이너) 재시작으로 반영합니다. --reload 는 run_server.sh(개발용)만 사용.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Set
+
+import uvicorn
+
+from config import settings
+from core.log import configure_logging
+
+logger = logging.getLogger("serve")
+
+
+def preload():
+    """
+    fork 전에 앱을 불러오고 워커가 공유할 읽기 전용 상태를 만들어 둠
+    """
+    from core.labeling.rule_engine import keyword_registry
+    from main import app
+    from services.trait_store import get_trait_store
+
+    keyword_registry.active  # 키워드 사전 파일 로드 + 컴파일
+    try:
+        get_trait_store()  # 성향 벡터 행렬 메모리 맵 (워커는 같은 매핑을 공유)
+    except OSError as e:
+        logger.warning(f"성향 벡터 저장소를 미리 열지 못했습니다: {e}")
+
+    # 이후 생성되는 객체만 GC 대상으로 두어, 워커에서 GC가 공유 페이지를 건드리지 않게 함
+    gc.collect()
+    gc.freeze()
+    return app
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Arbiter:
+    """
+    워커 프로세스 관리 (fork, 재시작, 종료)
+    """
+
+    def __init__(
+        self,
+        app,
+        sock: socket.socket,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: int = 30,
+    ) -> None:
+        self.app = app
+        self.sock = sock
+        self.num_workers = max(1, workers)
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.workers: Dict[int, float] = {}  # pid → 시작 시각
+        # SIGTERM을 보낸 워커 (두 번 보내면 강제 종료됨)
+        self._retiring: Set[int] = set()
+        self._stopping = False
+        self._signals: List[int] = []
+
+    # ---- 마스터 -----------------------------------------------------------
+
+    def run(self) -> None:
+        for sig in (
+            signal.SIGTERM,
+            signal.SIGINT,
+            signal.SIGHUP,
+            signal.SIGTTIN,
+            signal.SIGTTOU,
+        ):
+            signal.signal(sig, self._on_signal)
+        logger.info(
+            f"마스터 {os.getpid()} 시작: 워커 {self.num_workers}개, "
+            f"{self.sock.getsockname()}"
+        )
+        self._spawn_missing()
+        while True:
+            self._reap()
+            if self._signals:
+                sig = self._signals.pop(0)
+                if sig in (signal.SIGTERM, signal.SIGINT):
+                    self.stop()
+                    return
+                if sig == signal.SIGHUP:
+                    self.restart_workers()
+                elif sig == signal.SIGTTIN:
+                    self.num_workers += 1
+                elif sig == signal.SIGTTOU and self.num_workers > 1:
+                    self.num_workers -= 1
+            self._spawn_missing()
+            self._kill_extra()
+            time.sleep(0.2)
+
+    def stop(self) -> None:
+        """
+        모든 워커에 SIGTERM을 보내고 graceful_timeout 동안 기다린 뒤 남은 워커는 강제 종료
+        """
+        self._stopping = True
+        self._signal_workers(list(self.workers), signal.SIGTERM)
+        self._wait_for(list(self.workers), self.graceful_timeout)
+        self._signal_workers(list(self.workers), signal.SIGKILL)
+        self._wait_for(list(self.workers), 5)
+        self.sock.close()
+        logger.info("마스터 종료")
+
+    def restart_workers(self) -> None:
+        """
+        새 워커를 먼저 띄우고 이전 워커를 하나씩 종료 (요청 처리 공백 없음)
+        """
+        for old in list(self.workers):
+            self._spawn()
+            self._signal_workers([old], signal.SIGTERM)
+            self._wait_for([old], self.graceful_timeout)
+            self._signal_workers([old], signal.SIGKILL)
+
+    def _on_signal(self, sig: int, frame) -> None:
+        self._signals.append(sig)
+
+    def _active_workers(self) -> List[int]:
+        return [pid for pid in self.workers if pid not in self._retiring]
+
+    def _spawn_missing(self) -> None:
+        while not self._stopping and len(self._active_workers()) < self.num_workers:
+            self._spawn()
+
+    def _kill_extra(self) -> None:
+        active = self._active_workers()
+        extra = len(active) - self.num_workers
+        if extra > 0:
+            oldest = sorted(active, key=self.workers.__getitem__)[:extra]
+            self._signal_workers(oldest, signal.SIGTERM)
+
+    def _spawn(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = time.monotonic()
+            return
+        # 자식 프로세스
+        try:
+            self._run_worker()
+            code = 0
+        except BaseException:
+            logger.exception("워커 비정상 종료")
+            code = 1
+        os._exit(code)
+
+    def _reap(self) -> None:
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            retired = pid in self._retiring
+            self._retiring.discard(pid)
+            if self.workers.pop(pid, None) is not None and not (
+                self._stopping or retired
+            ):
+                logger.info(f"워커 {pid} 종료 (status={status}), 새 워커로 교체")
+
+    def _wait_for(self, pids: List[int], timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and any(p in self.workers for p in pids):
+            self._reap()
+            time.sleep(0.1)
+
+    def _signal_workers(self, pids: List[int], sig: int) -> None:
+        for pid in pids:
+            if sig == signal.SIGTERM:
+                if pid in self._retiring:
+                    continue
+                self._retiring.add(pid)
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                self.workers.pop(pid, None)
+                self._retiring.discard(pid)
+
+    # ---- 워커 -------------------------------------------------------------
+
+    def _run_worker(self) -> None:
+        # 마스터의 시그널 핸들러를 되돌림 (SIGTERM/SIGINT는 uvicorn이 다시 설치)
+        for sig in (
+            signal.SIGTERM,
+            signal.SIGINT,
+            signal.SIGHUP,
+            signal.SIGTTIN,
+            signal.SIGTTOU,
+        ):
+            signal.signal(sig, signal.SIG_DFL)
+        random.seed()
+        # 워커가 한꺼번에 재시작되지 않도록 요청 수 한도에 지터를 더함
+        limit: Optional[int] = None
+        if self.max_requests > 0:
+            limit = self.max_requests + random.randint(0, self.max_requests_jitter)
+        config = uvicorn.Config(
+            self.app,
+            limit_max_requests=limit,
+            timeout_graceful_shutdown=self.graceful_timeout,
+            proxy_headers=True,
+            log_config=None,
+        )
+        logger.info(f"워커 {os.getpid()} 시작 (최대 요청 수: {limit or '무제한'})")
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SAIONDO LLM 운영 서버")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=settings.WEB_CONCURRENCY)
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=settings.WORKER_MAX_REQUESTS,
+        help="워커가 이 수만큼 요청을 처리하면 새 워커로 교체 (0이면 끄기)",
+    )
+    parser.add_argument(
+        "--max-requests-jitter",
+        type=int,
+        default=settings.WORKER_MAX_REQUESTS_JITTER,
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=settings.WORKER_GRACEFUL_TIMEOUT,
+        help="종료/교체 시 처리 중인 요청을 기다리는 시간(초)",
+    )
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    app = preload()
+    sock = bind_socket(args.host, args.port)
+    Arbiter(
+        app,
+        sock,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+    ).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,13 +4,17 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
+from core.metrics import CACHE_ENTRIES, CACHE_REQUESTS
+
 logger = logging.getLogger(__name__)
 
 
 class AnalysisCache:
     """분석 결과 캐시 서비스"""
 
-    _cache: Dict[str, Dict[str, Any]] = {}  # 메모리 캐시 (실제 운영에서는 Redis 사용 권장)
+    _cache: Dict[str, Dict[str, Any]] = (
+        {}
+    )  # 메모리 캐시 (실제 운영에서는 Redis 사용 권장)
     _cache_ttl = timedelta(hours=24)  # 24시간 TTL
 
     @classmethod
@@ -19,10 +23,12 @@ class AnalysisCache:
         if key in cls._cache:
             cache_entry = cls._cache[key]
             if datetime.now() < cache_entry["expires_at"]:
+                CACHE_REQUESTS.inc("analysis", "hit")
                 return cache_entry["data"]
             else:
                 # 만료된 데이터 삭제
                 del cls._cache[key]
+        CACHE_REQUESTS.inc("analysis", "miss")
         return None
 
     @classmethod
@@ -87,3 +93,6 @@ class AnalysisCache:
             "active_entries": len(active_entries),
             "expired_entries": len(cls._cache) - len(active_entries),
         }
+
+
+CACHE_ENTRIES.set_function(lambda: len(AnalysisCache._cache), "analysis")
@@ -1,10 +1,13 @@
+from services.conversation_memory import conversation_memory
 from services.llm_provider import llm_provider
 
 
 class ChatRelationshipCoachService:
     def run(self, messages, model):
         # system prompt는 이미 messages[0]에 포함되어 있음
-        return llm_provider.ask_history(messages, model)
+        # 긴 상담은 오래된 대화를 요약으로 접어 토큰 예산 안에서 보냄
+        messages = conversation_memory.compact(messages, model, route="coach")
+        return llm_provider.ask_history(messages, model, route="coach")
 
 
 chat_relationship_coach_service = ChatRelationshipCoachService()
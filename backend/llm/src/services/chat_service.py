@@ -1,12 +1,14 @@
+from services.conversation_memory import conversation_memory
 from services.llm_provider import llm_provider
 
 
 class ChatService:
     def chat(self, prompt: str, model: str) -> str:
-        return llm_provider.ask(prompt, model)
+        return llm_provider.ask(prompt, model, route="chat")
 
     def chat_history(self, messages, model: str) -> str:
-        return llm_provider.ask_history(messages, model)
+        messages = conversation_memory.compact(messages, model, route="chat")
+        return llm_provider.ask_history(messages, model, route="chat")
 
 
 chat_service = ChatService()
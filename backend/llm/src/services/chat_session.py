@@ -0,0 +1,171 @@
+"""
+서버 측 채팅 세션 (클라이언트는 새 메시지만 보냄)
+
+/chat-history, /chat-relationship-coach는 매 턴 전체 대화를 다시 올려야 하지만, 세션 모드에서는
+서버가 대화를 보관하고 클라이언트는 새 메시지(델타)만 보냄 (api/chat_session.py의 WebSocket,
+세션 ID HTTP API).
+
+- 세션은 마지막 사용 후 CHAT_SESSION_TTL초가 지나면 만료, 최대 CHAT_SESSION_MAX_SESSIONS개
+  (넘으면 가장 오래 쓰지 않은 세션부터 지움)
+- 세션당 최대 CHAT_SESSION_MAX_MESSAGES개 메시지 보관 (앞쪽 system 메시지는 유지하고 오래된 대화부터
+  지움, LLM에는 대화 메모리(services.conversation_memory)를 거쳐 예산 안으로 줄여 보냄)
+- 턴 처리가 실패하면(오류 응답, 예외, 취소) 그 턴에 추가한 메시지를 되돌리므로 같은 델타로 재시도 가능
+- 저장소는 프로세스 메모리이므로 serve.py 멀티 워커에서는 세션을 만든 워커로 와야 이어짐
+  (다른 워커로 오면 세션을 찾을 수 없다는 응답을 받고, 클라이언트가 전체 대화로 새 세션을 만듦)
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import settings
+from core.metrics import CHAT_SESSION_TURNS, CHAT_SESSIONS
+from services.chat_relationship_coach_service import chat_relationship_coach_service
+from services.chat_service import chat_service
+
+Message = Dict[str, str]
+
+# 세션 종류별 턴 처리 (대화 메시지 목록, provider) -> 응답
+SESSION_KINDS = {
+    "chat": chat_service.chat_history,
+    "coach": chat_relationship_coach_service.run,
+}
+
+
+class ChatSessionNotFound(Exception):
+    def __init__(self, session_id: str) -> None:
+        super().__init__(
+            f"채팅 세션을 찾을 수 없습니다 (만료되었을 수 있음): {session_id}"
+        )
+        self.session_id = session_id
+
+
+def _as_message(message: Any) -> Message:
+    if hasattr(message, "role"):
+        return {"role": message.role, "content": message.content}
+    return {"role": message["role"], "content": message["content"]}
+
+
+def _failed(response: str) -> bool:
+    # provider 오류("❌ ...")와 잘못된 모델 응답은 대화에 남기지 않음
+    return response.startswith("❌") or response == "지원하지 않는 모델입니다."
+
+
+class ChatSession:
+    """
+    세션 하나의 대화 (턴 처리는 세션 잠금으로 한 번에 하나씩)
+    """
+
+    __slots__ = ("session_id", "kind", "model", "messages", "lock", "last_used")
+
+    def __init__(
+        self, session_id: str, kind: str, model: Optional[str], messages: List[Message]
+    ) -> None:
+        self.session_id = session_id
+        self.kind = kind
+        self.model = model
+        self.messages = messages
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class ChatSessionStore:
+    """
+    세션 ID별 채팅 세션 (마지막 사용 순서로 보관, TTL/최대 개수 초과분을 지움)
+    """
+
+    def __init__(self, ttl: float, max_sessions: int, max_messages: int) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(
+        self, kind: str, model: Optional[str], messages: Iterable[Any] = ()
+    ) -> ChatSession:
+        if kind not in SESSION_KINDS:
+            raise ValueError(f"지원하지 않는 세션 종류입니다: {kind}")
+        session = ChatSession(
+            uuid.uuid4().hex, kind, model, [_as_message(m) for m in messages]
+        )
+        self._trim(session)
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._evict(time.monotonic())
+        return session
+
+    def get(self, session_id: str) -> ChatSession:
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.last_used + self.ttl <= now:
+                self._sessions.pop(session_id, None)
+                raise ChatSessionNotFound(session_id)
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def send(
+        self, session: ChatSession, messages: Iterable[Any], transport: str
+    ) -> str:
+        """
+        새 메시지를 대화에 추가하고 LLM 응답을 받아 대화에 추가한 뒤 반환 (워커 스레드에서 호출)
+        """
+        delta = [_as_message(m) for m in messages]
+        with session.lock:
+            size = len(session.messages)
+            session.messages.extend(delta)
+            try:
+                response = SESSION_KINDS[session.kind](session.messages, session.model)
+            except BaseException:
+                del session.messages[size:]
+                CHAT_SESSION_TURNS.inc(transport, "error")
+                raise
+            if _failed(response):
+                del session.messages[size:]
+                CHAT_SESSION_TURNS.inc(transport, "error")
+                return response
+            session.messages.append({"role": "assistant", "content": response})
+            self._trim(session)
+            session.last_used = time.monotonic()
+        CHAT_SESSION_TURNS.inc(transport, "ok")
+        return response
+
+    def _trim(self, session: ChatSession) -> None:
+        # 앞쪽 system 메시지는 두고 오래된 대화부터 지움
+        excess = len(session.messages) - self.max_messages
+        if excess <= 0:
+            return
+        head = 0
+        while (
+            head < len(session.messages) and session.messages[head]["role"] == "system"
+        ):
+            head += 1
+        del session.messages[head : head + excess]
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            session_id, oldest = next(iter(self._sessions.items()))
+            expired = oldest.last_used + self.ttl <= now
+            if not expired and len(self._sessions) <= self.max_sessions:
+                return
+            del self._sessions[session_id]
+
+
+# 싱글턴 인스턴스
+chat_session_store = ChatSessionStore(
+    settings.CHAT_SESSION_TTL,
+    settings.CHAT_SESSION_MAX_SESSIONS,
+    settings.CHAT_SESSION_MAX_MESSAGES,
+)
+CHAT_SESSIONS.set_function(lambda: len(chat_session_store))
@@ -0,0 +1,157 @@
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+from schemas.labeling_trait_vector import TraitVector
+from services.trait_store import (
+    TRAIT_COLUMNS,
+    TRAIT_DIM,
+    get_trait_store,
+    trait_vector_to_array,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(*names: str) -> np.ndarray:
+    return np.array([TRAIT_COLUMNS[name] for name in names])
+
+
+_POSITIVE = _columns("affection_level", "gratitude_level")
+_NEGATIVE = _columns(
+    "frustration_level",
+    "anxiety_level",
+    "jealousy_level",
+    "loneliness_level",
+    "sadness_level",
+    "resentment_level",
+)
+_STABILITY = TRAIT_COLUMNS["emotional_stability_score"]
+_ATTACHMENT = _columns(
+    "secure_ratio",
+    "anxious_ratio",
+    "avoidant_ratio",
+    "fearful_ratio",
+    "ambivalent_ratio",
+)
+_STYLE = _columns(
+    "explanation_ratio",
+    "questioning_rate",
+    "silence_ratio",
+    "meta_conversation_ratio",
+    "expression_openness_score",
+)
+_HOSTILITY = _columns(
+    "passive_aggressive_ratio",
+    "repetition_ratio",
+    "reproach_level",
+    "complaint_tendency",
+)
+
+# 애착 유형 조합 점수 (secure, anxious, avoidant, fearful, ambivalent 순)
+ATTACHMENT_PAIRING = np.array(
+    [
+        [1.00, 0.70, 0.65, 0.55, 0.60],
+        [0.70, 0.45, 0.20, 0.30, 0.35],
+        [0.65, 0.20, 0.40, 0.30, 0.30],
+        [0.55, 0.30, 0.30, 0.25, 0.30],
+        [0.60, 0.35, 0.30, 0.30, 0.30],
+    ],
+    dtype=np.float32,
+)
+
+
+class CompatibilityScorer:
+    """
+    두 성향 벡터로 궁합 점수와 구성 요소를 계산하는 로컬 점수기 (LLM 호출 없음)
+
+    - emotional_balance: 긍정/부정 감정 균형과 안정성, 두 사람 간 차이 (높을수록 좋음)
+    - attachment_pairing: 애착 유형 분포 조합 점수 (높을수록 좋음)
+    - communication_mismatch: 소통 스타일 차이와 공격적 표현 비율 (높을수록 나쁨)
+
+    모든 계산은 (커플 수, TRAIT_DIM) 행렬 단위로 벡터화되어 있음
+    """
+
+    WEIGHTS = {
+        "emotional_balance": 0.35,
+        "attachment_pairing": 0.40,
+        "communication_mismatch": 0.25,
+    }
+
+    def score(self, user: TraitVector, partner: TraitVector) -> Dict[str, float]:
+        breakdown = self.score_batch(
+            trait_vector_to_array(user)[None, :],
+            trait_vector_to_array(partner)[None, :],
+        )
+        return {name: float(values[0]) for name, values in breakdown.items()}
+
+    def score_batch(
+        self, users: np.ndarray, partners: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        커플 단위로 짝지은 두 성향 벡터 행렬 → 구성 요소별 점수 배열
+        """
+        users = np.asarray(users, dtype=np.float32).reshape(-1, TRAIT_DIM)
+        partners = np.asarray(partners, dtype=np.float32).reshape(-1, TRAIT_DIM)
+        if users.shape != partners.shape:
+            raise ValueError("users와 partners의 커플 수가 다릅니다.")
+
+        balance_a = self._emotional_balance(users)
+        balance_b = self._emotional_balance(partners)
+        emotional_balance = np.clip(
+            (balance_a + balance_b) / 2 - 0.25 * np.abs(balance_a - balance_b), 0, 1
+        )
+
+        attachment_pairing = self._attachment_pairing(users, partners)
+
+        style_gap = np.abs(users[:, _STYLE] - partners[:, _STYLE]).mean(axis=1)
+        hostility = (users[:, _HOSTILITY] + partners[:, _HOSTILITY]).mean(axis=1)
+        communication_mismatch = np.clip(style_gap + 0.5 * hostility, 0, 1)
+
+        score = (
+            self.WEIGHTS["emotional_balance"] * emotional_balance
+            + self.WEIGHTS["attachment_pairing"] * attachment_pairing
+            + self.WEIGHTS["communication_mismatch"] * (1 - communication_mismatch)
+        )
+        return {
+            "compatibility_score": np.round(100 * np.clip(score, 0, 1), 1),
+            "emotional_balance": emotional_balance,
+            "attachment_pairing": attachment_pairing,
+            "communication_mismatch": communication_mismatch,
+        }
+
+    def score_users(self, user_id: str, partner_id: str) -> Optional[Dict[str, float]]:
+        """
+        성향 벡터 저장소에 있는 두 사용자의 궁합 점수 (없으면 None)
+        """
+        store = get_trait_store()
+        user, partner = store.get_array(user_id), store.get_array(partner_id)
+        if user is None or partner is None:
+            return None
+        breakdown = self.score_batch(user[None, :], partner[None, :])
+        return {name: float(values[0]) for name, values in breakdown.items()}
+
+    @staticmethod
+    def _emotional_balance(vectors: np.ndarray) -> np.ndarray:
+        positive = vectors[:, _POSITIVE].sum(axis=1)
+        negative = vectors[:, _NEGATIVE].sum(axis=1)
+        valence = np.clip(0.5 + 0.5 * (positive - negative), 0, 1)
+        return 0.7 * valence + 0.3 * np.clip(vectors[:, _STABILITY], 0, 1)
+
+    @staticmethod
+    def _attachment_pairing(users: np.ndarray, partners: np.ndarray) -> np.ndarray:
+        a = users[:, _ATTACHMENT]
+        b = partners[:, _ATTACHMENT]
+        a_total = a.sum(axis=1, keepdims=True)
+        b_total = b.sum(axis=1, keepdims=True)
+        a = a / np.where(a_total > 0, a_total, 1)
+        b = b / np.where(b_total > 0, b_total, 1)
+        pairing = np.einsum("ni,ij,nj->n", a, ATTACHMENT_PAIRING, b)
+        # 애착 신호가 없는 쪽이 있으면 중립값
+        known = (a_total[:, 0] > 0) & (b_total[:, 0] > 0)
+        return np.where(known, pairing, 0.5).astype(np.float32)
+
+
+# 싱글턴 인스턴스
+compatibility_scorer = CompatibilityScorer()
@@ -0,0 +1,233 @@
+"""
+토큰 예산 기반 대화 메모리 (/chat-history, 관계 코치, 피드백 대화)
+
+대화의 예상 토큰 수가 CONVERSATION_TOKEN_BUDGET을 넘으면 앞쪽 system 메시지와 최근 대화는 그대로
+두고, 그 사이의 오래된 대화를 요약(system 메시지 하나)으로 접어서 LLM에 보냄.
+
+- 요약은 (route, 접은 대화) 해시로 캐시하고, 다음 턴에는 캐시된 요약 + 새로 접을 대화만 요약함
+  (클라이언트가 매 턴 전체 대화를 보내도 요약 호출은 예산을 넘을 때만, 새로 접는 부분만큼만 함)
+- 접을 때는 최근 대화를 CONVERSATION_RECENT_TOKENS 이내로 줄여 다음 몇 턴은 요약 없이 예산 안에 들어감
+- 요약 호출이 실패하면 요약 없이 오래된 대화를 버림 (llm_fallbacks_total{call_site="conversation_summary"})
+- 토큰 수는 토크나이저 없이 문자 종류로 근사함 (estimate_tokens)
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import settings
+from core.metrics import (
+    CONVERSATION_PROMPT_TOKENS,
+    CONVERSATION_SUMMARIES,
+    LLM_FALLBACKS,
+)
+from services.llm_provider import llm_provider
+
+logger = logging.getLogger(__name__)
+
+# 메시지 하나마다 붙는 역할/구분자 토큰 수 (OpenAI chat 형식 기준 근사치)
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_PREFIX = "이전 대화 요약:\n"
+
+Message = Dict[str, str]
+Summarizer = Callable[[str, Sequence[Message], Optional[str]], str]
+
+_ROLE_NAMES = {"user": "사용자", "assistant": "AI", "system": "시스템"}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 근사치: ASCII는 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰
+
+    (UTF-8 바이트 수와 글자 수 차이로 ASCII가 아닌 글자 수를 세므로 문자열을 순회하지 않음,
+    한글 대화에서는 실제 토큰 수보다 약간 크게 잡힘)
+    """
+    chars = len(text)
+    non_ascii = (len(text.encode()) - chars) // 2
+    return (chars - non_ascii + 3) // 4 + non_ascii
+
+
+def _role_content(message: Any) -> Tuple[str, str]:
+    if hasattr(message, "role"):
+        return message.role, message.content
+    return message["role"], message["content"]
+
+
+def _message_tokens(message: Message) -> int:
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _summary_prompt(summary: str, messages: Sequence[Message]) -> str:
+    lines = "\n".join(
+        f"{_ROLE_NAMES.get(m['role'], m['role'])}: {m['content']}" for m in messages
+    )
+    previous = summary or "(없음)"
+    return f"""
+다음은 진행 중인 대화의 이전 요약과, 그 뒤에 이어진 대화입니다.
+둘을 합쳐 이후 대화를 이어가는 데 필요한 내용(인물과 관계, 상황, 고민, 사용자가 밝힌 사실과 선호,
+이미 한 조언과 약속)을 빠짐없이 담은 요약을 한국어로 {settings.CONVERSATION_SUMMARY_CHARS}자 이내로
+작성하세요. 요약 내용만 출력하세요.
+
+[이전 요약]
+{previous}
+
+[이어진 대화]
+{lines}
+"""
+
+
+def _summarize_with_llm(
+    summary: str, messages: Sequence[Message], model: Optional[str]
+) -> str:
+    return llm_provider.ask(
+        _summary_prompt(summary, messages),
+        model,
+        call_site="conversation_summary",
+        route="summary",
+    )
+
+
+class ConversationMemory:
+    """
+    대화 메시지 목록을 토큰 예산 안으로 줄이고, 접은 대화의 요약을 캐시
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        recent_tokens: int,
+        min_recent_messages: int = 4,
+        cache_size: int = 1000,
+        summarize: Optional[Summarizer] = None,
+    ) -> None:
+        self.token_budget = token_budget
+        self.recent_tokens = recent_tokens
+        self.min_recent_messages = max(1, min_recent_messages)
+        self.cache_size = cache_size
+        self._summarize = summarize or _summarize_with_llm
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is not None:
+                self._summaries.move_to_end(key)
+            return summary
+
+    def _store(self, key: str, summary: str) -> None:
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > self.cache_size:
+                self._summaries.popitem(last=False)
+
+    @staticmethod
+    def _prefix_keys(route: str, messages: Sequence[Message]) -> List[str]:
+        # keys[i]: route + messages[:i+1] 전체의 해시 (앞 메시지 해시를 이어서 계산)
+        keys: List[str] = []
+        digest = hashlib.sha1(route.encode()).digest()
+        for message in messages:
+            h = hashlib.sha1(digest)
+            h.update(message["role"].encode())
+            h.update(b"\0")
+            h.update(message["content"].encode())
+            digest = h.digest()
+            keys.append(digest.hex())
+        return keys
+
+    def compact(
+        self, messages: Sequence[Any], model: Optional[str], route: str
+    ) -> List[Message]:
+        """
+        예산 안의 대화는 그대로, 넘으면 [앞쪽 system 메시지, 요약, 최근 대화]로 바꿔서 반환
+        """
+        items = [dict(zip(("role", "content"), _role_content(m))) for m in messages]
+        total = sum(_message_tokens(m) for m in items)
+        if self.token_budget <= 0 or total <= self.token_budget:
+            CONVERSATION_PROMPT_TOKENS.observe(total, route)
+            return items
+
+        head_size = 0
+        while head_size < len(items) and items[head_size]["role"] == "system":
+            head_size += 1
+        head, body = items[:head_size], items[head_size:]
+        keys = self._prefix_keys(route, body)
+
+        # 이전 턴에 접어 둔 가장 긴 앞부분의 요약부터 이어서 사용
+        start, summary = 0, ""
+        for i in range(len(body) - 1, -1, -1):
+            cached = self._cached(keys[i])
+            if cached is not None:
+                start, summary = i + 1, cached
+                break
+
+        fixed = sum(_message_tokens(m) for m in head)
+        if summary:
+            fixed += estimate_tokens(SUMMARY_PREFIX + summary) + MESSAGE_OVERHEAD_TOKENS
+        tail = sum(_message_tokens(m) for m in body[start:])
+        if fixed + tail <= self.token_budget:
+            CONVERSATION_SUMMARIES.inc(route, "cached")
+        else:
+            end = self._fold_end(body, start)
+            if end > start:
+                start, summary = self._refresh(
+                    route, model, summary, body, start, end, keys
+                )
+
+        compacted = list(head)
+        if summary:
+            compacted.append({"role": "system", "content": SUMMARY_PREFIX + summary})
+        compacted.extend(body[start:])
+        CONVERSATION_PROMPT_TOKENS.observe(
+            sum(_message_tokens(m) for m in compacted), route
+        )
+        return compacted
+
+    def _fold_end(self, body: Sequence[Message], start: int) -> int:
+        # 최근 대화를 recent_tokens 이내(최소 min_recent_messages개)로 남기는 접기 경계
+        end = len(body)
+        recent = 0
+        while end > start:
+            tokens = _message_tokens(body[end - 1])
+            kept = len(body) - end
+            if (
+                kept >= self.min_recent_messages
+                and recent + tokens > self.recent_tokens
+            ):
+                break
+            recent += tokens
+            end -= 1
+        return end
+
+    def _refresh(
+        self,
+        route: str,
+        model: Optional[str],
+        summary: str,
+        body: Sequence[Message],
+        start: int,
+        end: int,
+        keys: Sequence[str],
+    ) -> Tuple[int, str]:
+        # 캐시된 요약 + body[start:end]를 새 요약으로 접음
+        refreshed = self._summarize(summary, body[start:end], model)
+        if not refreshed or refreshed.startswith("❌"):
+            CONVERSATION_SUMMARIES.inc(route, "failed")
+            LLM_FALLBACKS.inc("conversation_summary")
+            logger.warning(f"대화 요약 실패, 오래된 대화를 요약 없이 생략: {refreshed}")
+            return end, summary
+        refreshed = refreshed.strip()
+        self._store(keys[end - 1], refreshed)
+        CONVERSATION_SUMMARIES.inc(route, "refreshed")
+        return end, refreshed
+
+
+# 싱글턴 인스턴스
+conversation_memory = ConversationMemory(
+    settings.CONVERSATION_TOKEN_BUDGET,
+    settings.CONVERSATION_RECENT_TOKENS,
+    min_recent_messages=settings.CONVERSATION_MIN_RECENT_MESSAGES,
+    cache_size=settings.CONVERSATION_SUMMARY_CACHE_SIZE,
+)
@@ -3,7 +3,7 @@ from services.llm_provider import llm_provider
 
 class CoupleAnalysisService:
     def analyze(self, prompt: str) -> str:
-        return llm_provider.ask(prompt)
+        return llm_provider.ask(prompt, route="comprehensive_analysis")
 
 
 couple_analysis_service = CoupleAnalysisService()
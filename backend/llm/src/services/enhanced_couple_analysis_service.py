@@ -1,9 +1,14 @@
 import json
 import logging
+import sys
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from core.log import log_payload
+from core.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
+from core.request_context import raise_if_cancelled
 from services.analysis_validator import AnalysisValidator
+from services.compatibility_scorer import compatibility_scorer
 from services.llm_provider import llm_provider
 
 logger = logging.getLogger(__name__)
@@ -61,12 +66,13 @@ class EnhancedCoupleAnalysisService:
                 user_data, partner_data
             )
 
-            # 5. 종합 분석 및 조언 생성
+            # 5. 종합 분석 및 조언 생성 (성향 벡터가 있으면 로컬 궁합 점수를 참고로 제공)
             comprehensive_analysis = self._generate_comprehensive_analysis(
                 basic_analysis,
                 mbti_analysis,
                 communication_analysis,
                 love_language_analysis,
+                local_score=self._local_compatibility(user_data, partner_data),
             )
 
             return comprehensive_analysis
@@ -80,7 +86,8 @@ class EnhancedCoupleAnalysisService:
     ) -> List[CoupleAnalysisResult]:
         """여러 커플 동시 분석"""
         results = []
-        for couple_data in couples_data:
+        for index, couple_data in enumerate(couples_data):
+            raise_if_cancelled("batch_item", amount=len(couples_data) - index)
             try:
                 user_data = couple_data.get("user_data", {})
                 partner_data = couple_data.get("partner_data", {})
@@ -114,7 +121,7 @@ class EnhancedCoupleAnalysisService:
         }}
         """
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="sub_analysis")
         return self._parse_json_response(response)
 
     def _analyze_mbti_compatibility(self, user_data: Dict, partner_data: Dict) -> Dict:
@@ -137,7 +144,7 @@ class EnhancedCoupleAnalysisService:
         }}
         """
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="sub_analysis")
         return self._parse_json_response(response)
 
     def _analyze_communication_style(self, user_data: Dict, partner_data: Dict) -> Dict:
@@ -156,7 +163,7 @@ class EnhancedCoupleAnalysisService:
         }}
         """
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="sub_analysis")
         return self._parse_json_response(response)
 
     def _analyze_love_language(self, user_data: Dict, partner_data: Dict) -> Dict:
@@ -193,15 +200,38 @@ class EnhancedCoupleAnalysisService:
         }}
         """
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="sub_analysis")
         return self._parse_json_response(response)
 
-    def _generate_comprehensive_analysis(self, *analyses) -> CoupleAnalysisResult:
+    def _local_compatibility(
+        self, user_data: Dict, partner_data: Dict
+    ) -> Optional[Dict[str, float]]:
+        """성향 벡터 저장소 기반 로컬 궁합 점수 (두 사람 모두 벡터가 있을 때만)"""
+        user_id = user_data.get("user_id") or user_data.get("id")
+        partner_id = partner_data.get("user_id") or partner_data.get("id")
+        if not user_id or not partner_id:
+            return None
+        try:
+            return compatibility_scorer.score_users(str(user_id), str(partner_id))
+        except Exception as e:
+            logger.warning(f"로컬 궁합 점수 계산 실패: {str(e)}")
+            return None
+
+    def _generate_comprehensive_analysis(
+        self, *analyses, local_score: Optional[Dict[str, float]] = None
+    ) -> CoupleAnalysisResult:
         """종합 분석 생성"""
+        local_score_section = (
+            f"성향 벡터 기반 로컬 궁합 점수(참고값): "
+            f"{json.dumps(local_score, ensure_ascii=False)}"
+            if local_score
+            else ""
+        )
         prompt = f"""
         다음 분석 결과들을 종합하여 커플을 위한 종합적인 조언을 생성해주세요:
 
         분석 결과: {json.dumps(analyses, ensure_ascii=False)}
+        {local_score_section}
 
         다음 형식으로 응답해주세요:
         {{
@@ -223,7 +253,7 @@ class EnhancedCoupleAnalysisService:
         }}
         """
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="comprehensive_analysis")
         result_data = self._parse_json_response(response)
 
         return CoupleAnalysisResult(
@@ -240,11 +270,13 @@ class EnhancedCoupleAnalysisService:
         try:
             return json.loads(response)
         except json.JSONDecodeError as e:
-            logger.error(f"JSON 파싱 실패: {str(e)}, 응답: {response}")
+            LLM_PARSE_FAILURES.inc(sys._getframe(1).f_code.co_name)
+            log_payload(logger, f"JSON 파싱 실패: {str(e)}", response, logging.ERROR)
             return {}
 
     def _get_fallback_analysis(self) -> CoupleAnalysisResult:
         """오류 시 기본 분석 반환"""
+        LLM_FALLBACKS.inc(sys._getframe(1).f_code.co_name)
         return CoupleAnalysisResult(
             summary="분석을 완료할 수 없습니다. 잠시 후 다시 시도해주세요.",
             advice="서로의 감정을 자주 표현하고 대화를 나누어보세요.",
@@ -1,13 +1,15 @@
+from services.conversation_memory import conversation_memory
 from services.llm_provider import llm_provider
 
 
 class FeedbackService:
     def feedback(self, message: str, room_id: str, model: str) -> str:
         prompt = f"[Room: {room_id}] {message}"
-        return llm_provider.ask(prompt, model)
+        return llm_provider.ask(prompt, model, route="feedback")
 
     def feedback_history(self, messages, model: str) -> str:
-        return llm_provider.ask_history(messages, model)
+        messages = conversation_memory.compact(messages, model, route="feedback")
+        return llm_provider.ask_history(messages, model, route="feedback")
 
 
 feedback_service = FeedbackService()
@@ -0,0 +1,200 @@
+"""
+LLM 호출 헤징 (꼬리 지연 완화)
+
+LLM_HEDGE_ENABLED=true이면 provider/모델별 최근 호출 시간의 LLM_HEDGE_PERCENTILE 분위수가
+지나도 끝나지 않은 호출에 같은 요청을 한 번 더 보냄 (LLM_HEDGE_PROVIDER를 정하면 그 provider로).
+먼저 도착한 정상 응답("❌"로 시작하지 않는 응답)을 사용하고 나머지는 취소함.
+
+- 헤지 예산: 일반 호출 1번마다 LLM_HEDGE_BUDGET_RATIO만큼 쌓이는 크레딧을 헤지 1번이 씀
+  (장애로 모든 호출이 느려져도 헤지가 호출량을 LLM_HEDGE_BUDGET_RATIO 이상 늘리지 않음)
+- 최근 기록이 LLM_HEDGE_MIN_SAMPLES개보다 적으면 헤지하지 않음
+- 동기 HTTP 호출은 중간에 끊을 수 없으므로 이미 시작한 쪽은 결과만 버림
+  (아직 스레드 풀에서 대기 중이면 실제로 취소됨)
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+from config import settings
+from core.metrics import LLM_HEDGES
+from core.request_context import raise_if_cancelled
+from services.model_router import ModelTarget, model_router
+
+Key = Tuple[str, str]
+
+
+class LatencyTracker:
+    """
+    provider/모델별 최근 성공 호출 시간(초) 기록과 분위수 계산
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = window
+        self._samples: Dict[Key, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, key: Key, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            with self._lock:
+                samples = self._samples.setdefault(key, deque(maxlen=self.window))
+        samples.append(seconds)
+
+    def percentile(self, key: Key, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        q(0~1) 분위수, 기록이 min_samples개보다 적으면 None
+        """
+        samples = self._samples.get(key)
+        if samples is None:
+            return None
+        with self._lock:
+            ordered = sorted(samples)
+        if not ordered or len(ordered) < min_samples:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+        return ordered[index]
+
+
+class HedgeBudget:
+    """
+    일반 호출 수에 비례해 쌓이는 헤지 크레딧 (최대 burst개까지 모아 둠)
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._credits = 0.0
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._credits = min(self.burst, self._credits + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._credits < 1.0:
+                return False
+            self._credits -= 1.0
+            return True
+
+
+def _valid(response: str) -> bool:
+    return not response.startswith("❌")
+
+
+class Hedger:
+    """
+    call(target)을 실행하고, 지연되면 헤지 호출을 보내 먼저 온 정상 응답을 반환
+    """
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        budget: HedgeBudget,
+        max_workers: int = 64,
+    ) -> None:
+        self.tracker = tracker
+        self.budget = budget
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.LLM_HEDGE_ENABLED
+
+    def hedge_delay(self, target: ModelTarget) -> Optional[float]:
+        """
+        헤지를 보낼 때까지 기다릴 시간(초), 기록이 부족하면 None
+        """
+        delay = self.tracker.percentile(
+            (target.provider, target.model),
+            settings.LLM_HEDGE_PERCENTILE,
+            settings.LLM_HEDGE_MIN_SAMPLES,
+        )
+        if delay is None:
+            return None
+        return max(delay, settings.LLM_HEDGE_MIN_DELAY_MS / 1000)
+
+    def hedge_target(self, target: ModelTarget) -> ModelTarget:
+        provider = settings.LLM_HEDGE_PROVIDER
+        if not provider or provider == target.provider:
+            return target
+        return model_router.resolve(target.route, provider)
+
+    def run(
+        self,
+        call: Callable[[ModelTarget], str],
+        target: ModelTarget,
+        call_site: str,
+    ) -> str:
+        self.budget.record_call()
+        delay = self.hedge_delay(target)
+        if delay is None:
+            return self.timed(call, target)
+
+        primary = self._submit(call, target)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        # 클라이언트가 끊었으면 헤지를 보내지 않음 (원래 호출 결과는 버림)
+        raise_if_cancelled("llm_call")
+        if not self.budget.try_acquire():
+            LLM_HEDGES.inc(call_site, "budget_exhausted")
+            return primary.result()
+
+        LLM_HEDGES.inc(call_site, "sent")
+        hedge = self._submit(call, self.hedge_target(target))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and _valid(future.result()):
+                    for loser in pending:
+                        loser.cancel()
+                    if future is hedge:
+                        LLM_HEDGES.inc(call_site, "won")
+                    return future.result()
+        # 둘 다 실패하면 원래 호출의 결과(오류 문자열 또는 예외)를 그대로 전달
+        return primary.result()
+
+    def timed(self, call: Callable[[ModelTarget], str], target: ModelTarget) -> str:
+        """
+        call(target)을 실행하고 정상 응답이면 호출 시간을 기록
+        """
+        started = time.perf_counter()
+        response = call(target)
+        if _valid(response):
+            self.tracker.observe(
+                (target.provider, target.model), time.perf_counter() - started
+            )
+        return response
+
+    def _submit(
+        self, call: Callable[[ModelTarget], str], target: ModelTarget
+    ) -> "Future[str]":
+        # 요청 문맥(토큰 예산/사용량, 트레이싱)이 작업 스레드에서도 보이도록 호출마다 복사
+        context = contextvars.copy_context()
+        return self._pool().submit(context.run, self.timed, call, target)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.max_workers, thread_name_prefix="llm-hedge"
+                    )
+        return self._executor
+
+
+# 싱글턴 인스턴스
+llm_latency = LatencyTracker(settings.LLM_LATENCY_WINDOW)
+hedger = Hedger(
+    llm_latency,
+    HedgeBudget(settings.LLM_HEDGE_BUDGET_RATIO),
+    max_workers=settings.LLM_HEDGE_MAX_WORKERS,
+)
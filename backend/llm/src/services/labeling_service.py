@@ -1,7 +1,12 @@
 import json
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Union
 
-from core.labeling.rule_engine import KEYWORDS, label_message
+from pydantic import ValidationError
+
+from core.labeling.keyword_registry import CompiledKeywords
+from core.labeling.label_codes import LabeledMessageRecord
+from core.labeling.rule_engine import keyword_registry, label_message_mask
+from core.metrics import LLM_PARSE_FAILURES
 from schemas.labeling import HistoryMessage, SingleMessageRequest
 from services.llm_provider import llm_provider
 
@@ -23,38 +28,153 @@ def build_labeling_prompt(categories: dict, messages: list) -> str:
     return prompt
 
 
+# NDJSON 한 줄 최대 크기 (줄바꿈 없는 본문이 통째로 버퍼링되는 것을 방지)
+MAX_NDJSON_LINE_BYTES = 64 * 1024
+
+
+def iter_ndjson_lines(
+    chunks: Iterable[bytes], max_line_bytes: int = MAX_NDJSON_LINE_BYTES
+) -> Iterator[Optional[bytes]]:
+    """
+    바이트 청크 스트림을 줄 단위로 분리
+
+    새로 들어온 청크만 검사하고, 아직 끝나지 않은 줄 조각만 보관함.
+    max_line_bytes를 넘는 줄은 버리고 None을 반환 (줄 번호 유지용)
+    """
+    pending = bytearray()
+    oversized = False
+    for chunk in chunks:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            piece = chunk[start:] if newline < 0 else chunk[start:newline]
+            if not oversized:
+                if len(pending) + len(piece) > max_line_bytes:
+                    oversized = True
+                    pending.clear()
+                else:
+                    pending += piece
+            if newline < 0:
+                break
+            yield None if oversized else bytes(pending)
+            pending.clear()
+            oversized = False
+            start = newline + 1
+    if oversized:
+        yield None
+    elif pending:
+        yield bytes(pending)
+
+
+def iter_ndjson_messages(
+    lines: Iterable[Optional[bytes]],
+) -> Iterator[Union[HistoryMessage, dict]]:
+    """
+    NDJSON 줄을 HistoryMessage로 검증, 실패한 줄은 {"line": n, "error": ...} 반환
+    """
+    for line_no, line in enumerate(lines, start=1):
+        if line is None:
+            yield {"line": line_no, "error": "line too long"}
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield HistoryMessage.model_validate_json(line)
+        except ValidationError as e:
+            error = e.errors()[0]
+            loc = ".".join(str(part) for part in error["loc"])
+            message = f"{loc}: {error['msg']}" if loc else error["msg"]
+            yield {"line": line_no, "error": message}
+
+
 class LabelingService:
     @staticmethod
-    def label_with_llm(messages: list, model: Optional[str] = None) -> dict:
+    def label_with_llm(
+        messages: list,
+        model: Optional[str] = None,
+        keywords: Optional[CompiledKeywords] = None,
+    ) -> dict:
         """
         LLM을 이용한 메시지(히스토리) 라벨링
         """
-        prompt = build_labeling_prompt(KEYWORDS, messages)
-        llm_response = llm_provider.ask(prompt, model=model)
+        keywords = keywords or keyword_registry.active
+        prompt = build_labeling_prompt(keywords.keywords, messages)
+        llm_response = llm_provider.ask(prompt, model=model, route="labeling")
         try:
             result = json.loads(llm_response)
         except Exception:
+            LLM_PARSE_FAILURES.inc("label_with_llm")
             result = {"error": "LLM 응답 파싱 실패", "raw": llm_response}
         return result
 
     @staticmethod
-    def label_single_message(request: SingleMessageRequest) -> dict:
+    def label_single_message(
+        request: SingleMessageRequest, keywords: Optional[CompiledKeywords] = None
+    ) -> dict:
         """
         단일 메시지 룰 기반 라벨링
         """
-        labels = label_message(request.text)
-        return {"sender": request.sender, "text": request.text, "labels": labels}
+        keywords = keywords or keyword_registry.active
+        mask = label_message_mask(request.text, keywords)
+        result = LabeledMessageRecord(request.sender, request.text, mask).to_dict()
+        result["keyword_version"] = keywords.version
+        return result
 
     @staticmethod
-    def label_message_history(messages: list[HistoryMessage]) -> list:
+    def label_message_history(
+        messages: list[HistoryMessage], keywords: Optional[CompiledKeywords] = None
+    ) -> list:
         """
         메시지 히스토리 룰 기반 라벨링
         """
-        results = []
+        return list(LabelingService.iter_message_history(messages, keywords))
+
+    @staticmethod
+    def iter_labeled_records(
+        messages: Iterable[HistoryMessage],
+        keywords: Optional[CompiledKeywords] = None,
+    ) -> Iterator[LabeledMessageRecord]:
+        """
+        메시지 히스토리 룰 기반 라벨링 (내부 표현: 라벨 비트마스크 레코드)
+        """
+        keywords = keywords or keyword_registry.active
         for msg in messages:
-            labels = label_message(msg.text)
-            results.append({"sender": msg.sender, "text": msg.text, "labels": labels})
-        return results
+            mask = keywords.label_mask(msg.text)
+            yield LabeledMessageRecord(msg.sender, msg.text, mask)
+
+    @staticmethod
+    def iter_message_history(
+        messages: Iterable[Union[HistoryMessage, dict]],
+        keywords: Optional[CompiledKeywords] = None,
+    ) -> Iterator[dict]:
+        """
+        메시지 히스토리 룰 기반 라벨링 (제너레이터, 메시지 단위로 결과 반환)
+
+        dict 항목(파싱 오류 레코드 등)은 라벨링하지 않고 그대로 통과시킴.
+        키워드 사전 버전은 시작할 때 한 번 정해져 스트림 끝까지 유지됨
+        """
+        keywords = keywords or keyword_registry.active
+        for msg in messages:
+            if isinstance(msg, dict):
+                yield msg
+                continue
+            mask = keywords.label_mask(msg.text)
+            yield LabeledMessageRecord(msg.sender, msg.text, mask).to_dict()
+
+    @staticmethod
+    def stream_ndjson_history(
+        chunks: Iterable[bytes], keywords: Optional[CompiledKeywords] = None
+    ) -> Iterator[str]:
+        """
+        NDJSON 메시지 스트림 룰 기반 라벨링
+
+        청크 → 줄 → HistoryMessage → 라벨링 → NDJSON 한 줄 순서의 제너레이터
+        파이프라인으로, 입력 한 줄마다 결과 한 줄을 바로 내보냄
+        """
+        lines = iter_ndjson_lines(chunks)
+        messages = iter_ndjson_messages(lines)
+        for result in LabelingService.iter_message_history(messages, keywords):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
 
     @staticmethod
     def label_single_message_llm(
@@ -63,11 +183,13 @@ class LabelingService:
         """
         단일 메시지 LLM 기반 라벨링
         """
-        prompt = build_labeling_prompt(KEYWORDS, [request])
-        llm_response = llm_provider.ask(prompt, model=model)
+        keywords = keyword_registry.active
+        prompt = build_labeling_prompt(keywords.keywords, [request])
+        llm_response = llm_provider.ask(prompt, model=model, route="labeling")
         try:
             result = json.loads(llm_response)
         except Exception:
+            LLM_PARSE_FAILURES.inc("label_single_message_llm")
             result = {"error": "LLM 응답 파싱 실패", "raw": llm_response}
         return result
 
@@ -78,10 +200,12 @@ class LabelingService:
         """
         메시지 히스토리 LLM 기반 라벨링
         """
-        prompt = build_labeling_prompt(KEYWORDS, messages)
-        llm_response = llm_provider.ask(prompt, model=model)
+        keywords = keyword_registry.active
+        prompt = build_labeling_prompt(keywords.keywords, messages)
+        llm_response = llm_provider.ask(prompt, model=model, route="labeling")
         try:
             result = json.loads(llm_response)
         except Exception:
+            LLM_PARSE_FAILURES.inc("label_message_history_llm")
             result = {"error": "LLM 응답 파싱 실패", "raw": llm_response}
         return result
@@ -1,8 +1,19 @@
 import json
 import logging
 from collections import Counter
-from typing import Any, Dict
+from enum import Enum
+from typing import Any, Dict, List, Optional
 
+from core.labeling.label_codes import count_labels, label_id, labels_to_mask
+from core.labeling.labels import (
+    AttachmentPattern,
+    CommunicationStyle,
+    EmotionExpression,
+    RelationshipAttitude,
+    SelfAssertion,
+)
+from core.labeling.rule_engine import keyword_registry, label_message
+from core.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
 from schemas.labeling import ChatMessage
 from schemas.labeling_trait_vector import (
     LabeledMessage,
@@ -11,6 +22,8 @@ from schemas.labeling_trait_vector import (
     TraitVector,
 )
 from services.llm_provider import llm_provider
+from services.trait_similarity import update_similarity_indexes
+from services.trait_store import get_trait_store, trait_vector_to_array
 
 logger = logging.getLogger(__name__)
 
@@ -45,12 +58,17 @@ class LabelingTraitVectorService:
     def label_trait_vector(
         request: LabelingTraitVectorRequest,
     ) -> LabelingTraitVectorResponse:
+        # 요청 전체를 같은 키워드 사전 버전으로 처리
+        keywords = keyword_registry.active
+
         # 1. LLM을 통한 메시지 라벨링 + 요약 (한 번에)
-        prompt = build_labeling_and_summary_prompt(request.categories, request.messages)
-        llm_response = llm_provider.ask(prompt, model=request.model)
+        prompt = build_labeling_and_summary_prompt(keywords.keywords, request.messages)
+        llm_response = llm_provider.ask(prompt, route="labeling")
+        summary: Dict[str, Any] = {}
 
         try:
             result = json.loads(llm_response)
+            summary = result.get("summary", {})
             labeled_messages = []
             for msg_data in result.get("messages", []):
                 labeled_messages.append(
@@ -62,12 +80,17 @@ class LabelingTraitVectorService:
                 )
         except Exception as e:
             logger.error(f"LLM 응답 파싱 실패: {e}")
+            LLM_PARSE_FAILURES.inc("label_trait_vector")
             # fallback: 룰 기반 라벨링
+            LLM_FALLBACKS.inc("label_trait_vector")
             labeled_messages = []
             for msg in request.messages:
-                labels: Dict[str, Any] = {}  # 룰 기반 라벨링 로직 구현 필요
                 labeled_messages.append(
-                    LabeledMessage(sender=msg.sender, text=msg.text, labels=labels)
+                    LabeledMessage(
+                        sender=msg.sender,
+                        text=msg.text,
+                        labels=label_message(msg.text, keywords),
+                    )
                 )
 
         # 2. 특성 벡터 계산
@@ -75,10 +98,18 @@ class LabelingTraitVectorService:
             request.user_id, labeled_messages
         )
 
+        # 3. 사용자별 성향 벡터 저장 (분석/매칭에서 행렬로 바로 사용)
+        if request.user_id:
+            get_trait_store().put(trait_vector)
+            update_similarity_indexes(
+                [request.user_id], trait_vector_to_array(trait_vector)[None, :]
+            )
+
         return LabelingTraitVectorResponse(
-            user_id=request.user_id,
             labeled_messages=labeled_messages,
             trait_vector=trait_vector,
+            summary=summary if isinstance(summary, dict) else {"text": summary},
+            keyword_version=keywords.version,
         )
 
     @staticmethod
@@ -92,68 +123,88 @@ class LabelingTraitVectorService:
         if n == 0:
             raise ValueError("No messages to analyze.")
 
-        # 카운터 초기화
-        emotion_counter: Counter[str] = Counter()
-        assertion_counter: Counter[str] = Counter()
-        attitude_counter: Counter[str] = Counter()
-        comm_counter: Counter[str] = Counter()
-        attach_counter: Counter[str] = Counter()
-        reconnection_attempts = 0
-
-        for msg in labeled_messages:
-            labels = msg.labels
-            # 감정 표현
-            for k in [
-                "affection",
-                "gratitude",
-                "frustration",
-                "anxiety",
-                "jealousy",
-                "loneliness",
-                "sadness",
-                "resentment",
-            ]:
-                if k in labels.get("emotion_expression", []):
-                    emotion_counter[k] += 1
+        # 라벨 값("애정 표현")과 이름("affection") 모두 비트마스크로 정규화 후 집계
+        counts = count_labels(labels_to_mask(msg.labels) for msg in labeled_messages)
+        return LabelingTraitVectorService.compute_trait_vector_from_counts(
+            user_id, n, counts
+        )
 
-            # 자기 주장/관계 태도
-            if "request" in labels.get("self_assertion", []):
-                assertion_counter["request"] += 1
-            if "complaint" in labels.get("self_assertion", []):
-                assertion_counter["complaint"] += 1
-            if "expectation" in labels.get("self_assertion", []):
-                assertion_counter["expectation"] += 1
-            if "boundaries" in labels.get("self_assertion", []):
-                assertion_counter["boundaries"] += 1
-            if "reproach" in labels.get("self_assertion", []):
-                assertion_counter["reproach"] += 1
-            if "accommodating" in labels.get("relationship_attitude", []):
-                attitude_counter["accommodation"] += 1
-            if "withdrawing" in labels.get("relationship_attitude", []):
-                attitude_counter["withdrawal"] += 1
-            if "confronting" in labels.get("relationship_attitude", []):
-                attitude_counter["confrontation"] += 1
-            if "reconnecting" in labels.get("relationship_attitude", []):
-                reconnection_attempts += 1
+    @staticmethod
+    def compute_trait_vector_from_counts(
+        user_id: Optional[str], n: int, counts: List[int]
+    ) -> TraitVector:
+        """
+        라벨 ID별 등장 횟수(count_labels 결과)로 특성 벡터를 계산
+        """
+        if n == 0:
+            raise ValueError("No messages to analyze.")
 
-            # 의사소통 스타일
-            if "explanation" in labels.get("communication_style", []):
-                comm_counter["explanation"] += 1
-            if "question" in labels.get("communication_style", []):
-                comm_counter["question"] += 1
-            if "silence" in labels.get("communication_style", []):
-                comm_counter["silence"] += 1
-            if "meta_conversation" in labels.get("communication_style", []):
-                comm_counter["meta_conversation"] += 1
-            if "passive_aggressive" in labels.get("communication_style", []):
-                comm_counter["passive_aggressive"] += 1
-            if "repetition" in labels.get("communication_style", []):
-                comm_counter["repetition"] += 1
+        def count(category: str, label: Enum) -> int:
+            return counts[label_id(category, label)]
 
-            # 애착 유형
-            for k in ["secure", "anxious", "avoidant", "fearful", "ambivalent"]:
-                if k in labels.get("attachment_pattern", []):
-                    attach_counter[k] += 1
+        # 카운터 초기화 (등장하지 않은 라벨은 제외)
+        emotion_counter: Counter[str] = +Counter(
+            {
+                k: count("emotion_expression", EmotionExpression[k])
+                for k in [
+                    "affection",
+                    "gratitude",
+                    "frustration",
+                    "anxiety",
+                    "jealousy",
+                    "loneliness",
+                    "sadness",
+                    "resentment",
+                ]
+            }
+        )
+        assertion_counter: Counter[str] = +Counter(
+            {
+                k: count("self_assertion", SelfAssertion[k])
+                for k in [
+                    "request",
+                    "complaint",
+                    "expectation",
+                    "boundaries",
+                    "reproach",
+                ]
+            }
+        )
+        attitude_counter: Counter[str] = +Counter(
+            {
+                "accommodation": count(
+                    "relationship_attitude", RelationshipAttitude.accommodating
+                ),
+                "withdrawal": count(
+                    "relationship_attitude", RelationshipAttitude.withdrawing
+                ),
+                "confrontation": count(
+                    "relationship_attitude", RelationshipAttitude.confronting
+                ),
+            }
+        )
+        reconnection_attempts = count(
+            "relationship_attitude", RelationshipAttitude.reconnecting
+        )
+        comm_counter: Counter[str] = +Counter(
+            {
+                k: count("communication_style", CommunicationStyle[k])
+                for k in [
+                    "explanation",
+                    "question",
+                    "silence",
+                    "meta_conversation",
+                    "passive_aggressive",
+                    "repetition",
+                ]
+            }
+        )
+        attach_counter: Counter[str] = +Counter(
+            {
+                k: count("attachment_pattern", AttachmentPattern[k])
+                for k in ["secure", "anxious", "avoidant", "fearful", "ambivalent"]
+            }
+        )
 
         def ratio(cnt: int) -> float:
             return cnt / n if n else 0.0
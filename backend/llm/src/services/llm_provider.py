@@ -1,37 +1,183 @@
-from typing import Optional
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
 
 from config import settings
-from providers.claude_client import ask_claude
+from core.admission import admission_controller
+from core.metrics import LLM_CALL_DURATION, LLM_CALLS_IN_FLIGHT, LLM_DEADLINE_SKIPPED
+from core.request_context import current_request, mark_degraded, remaining_time
+from core.tracing import Span, tracer
+from providers.claude_client import ask_claude, ask_claude_history
+from providers.fake_client import ask_fake
 from providers.openai_client import ask_openai, ask_openai_history
+from services.hedging import hedger, llm_latency
+from services.model_router import PROVIDERS, ModelTarget, model_router
+
+
+class _Call:
+    """
+    LLM 호출 하나의 span과 결과(outcome) 기록
+    """
+
+    __slots__ = ("span", "outcome")
+
+    def __init__(self, span: Span) -> None:
+        self.span = span
+        self.outcome = "ok"
+
+    def result(self, response: str) -> str:
+        # provider는 예외 대신 "❌ ..." 문자열을 반환하므로 오류로 표시
+        if response.startswith("❌"):
+            self.span.set_error(response)
+            self.outcome = "error"
+        return response
+
+
+@contextmanager
+def _observe(name: str, target: ModelTarget, call_site: str) -> Iterator[_Call]:
+    """
+    트레이싱 span + 호출 시간/진행 중 호출 수 메트릭
+    """
+    provider = target.provider
+    LLM_CALLS_IN_FLIGHT.inc(provider)
+    started = time.perf_counter()
+    call: Optional[_Call] = None
+    try:
+        with tracer.span(
+            name,
+            provider=provider,
+            model=target.model,
+            route=target.route,
+            tier=target.tier,
+            call_site=call_site,
+        ) as span:
+            call = _Call(span)
+            yield call
+    except BaseException:
+        if call is not None:
+            call.outcome = "error"
+        raise
+    finally:
+        LLM_CALLS_IN_FLIGHT.dec(provider)
+        duration = time.perf_counter() - started
+        if call is not None and call.outcome == "ok":
+            # LLM이 느려지면 수락 제어가 낮은 우선순위 클래스의 동시 처리 수를 줄임
+            admission_controller.observe_llm_latency(duration)
+        LLM_CALL_DURATION.observe(
+            duration,
+            provider,
+            target.model,
+            call_site,
+            call.outcome if call is not None else "error",
+        )
+
+
+# 예상 호출 시간(최근 호출 시간 중앙값)을 믿기 위한 최소 기록 수
+_MIN_LATENCY_SAMPLES = 5
+
+
+def skip_for_deadline(target: ModelTarget, call_site: str) -> Optional[str]:
+    """
+    요청 마감 시간 안에 끝낼 수 없는 호출이면 호출하지 않고 오류 응답을 반환
+
+    (provider 오류와 같은 "❌" 응답이므로 서비스의 기존 fallback 처리를 그대로 탐)
+    """
+    remaining = remaining_time()
+    if remaining is None:
+        return None
+    expected = llm_latency.percentile(
+        (target.provider, target.model), 0.5, _MIN_LATENCY_SAMPLES
+    )
+    if remaining >= max(expected or 0.0, settings.LLM_MIN_CALL_SECONDS):
+        return None
+    LLM_DEADLINE_SKIPPED.inc(current_request().resolve_route(), call_site)
+    mark_degraded(call_site)
+    return (
+        f"❌ 마감 시간 초과: 남은 {max(remaining, 0.0):.1f}초 안에 끝낼 수 없어 건너뜀"
+    )
+
+
+def _ask_target(prompt: str, target: ModelTarget) -> str:
+    if target.provider == "openai":
+        return ask_openai(prompt, target)
+    if target.provider == "fake":
+        return ask_fake(prompt, target.model)
+    return ask_claude(prompt, target)
+
+
+def _ask_history_target(messages, target: ModelTarget) -> str:
+    if target.provider == "openai":
+        return ask_openai_history(messages, target)
+    if target.provider == "claude":
+        return ask_claude_history(messages, target)
+    # 가짜 LLM은 마지막 메시지로만 응답을 정함
+    last = messages[-1]
+    content = last.content if hasattr(last, "content") else last["content"]
+    return ask_fake(content, target.model)
+
+
+def _dispatch(
+    call: Callable[[ModelTarget], str], target: ModelTarget, call_site: str
+) -> str:
+    # 헤징 모드면 느린 호출에 헤지 호출을 보냄 (services.hedging)
+    if hedger.enabled:
+        return hedger.run(call, target, call_site)
+    return hedger.timed(call, target)
 
 
 class LLMProvider:
-    def ask(self, prompt: str, model: Optional[str] = None) -> str:
+    def ask(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        call_site: Optional[str] = None,
+        route: str = "default",
+    ) -> str:
         """
         프롬프트를 LLM(OpenAI/Claude 등)에 전달하고 응답을 반환
+
+        model은 provider("openai"/"claude"), 실제 모델 이름과 생성 파라미터는 route의
+        라우팅 설정(services.model_router)으로 정함.
+        call_site를 주지 않으면 호출한 함수 이름(예: _analyze_love_language)을 사용
         """
-        if model is None:
-            model = settings.DEFAULT_MODEL
-        if model == "openai":
-            return ask_openai(prompt)
-        elif model == "claude":
-            return ask_claude(prompt)
-        else:
+        if model is not None and model not in PROVIDERS:
             return "지원하지 않는 모델입니다."
+        target = model_router.resolve(route, model)
+        if target.provider not in PROVIDERS:
+            return "지원하지 않는 모델입니다."
+        call_site = call_site or sys._getframe(1).f_code.co_name
+        skipped = skip_for_deadline(target, call_site)
+        if skipped is not None:
+            return skipped
+        with _observe("llm.ask", target, call_site) as call:
+            return call.result(
+                _dispatch(lambda t: _ask_target(prompt, t), target, call_site)
+            )
 
-    def ask_history(self, messages, model: Optional[str] = None) -> str:
+    def ask_history(
+        self,
+        messages,
+        model: Optional[str] = None,
+        call_site: Optional[str] = None,
+        route: str = "default",
+    ) -> str:
         """
         메시지 히스토리를 LLM에 전달 (OpenAI/Claude 등)
         """
-        if model is None:
-            model = settings.DEFAULT_MODEL
-        if model == "openai":
-            return ask_openai_history(messages)
-        elif model == "claude":
-            # Claude가 messages 지원 시 구현, 아니면 마지막 user 메시지만 전달
-            return ask_claude(messages[-1]["content"])
-        else:
+        if model is not None and model not in PROVIDERS:
+            return "지원하지 않는 모델입니다."
+        target = model_router.resolve(route, model)
+        if target.provider not in PROVIDERS:
             return "지원하지 않는 모델입니다."
+        call_site = call_site or sys._getframe(1).f_code.co_name
+        skipped = skip_for_deadline(target, call_site)
+        if skipped is not None:
+            return skipped
+        with _observe("llm.ask_history", target, call_site) as call:
+            return call.result(
+                _dispatch(lambda t: _ask_history_target(messages, t), target, call_site)
+            )
 
 
 # 싱글턴 인스턴스
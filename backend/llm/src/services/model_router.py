@@ -0,0 +1,232 @@
+"""
+LLM 모델 라우팅 테이블
+
+호출 위치(route: labeling, sub_analysis, comprehensive_analysis, chat, coach 등)마다
+tier(fast/deep 등)와 생성 파라미터를 정하고, tier × provider로 실제 모델 이름을 고름.
+
+- provider: 요청의 model 값("openai"/"claude") > route의 provider > DEFAULT_MODEL
+- tier: X-Model-Tier 헤더 > route의 tier
+- MODEL_ROUTES_PATH JSON 파일이 있으면 기본 테이블 대신 사용하고, 파일이 바뀌면(mtime) 실행 중에
+  교체함. 새 파일이 잘못되었으면 기존 테이블을 유지함
+
+    {
+      "tiers": {"fast": {"openai": "gpt-4o-mini", "claude": "..."}, "deep": {...}},
+      "routes": {"labeling": {"tier": "fast", "temperature": 0}, ...}
+    }
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from config import settings
+from core.request_context import current_request
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("openai", "claude", "fake")
+
+DEFAULT_ROUTES: Dict[str, Any] = {
+    "tiers": {
+        "fast": {
+            "openai": "gpt-4o-mini",
+            "claude": "claude-3-haiku-20240307",
+            "fake": "fake-llm",
+        },
+        "deep": {
+            "openai": "gpt-4o",
+            "claude": "claude-3-opus-20240229",
+            "fake": "fake-llm",
+        },
+    },
+    "routes": {
+        "default": {"tier": "fast"},
+        # 정해진 JSON 형식의 라벨링: 빠르고 싼 모델, 결정적 출력
+        "labeling": {"tier": "fast", "temperature": 0.0, "max_tokens": 2048},
+        # 궁합/소통/사랑의 언어/갈등 등 개별 분석과 성향 분석
+        "sub_analysis": {"tier": "fast", "temperature": 0.3},
+        "personality": {"tier": "fast", "temperature": 0.3},
+        # 개별 분석 결과를 종합하는 최종 분석
+        "comprehensive_analysis": {
+            "tier": "deep",
+            "temperature": 0.5,
+            "max_tokens": 2048,
+        },
+        "analysis_graph": {"tier": "fast", "temperature": 0.7},
+        "chat": {"tier": "fast", "temperature": 0.7},
+        "coach": {"tier": "deep", "temperature": 0.7},
+        "feedback": {"tier": "fast", "temperature": 0.7},
+        # 대화 메모리의 오래된 대화 요약 (services.conversation_memory)
+        "summary": {"tier": "fast", "temperature": 0.3, "max_tokens": 512},
+    },
+}
+
+
+@dataclass(frozen=True)
+class ModelTarget:
+    """
+    LLM 호출 하나에 쓸 provider/모델/생성 파라미터
+    """
+
+    provider: str
+    model: str
+    temperature: float = 0.7
+    max_tokens: int = 1024
+    route: str = "default"
+    tier: str = "fast"
+
+
+class RoutingTable:
+    """
+    한 버전의 라우팅 테이블 (생성 후 변경하지 않음)
+    """
+
+    __slots__ = ("tiers", "routes", "source")
+
+    def __init__(
+        self,
+        tiers: Dict[str, Dict[str, str]],
+        routes: Dict[str, Dict[str, Any]],
+        source: str = "builtin",
+    ) -> None:
+        self.tiers = tiers
+        self.routes = routes
+        self.source = source
+
+    @classmethod
+    def from_json(cls, data: Mapping, source: str = "builtin") -> "RoutingTable":
+        tiers = data.get("tiers") or {}
+        routes = data.get("routes") or {}
+        if not tiers:
+            raise ValueError("라우팅 테이블에 tiers가 없습니다.")
+        for tier, models in tiers.items():
+            unknown = set(models) - set(PROVIDERS)
+            if unknown:
+                raise ValueError(f"알 수 없는 provider: {tier}.{sorted(unknown)}")
+        if "default" not in routes:
+            raise ValueError("라우팅 테이블에 default route가 없습니다.")
+        for name, route in routes.items():
+            if route.get("tier", "fast") not in tiers:
+                raise ValueError(f"알 수 없는 tier: {name}.{route.get('tier')}")
+            if route.get("provider") not in (None, *PROVIDERS):
+                raise ValueError(f"알 수 없는 provider: {name}.{route['provider']}")
+            float(route.get("temperature", 0.7))
+            int(route.get("max_tokens", 1024))
+        return cls(
+            {tier: dict(models) for tier, models in tiers.items()},
+            {name: dict(route) for name, route in routes.items()},
+            source,
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "tiers": copy.deepcopy(self.tiers),
+            "routes": copy.deepcopy(self.routes),
+        }
+
+    def resolve(
+        self,
+        route: str,
+        provider: Optional[str] = None,
+        tier: Optional[str] = None,
+    ) -> ModelTarget:
+        name = route if route in self.routes else "default"
+        config = self.routes[name]
+        if tier not in self.tiers:
+            tier = config.get("tier", "fast")
+        provider = provider or config.get("provider") or settings.DEFAULT_MODEL
+        model = self.tiers[tier].get(provider)
+        if model is None:
+            # 이 tier에 provider 모델이 없으면 route 기본 tier 모델 사용
+            tier = config.get("tier", "fast")
+            model = self.tiers[tier].get(provider, "unknown")
+        return ModelTarget(
+            provider=provider,
+            model=model,
+            temperature=float(config.get("temperature", 0.7)),
+            max_tokens=int(config.get("max_tokens", 1024)),
+            route=name,
+            tier=tier,
+        )
+
+
+class ModelRouter:
+    """
+    현재 라우팅 테이블 관리 (KeywordRegistry와 같은 방식으로 파일 변경 시 참조만 교체)
+    """
+
+    def __init__(
+        self,
+        default: RoutingTable,
+        path: Optional[str] = None,
+        check_interval: float = 5.0,
+    ) -> None:
+        self.path = path
+        self.check_interval = check_interval
+        self._active = default
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        if path:
+            self.reload()
+
+    @property
+    def active(self) -> RoutingTable:
+        if self.path and time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self._active
+
+    def reload(self, force: bool = False) -> RoutingTable:
+        """
+        파일이 바뀌었으면 새 테이블로 교체하고 현재 테이블을 반환
+        """
+        if not self.path:
+            return self._active
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as e:
+                logger.error(f"모델 라우팅 파일을 읽을 수 없습니다: {e}")
+                return self._active
+            if not force and mtime == self._mtime:
+                return self._active
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    table = RoutingTable.from_json(json.load(f), source=self.path)
+            except (OSError, ValueError, TypeError, AttributeError) as e:
+                logger.error(f"모델 라우팅 테이블 로드 실패, 기존 테이블 유지: {e}")
+                return self._active
+            self._mtime = mtime
+            self._active = table
+            logger.info(f"모델 라우팅 테이블 교체: {self.path}")
+            return table
+
+    def swap(self, table: RoutingTable) -> None:
+        """
+        테이블을 직접 교체 (테스트/관리용)
+        """
+        with self._lock:
+            self._active = table
+
+    def resolve(self, route: str, provider: Optional[str] = None) -> ModelTarget:
+        """
+        route의 모델 선택 (요청에 X-Model-Tier 헤더가 있으면 그 tier를 사용)
+        """
+        ctx = current_request()
+        tier = ctx.model_tier if ctx is not None else None
+        return self.active.resolve(route, provider, tier)
+
+
+# 싱글턴 인스턴스
+model_router = ModelRouter(
+    RoutingTable.from_json(DEFAULT_ROUTES),
+    path=settings.MODEL_ROUTES_PATH or None,
+    check_interval=settings.MODEL_ROUTES_CHECK_INTERVAL,
+)
@@ -2,6 +2,8 @@ import json
 import logging
 from typing import Any, Dict, Optional
 
+from core.log import log_payload
+from core.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
 from services.llm_provider import llm_provider  # services의 llm_provider 사용
 
 logger = logging.getLogger(__name__)
@@ -15,15 +17,16 @@ class PersonalityService:
         try:
             # 프롬프트 개선: 명확한 지시사항 추가
             enhanced_prompt = self._enhance_prompt(prompt)
-            logger.info(f"개선된 프롬프트: {enhanced_prompt}")
+            log_payload(logger, "개선된 프롬프트", enhanced_prompt)
 
-            response = llm_provider.ask(enhanced_prompt, model)
-            logger.info(f"LLM 원본 응답: {response}")
+            response = llm_provider.ask(enhanced_prompt, model, route="personality")
+            log_payload(logger, "LLM 원본 응답", response)
 
             # 응답 검증: 프롬프트와 유사한지 확인
             if self._is_response_similar_to_prompt(prompt, response):
                 logger.warning("LLM 응답이 프롬프트와 유사함 - 프롬프트 개선 필요")
                 # fallback 응답 반환
+                LLM_FALLBACKS.inc("analyze")
                 return self._generate_fallback_response(prompt)
 
             return response
@@ -106,8 +109,8 @@ class PersonalityService:
         [중요] 반드시 유효한 JSON 형식으로만 응답하고, 프롬프트를 반복하지 마세요."""
 
         try:
-            response = llm_provider.ask(prompt)
-            logger.info(f"대화 분석 응답: {response}")
+            response = llm_provider.ask(prompt, route="personality")
+            log_payload(logger, "대화 분석 응답", response)
 
             # 응답 검증
             if self._is_response_similar_to_prompt(prompt, response):
@@ -121,7 +124,8 @@ class PersonalityService:
             try:
                 return json.loads(response)
             except json.JSONDecodeError:
-                logger.error(f"JSON 파싱 실패: {response}")
+                LLM_PARSE_FAILURES.inc("analyze_conversation")
+                log_payload(logger, "JSON 파싱 실패", response, logging.ERROR)
                 return {
                     "personalityTraits": {"trait": "분석 실패", "score": 0.0},
                     "feedback": "응답을 파싱할 수 없습니다.",
@@ -153,8 +157,8 @@ class PersonalityService:
         [중요] 반드시 유효한 JSON 형식으로만 응답하고, 프롬프트를 반복하지 마세요."""
 
         try:
-            response = llm_provider.ask(prompt)
-            logger.info(f"MBTI 분석 응답: {response}")
+            response = llm_provider.ask(prompt, route="personality")
+            log_payload(logger, "MBTI 분석 응답", response)
 
             # 응답 검증
             if self._is_response_similar_to_prompt(prompt, response):
@@ -170,7 +174,8 @@ class PersonalityService:
                 result = json.loads(response)
                 return result
             except json.JSONDecodeError:
-                logger.error(f"JSON 파싱 실패: {response}")
+                LLM_PARSE_FAILURES.inc("analyze_mbti")
+                log_payload(logger, "JSON 파싱 실패", response, logging.ERROR)
                 return {
                     "mbti": "분석 실패",
                     "description": "응답을 파싱할 수 없습니다.",
@@ -199,7 +204,7 @@ class PersonalityService:
             "feedback": "상대방의 입장도 고려해보세요."
         }}"""
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="personality")
         return json.loads(response)
 
     def analyze_love_language(self, request) -> Dict[str, Any]:
@@ -217,7 +222,7 @@ class PersonalityService:
             "match": {{"best": "말", "worst": "선물"}}
         }}"""
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="personality")
         return json.loads(response)
 
     def analyze_behavior(self, request) -> Dict[str, Any]:
@@ -235,7 +240,7 @@ class PersonalityService:
             "recommendation": "규칙적인 생활을 시도해보세요."
         }}"""
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="personality")
         return json.loads(response)
 
     def analyze_emotion(self, request) -> Dict[str, Any]:
@@ -253,7 +258,7 @@ class PersonalityService:
             "feedback": "충분한 휴식을 취해보세요."
         }}"""
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="personality")
         return json.loads(response)
 
     def chatbot_detect(self, request) -> Dict[str, Any]:
@@ -270,7 +275,7 @@ class PersonalityService:
             "feedback": "긍정적인 대화를 유지해보세요."
         }}"""
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="personality")
         return json.loads(response)
 
     def generate_feedback(self, request) -> Dict[str, Any]:
@@ -288,7 +293,7 @@ class PersonalityService:
             "recommendation": "함께 산책을 해보세요."
         }}"""
 
-        response = llm_provider.ask(prompt)
+        response = llm_provider.ask(prompt, route="personality")
         return json.loads(response)
 
 
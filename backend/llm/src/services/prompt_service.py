@@ -3,7 +3,7 @@ from services.llm_provider import llm_provider
 
 class PromptService:
     def prompt(self, prompt: str, model: str) -> str:
-        return llm_provider.ask(prompt, model)
+        return llm_provider.ask(prompt, model, route="chat")
 
 
 prompt_service = PromptService()
@@ -0,0 +1,372 @@
+import logging
+import threading
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.trait_store import TRAIT_COLUMNS, TraitStore, get_trait_store
+
+logger = logging.getLogger(__name__)
+
+Metric = Literal["cosine", "euclidean"]
+
+# 유사도 계산에 쓰는 수치 특성 (메시지 수, 범주형 코드 열은 제외)
+SIMILARITY_FIELDS: Tuple[str, ...] = tuple(
+    name
+    for name in TRAIT_COLUMNS
+    if name.endswith(("_level", "_tendency", "_ratio", "_rate", "_score"))
+)
+_SIMILARITY_COLUMNS = np.array([TRAIT_COLUMNS[name] for name in SIMILARITY_FIELDS])
+
+
+class TraitSimilarityIndex:
+    """
+    성향 벡터 최근접 이웃 인덱스
+
+    - 특성별 표준화(z-score) 후 cosine/euclidean 거리로 비교
+    - brute_force_limit 이하는 전체 행렬을 NumPy로 한 번에 계산
+    - 그보다 크면 k-means 중심으로 나눈 역색인(IVF)에서 n_probe개 파티션만 탐색
+    - add()로 점진 추가/갱신 (표준화 통계와 중심은 build 시점 값을 유지)
+    """
+
+    def __init__(
+        self,
+        metric: Metric = "cosine",
+        brute_force_limit: int = 50_000,
+        n_probe: int = 8,
+        seed: int = 0,
+    ) -> None:
+        if metric not in ("cosine", "euclidean"):
+            raise ValueError(f"지원하지 않는 거리 함수입니다: {metric}")
+        self.metric = metric
+        self.brute_force_limit = brute_force_limit
+        self.n_probe = n_probe
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+        dim = len(SIMILARITY_FIELDS)
+        self._mean = np.zeros(dim, dtype=np.float32)
+        self._scale = np.ones(dim, dtype=np.float32)
+        self._data = np.empty((0, dim), dtype=np.float32)
+        self._sq_norms = np.empty(0, dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+        # IVF 상태 (brute force 모드에서는 None)
+        self._centroids: Optional[np.ndarray] = None
+        self._row_list = np.empty(0, dtype=np.int32)
+        self._lists: List[np.ndarray] = []
+        self._pending: List[List[int]] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._rows
+
+    @property
+    def partitioned(self) -> bool:
+        return self._centroids is not None
+
+    # ---- 구축/추가 ----------------------------------------------------------
+
+    def build(self, user_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        전체 재구축 (TRAIT_FIELDS 순서의 원본 성향 벡터 행렬 입력)
+        """
+        features = _select_features(vectors)
+        with self._lock:
+            if len(features):
+                self._mean = features.mean(axis=0)
+                std = features.std(axis=0)
+                self._scale = np.where(std > 1e-6, std, 1.0).astype(np.float32)
+            self._size = 0
+            self._ids = []
+            self._rows = {}
+            self._data = np.empty((0, len(SIMILARITY_FIELDS)), dtype=np.float32)
+            self._sq_norms = np.empty(0, dtype=np.float32)
+            self._centroids = None
+            self._upsert(list(user_ids), self._normalize(features))
+            if self._size > self.brute_force_limit:
+                self._train_partitions()
+
+    def add(self, user_ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        점진 추가 (이미 있는 userId는 갱신)
+        """
+        features = self._normalize(_select_features(vectors))
+        with self._lock:
+            self._upsert(list(user_ids), features)
+            if not self.partitioned and self._size > self.brute_force_limit:
+                self._train_partitions()
+
+    # ---- 조회 -------------------------------------------------------------
+
+    def query(
+        self, vector: np.ndarray, k: int = 10, exclude: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        ids, distances = self.query_batch(
+            np.asarray(vector)[None, :], k, [exclude] if exclude else None
+        )
+        return list(zip(ids[0], distances[0].tolist()))
+
+    def query_batch(
+        self,
+        vectors: np.ndarray,
+        k: int = 10,
+        exclude: Optional[Sequence[Optional[str]]] = None,
+    ) -> Tuple[List[List[str]], List[np.ndarray]]:
+        """
+        여러 성향 벡터의 top-k 이웃 (userId 목록, 거리 배열)을 한 번에 계산
+        """
+        queries = self._normalize(_select_features(vectors))
+        excluded_rows = [
+            self._rows.get(uid, -1) if uid else -1 for uid in (exclude or [])
+        ]
+        excluded_rows += [-1] * (len(queries) - len(excluded_rows))
+        if self.partitioned:
+            results = [
+                self._query_partitioned(q, k, row)
+                for q, row in zip(queries, excluded_rows)
+            ]
+        else:
+            results = self._query_brute_force(queries, k, excluded_rows)
+        ids = [[self._ids[r] for r in rows] for rows, _ in results]
+        return ids, [dist for _, dist in results]
+
+    def query_user(
+        self, user_id: str, k: int = 10
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        인덱스에 있는 사용자와 가장 비슷한 사용자 k명 (본인 제외)
+        """
+        with self._lock:
+            row = self._rows.get(user_id)
+            if row is None:
+                return None
+            query = self._data[row].copy()
+        if self.partitioned:
+            rows, dist = self._query_partitioned(query, k, row)
+        else:
+            rows, dist = self._query_brute_force(query[None, :], k, [row])[0]
+        return [(self._ids[r], float(d)) for r, d in zip(rows, dist)]
+
+    # ---- 내부 -------------------------------------------------------------
+
+    def _normalize(self, features: np.ndarray) -> np.ndarray:
+        z = (features - self._mean) / self._scale
+        if self.metric == "cosine":
+            norms = np.linalg.norm(z, axis=1, keepdims=True)
+            z = z / np.where(norms > 0, norms, 1.0)
+        return z.astype(np.float32, copy=False)
+
+    def _distances(
+        self, queries: np.ndarray, data: np.ndarray, sq_norms: np.ndarray
+    ) -> np.ndarray:
+        dots = queries @ data.T
+        if self.metric == "cosine":
+            return 1.0 - dots
+        q_sq = np.einsum("ij,ij->i", queries, queries)[:, None]
+        return np.sqrt(np.maximum(q_sq + sq_norms[None, :] - 2.0 * dots, 0.0))
+
+    def _query_brute_force(
+        self, queries: np.ndarray, k: int, excluded_rows: List[int]
+    ) -> List[Tuple[List[int], np.ndarray]]:
+        # 추가 중에는 _size가 버퍼보다 먼저 늘어나므로 크기와 버퍼를 함께 잡아 둠
+        with self._lock:
+            size = self._size
+            data, sq_norms = self._data[:size], self._sq_norms[:size]
+        if size == 0:
+            return [([], np.empty(0, dtype=np.float32)) for _ in queries]
+        dist = self._distances(queries, data, sq_norms)
+        for i, row in enumerate(excluded_rows):
+            if 0 <= row < size:
+                dist[i, row] = np.inf
+        return [_top_k(np.arange(size), d, k) for d in dist]
+
+    def _query_partitioned(
+        self, query: np.ndarray, k: int, excluded_row: int
+    ) -> Tuple[List[int], np.ndarray]:
+        assert self._centroids is not None
+        centroid_dist = ((self._centroids - query) ** 2).sum(axis=1)
+        n_probe = min(self.n_probe, len(self._centroids))
+        probe = np.argpartition(centroid_dist, n_probe - 1)[:n_probe]
+        candidates = []
+        for list_id in probe:
+            rows = self._list_rows(int(list_id))
+            # 조회 도중 갱신으로 다른 파티션에 옮겨간 행은 제외
+            candidates.append(rows[self._row_list[rows] == list_id])
+        rows = np.concatenate(candidates)
+        rows = rows[rows != excluded_row]
+        if len(rows) == 0:
+            return [], np.empty(0, dtype=np.float32)
+        dist = self._distances(query[None, :], self._data[rows], self._sq_norms[rows])
+        return _top_k(rows, dist[0], k)
+
+    def _list_rows(self, list_id: int) -> np.ndarray:
+        if self._pending[list_id]:
+            with self._lock:
+                pending = self._pending[list_id]
+                if pending:
+                    merged = np.concatenate([self._lists[list_id], pending])
+                    self._lists[list_id] = merged.astype(np.int64)
+                    self._pending[list_id] = []
+        return self._lists[list_id]
+
+    def _upsert(self, user_ids: List[str], features: np.ndarray) -> None:
+        rows = np.empty(len(user_ids), dtype=np.int64)
+        for i, uid in enumerate(user_ids):
+            row = self._rows.get(uid)
+            if row is None:
+                row = self._size
+                self._rows[uid] = row
+                self._ids.append(uid)
+                self._size += 1
+            rows[i] = row
+        self._reserve(self._size)
+        self._data[rows] = features
+        self._sq_norms[rows] = np.einsum("ij,ij->i", features, features)
+        if self._centroids is not None:
+            assignments = self._assign(features)
+            for row, list_id in zip(rows.tolist(), assignments.tolist()):
+                # 새 행이거나 배정 파티션이 바뀐 행만 옮김 (같은 파티션이면 그대로)
+                old_list = int(self._row_list[row])
+                if old_list == list_id:
+                    continue
+                if old_list >= 0:
+                    self._remove_from_list(old_list, row)
+                self._row_list[row] = list_id
+                self._pending[list_id].append(row)
+
+    def _remove_from_list(self, list_id: int, row: int) -> None:
+        pending = self._pending[list_id]
+        if row in pending:
+            pending.remove(row)
+            return
+        rows = self._lists[list_id]
+        self._lists[list_id] = rows[rows != row]
+
+    def _reserve(self, required: int) -> None:
+        capacity = len(self._data)
+        if required <= capacity:
+            return
+        capacity = max(required, capacity * 2, 1024)
+        data = np.zeros((capacity, self._data.shape[1]), dtype=np.float32)
+        data[: len(self._data)] = self._data
+        sq_norms = np.zeros(capacity, dtype=np.float32)
+        sq_norms[: len(self._sq_norms)] = self._sq_norms
+        row_list = np.full(capacity, -1, dtype=np.int32)
+        row_list[: len(self._row_list)] = self._row_list
+        self._data, self._sq_norms, self._row_list = data, sq_norms, row_list
+
+    def _assign(self, features: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        assert self._centroids is not None
+        c_sq = (self._centroids**2).sum(axis=1)
+        out = np.empty(len(features), dtype=np.int32)
+        for start in range(0, len(features), chunk):
+            block = features[start : start + chunk]
+            out[start : start + chunk] = np.argmin(
+                c_sq[None, :] - 2.0 * block @ self._centroids.T, axis=1
+            )
+        return out
+
+    def _train_partitions(self, iterations: int = 10) -> None:
+        """
+        k-means(샘플 기반)로 sqrt(n)개 파티션 중심을 학습하고 전체 행을 배정
+        """
+        n = self._size
+        n_lists = max(1, int(np.sqrt(n)))
+        sample_size = min(n, n_lists * 40)
+        sample = self._data[self._rng.choice(n, sample_size, replace=False)]
+        self._centroids = sample[
+            self._rng.choice(sample_size, n_lists, replace=False)
+        ].copy()
+        for _ in range(iterations):
+            labels = self._assign(sample)
+            sums = np.zeros_like(self._centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)[:, None]
+            nonempty = counts[:, 0] > 0
+            self._centroids[nonempty] = sums[nonempty] / counts[nonempty]
+
+        assignments = self._assign(self._data[:n])
+        self._row_list[:n] = assignments
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(n_lists + 1))
+        self._lists = [order[bounds[i] : bounds[i + 1]] for i in range(n_lists)]
+        self._pending = [[] for _ in range(n_lists)]
+        logger.info(f"성향 벡터 인덱스 파티션 구성: {n}행, {n_lists}개 파티션")
+
+
+def _select_features(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    return vectors[:, _SIMILARITY_COLUMNS]
+
+
+def _top_k(rows: np.ndarray, dist: np.ndarray, k: int) -> Tuple[List[int], np.ndarray]:
+    valid = np.isfinite(dist)
+    rows, dist = rows[valid], dist[valid]
+    if len(dist) > k:
+        part = np.argpartition(dist, k - 1)[:k]
+        rows, dist = rows[part], dist[part]
+    order = np.argsort(dist, kind="stable")
+    return rows[order].tolist(), dist[order]
+
+
+_indexes: Dict[str, TraitSimilarityIndex] = {}
+# 거리 함수별 인덱스에 반영한 저장소 행 수
+_synced_rows: Dict[str, int] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_similarity_index(
+    metric: Metric = "cosine", store: Optional[TraitStore] = None
+) -> TraitSimilarityIndex:
+    """
+    성향 벡터 저장소 전체로 구축한 거리 함수별 인덱스 (처음 사용할 때 구축)
+    """
+    index = _indexes.get(metric)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(metric)
+            if index is None:
+                if store is None:
+                    store = get_trait_store()
+                matrix = store.matrix
+                index = TraitSimilarityIndex(metric)
+                index.build(store.user_ids[: len(matrix)], matrix)
+                _indexes[metric] = index
+                _synced_rows[metric] = len(matrix)
+    return index
+
+
+def refresh_similarity_index(
+    metric: Metric = "cosine", store: Optional[TraitStore] = None
+) -> TraitSimilarityIndex:
+    """
+    인덱스 구축 이후 저장소에 추가된 행을 반영
+
+    인덱스는 워커 프로세스마다 따로 있으므로 다른 워커가 저장한 사용자는 update_similarity_indexes로
+    들어오지 않음. 조회에서 사용자를 못 찾았을 때 호출
+    """
+    index = get_similarity_index(metric, store)
+    if store is None:
+        store = get_trait_store()
+    with _indexes_lock:
+        matrix = store.matrix
+        start = _synced_rows.get(metric, 0)
+        if len(matrix) > start:
+            index.add(store.user_ids[start : len(matrix)], matrix[start:])
+            _synced_rows[metric] = len(matrix)
+    return index
+
+
+def update_similarity_indexes(user_ids: Sequence[str], vectors: np.ndarray) -> None:
+    """
+    이미 구축된 인덱스들에 새 성향 벡터를 반영
+    """
+    for index in list(_indexes.values()):
+        index.add(user_ids, vectors)
@@ -0,0 +1,284 @@
+import fcntl
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from schemas.labeling_trait_vector import TraitVector
+
+logger = logging.getLogger(__name__)
+
+# TraitVector 필드를 행렬 열 순서로 고정 (user_id는 인덱스로 따로 보관)
+TRAIT_FIELDS: Tuple[str, ...] = tuple(
+    name for name in TraitVector.model_fields if name != "user_id"
+)
+TRAIT_DIM = len(TRAIT_FIELDS)
+TRAIT_COLUMNS: Dict[str, int] = {name: i for i, name in enumerate(TRAIT_FIELDS)}
+
+# 문자열 필드는 코드(목록 내 위치)로 저장
+CATEGORICAL_CODES: Dict[str, Tuple[str, ...]] = {
+    "attachment_style": (
+        "secure",
+        "anxious",
+        "avoidant",
+        "fearful",
+        "ambivalent",
+        "unknown",
+    ),
+    "dominant_emotion": (
+        "affection",
+        "gratitude",
+        "frustration",
+        "anxiety",
+        "jealousy",
+        "loneliness",
+        "sadness",
+        "resentment",
+        "none",
+    ),
+    "dominant_communication": (
+        "explanation",
+        "question",
+        "silence",
+        "meta_conversation",
+        "passive_aggressive",
+        "repetition",
+        "none",
+    ),
+}
+_INT_FIELDS = {"message_count", "reconnection_attempts"}
+
+
+def trait_vector_to_array(vector: TraitVector) -> np.ndarray:
+    """
+    TraitVector → float32 행 벡터 (TRAIT_FIELDS 순서)
+    """
+    row = np.empty(TRAIT_DIM, dtype=np.float32)
+    for i, name in enumerate(TRAIT_FIELDS):
+        value = getattr(vector, name)
+        codes = CATEGORICAL_CODES.get(name)
+        if codes is not None:
+            value = codes.index(value) if value in codes else codes.index(codes[-1])
+        row[i] = value
+    return row
+
+
+def array_to_trait_vector(row: np.ndarray, user_id: Optional[str]) -> TraitVector:
+    """
+    float32 행 벡터 → TraitVector
+    """
+    data: Dict[str, object] = {"user_id": user_id}
+    for i, name in enumerate(TRAIT_FIELDS):
+        value = row[i]
+        codes = CATEGORICAL_CODES.get(name)
+        if codes is not None:
+            data[name] = codes[int(value)]
+        elif name in _INT_FIELDS:
+            data[name] = int(value)
+        else:
+            data[name] = float(value)
+    return TraitVector(**data)
+
+
+class TraitStore:
+    """
+    사용자별 성향 벡터 저장소 (float32 고정 스키마 행렬 + userId 인덱스)
+
+    디렉터리 구성:
+    - meta.json: 열 스키마 (열리는 시점에 현재 TRAIT_FIELDS와 일치해야 함)
+    - traits.f32: 헤더 없는 float32 행렬, 메모리 맵으로 열어 재파싱 없이 사용
+    - user_ids.txt: 행 순서대로 userId (추가만 함)
+
+    행렬 파일은 같은 inode에서 늘리기 때문에 다른 프로세스는 다시 매핑만 하면 되고,
+    새 userId 추가는 user_ids.txt에 대한 파일 잠금으로 프로세스 간 직렬화함
+    """
+
+    _INITIAL_CAPACITY = 1024
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._matrix_path = os.path.join(path, "traits.f32")
+        self._ids_path = os.path.join(path, "user_ids.txt")
+        self._lock = threading.Lock()
+        self._check_schema()
+
+        self._user_ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._ids_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        if not os.path.exists(self._matrix_path):
+            with open(self._matrix_path, "wb") as f:
+                f.truncate(self._INITIAL_CAPACITY * TRAIT_DIM * 4)
+        open(self._ids_path, "a").close()
+        self._load_new_ids()
+        self._remap()
+
+    # ---- 조회 -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._user_ids)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self._index
+
+    @property
+    def user_ids(self) -> List[str]:
+        return self._user_ids
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        저장된 전체 행렬 (복사 없는 뷰, 행 순서 = user_ids 순서)
+        """
+        self.refresh()
+        assert self._matrix is not None
+        return self._matrix[: len(self._user_ids)]
+
+    def row_of(self, user_id: str) -> Optional[int]:
+        row = self._index.get(user_id)
+        if row is None:
+            self.refresh()
+            row = self._index.get(user_id)
+        return row
+
+    def get_array(self, user_id: str) -> Optional[np.ndarray]:
+        """
+        userId의 성향 벡터 행 (복사 없는 뷰)
+        """
+        row = self.row_of(user_id)
+        if row is None:
+            return None
+        assert self._matrix is not None
+        return self._matrix[row]
+
+    def get(self, user_id: str) -> Optional[TraitVector]:
+        row = self.get_array(user_id)
+        if row is None:
+            return None
+        return array_to_trait_vector(row, user_id)
+
+    # ---- 저장 -------------------------------------------------------------
+
+    def put(self, vector: TraitVector) -> None:
+        if not vector.user_id:
+            raise ValueError("user_id가 없는 성향 벡터는 저장할 수 없습니다.")
+        self.put_arrays([vector.user_id], trait_vector_to_array(vector)[None, :])
+
+    def put_many(self, vectors: Iterable[TraitVector]) -> None:
+        vectors = [v for v in vectors if v.user_id]
+        if not vectors:
+            return
+        rows = np.stack([trait_vector_to_array(v) for v in vectors])
+        self.put_arrays([str(v.user_id) for v in vectors], rows)
+
+    def put_arrays(self, user_ids: List[str], rows: np.ndarray) -> None:
+        """
+        여러 사용자의 성향 벡터 행을 한 번에 갱신/추가
+        """
+        if rows.shape != (len(user_ids), TRAIT_DIM):
+            raise ValueError(f"rows shape must be ({len(user_ids)}, {TRAIT_DIM})")
+        with self._lock:
+            indices = self._ensure_rows(user_ids)
+            assert self._matrix is not None
+            self._matrix[indices] = rows
+
+    def flush(self) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+
+    def refresh(self) -> None:
+        """
+        다른 프로세스가 추가한 userId/늘어난 행렬을 반영
+        """
+        if os.path.getsize(self._ids_path) == self._ids_offset:
+            return
+        with self._lock:
+            self._load_new_ids()
+            self._remap()
+
+    # ---- 내부 -------------------------------------------------------------
+
+    def _check_schema(self) -> None:
+        meta_path = os.path.join(self.path, "meta.json")
+        meta = {"dtype": "float32", "fields": list(TRAIT_FIELDS)}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                stored = json.load(f)
+            if stored != meta:
+                raise ValueError(f"성향 벡터 저장소 스키마가 다릅니다: {meta_path}")
+            return
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def _load_new_ids(self) -> None:
+        with open(self._ids_path, "rb") as f:
+            f.seek(self._ids_offset)
+            data = f.read()
+        # 마지막 줄이 아직 쓰이는 중이면 다음 refresh에서 읽음
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            self._index[line] = len(self._user_ids)
+            self._user_ids.append(line)
+        self._ids_offset += len(complete)
+
+    def _remap(self) -> None:
+        capacity = os.path.getsize(self._matrix_path) // (TRAIT_DIM * 4)
+        if self._matrix is not None and self._matrix.shape[0] == capacity:
+            return
+        self._matrix = np.memmap(
+            self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, TRAIT_DIM)
+        )
+
+    def _ensure_rows(self, user_ids: List[str]) -> np.ndarray:
+        """
+        userId별 행 번호를 반환, 없는 userId는 파일 잠금 하에 새 행으로 추가
+        """
+        if any(uid not in self._index for uid in user_ids):
+            with open(self._ids_path, "ab") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    self._load_new_ids()
+                    new_ids = list(
+                        dict.fromkeys(u for u in user_ids if u not in self._index)
+                    )
+                    if new_ids:
+                        self._grow(len(self._user_ids) + len(new_ids))
+                        f.write("".join(f"{u}\n" for u in new_ids).encode("utf-8"))
+                        f.flush()
+                        self._load_new_ids()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        self._remap()
+        return np.fromiter((self._index[u] for u in user_ids), dtype=np.int64)
+
+    def _grow(self, required: int) -> None:
+        capacity = os.path.getsize(self._matrix_path) // (TRAIT_DIM * 4)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        # 같은 파일을 늘려야 다른 프로세스의 기존 매핑이 그대로 유효함
+        with open(self._matrix_path, "r+b") as f:
+            f.truncate(capacity * TRAIT_DIM * 4)
+        logger.info(f"성향 벡터 저장소 확장: {capacity}행")
+
+
+_trait_store: Optional[TraitStore] = None
+_trait_store_lock = threading.Lock()
+
+
+def get_trait_store() -> TraitStore:
+    """
+    설정된 경로의 성향 벡터 저장소 (처음 사용할 때 열림)
+    """
+    global _trait_store
+    if _trait_store is None:
+        with _trait_store_lock:
+            if _trait_store is None:
+                _trait_store = TraitStore(settings.TRAIT_STORE_PATH)
+    return _trait_store
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from core.labeling.keyword_registry import CompiledKeywords, KeywordRegistry
+from core.labeling.labels import EmotionExpression
+from core.labeling.rule_engine import BUILTIN_KEYWORDS
+
+
+def write_keywords(path, version, affection, mtime):
+    data = {
+        "version": version,
+        "keywords": {"emotion_expression": {"affection": affection}},
+    }
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_from_json_accepts_names_and_values():
+    compiled = CompiledKeywords.from_json(
+        {
+            "version": "v1",
+            "keywords": {
+                "emotion_expression": {"affection": ["좋아"], "감사 표현": ["땡큐"]}
+            },
+        }
+    )
+
+    assert compiled.keywords["emotion_expression"][EmotionExpression.gratitude] == [
+        "땡큐"
+    ]
+    assert compiled.label_mask("좋아 땡큐") != 0
+    assert CompiledKeywords.from_json(compiled.to_json()).keywords == compiled.keywords
+
+
+def test_reload_swaps_version_and_keeps_old_snapshot(tmp_path):
+    path = tmp_path / "keywords.json"
+    write_keywords(path, "v1", ["좋아"], mtime=1_000)
+    registry = KeywordRegistry(BUILTIN_KEYWORDS, path=str(path), check_interval=0)
+
+    in_flight = registry.active
+    write_keywords(path, "v2", ["최고야"], mtime=2_000)
+    latest = registry.active
+
+    assert (in_flight.version, latest.version) == ("v1", "v2")
+    assert in_flight.label_mask("좋아") and not in_flight.label_mask("최고야")
+    assert latest.label_mask("최고야") and not latest.label_mask("좋아")
+
+
+def test_invalid_file_keeps_current_version(tmp_path):
+    path = tmp_path / "keywords.json"
+    write_keywords(path, "v1", ["좋아"], mtime=1_000)
+    registry = KeywordRegistry(BUILTIN_KEYWORDS, path=str(path), check_interval=0)
+
+    path.write_text('{"version": "v2", "keywords": {"unknown": {}}}')
+    os.utime(path, (2_000, 2_000))
+
+    assert registry.active.version == "v1"
+    with pytest.raises(ValueError):
+        CompiledKeywords.from_json({"keywords": {}})
+
+
+def test_missing_path_uses_default():
+    registry = KeywordRegistry(BUILTIN_KEYWORDS)
+
+    assert registry.version == "builtin"
+    assert registry.active.label_mask("사랑해") != 0
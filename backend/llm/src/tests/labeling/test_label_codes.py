@@ -0,0 +1,40 @@
+from core.labeling.label_codes import (
+    LabeledMessageRecord,
+    count_labels,
+    label_id,
+    labels_to_mask,
+    mask_to_labels,
+)
+from core.labeling.labels import CommunicationStyle, EmotionExpression, TopicContext
+from core.labeling.rule_engine import label_message, label_message_mask
+
+
+def test_label_ids_are_stable():
+    assert label_id("emotion_expression", EmotionExpression.affection) == 0
+    assert label_id("communication_style", CommunicationStyle.question) == 30
+    assert label_id("topic_context", TopicContext.routine_checkin) == 55
+
+
+def test_mask_round_trip_matches_dict_labels():
+    msg = "왜 연락 안 해? 보고 싶어"
+    mask = label_message_mask(msg)
+
+    assert mask_to_labels(mask) == label_message(msg)
+    assert labels_to_mask(label_message(msg)) == mask
+
+
+def test_labels_to_mask_accepts_values_and_names():
+    by_value = labels_to_mask({"emotion_expression": ["애정 표현", "감사 표현"]})
+    by_name = labels_to_mask({"emotion_expression": ["affection", "gratitude"]})
+
+    assert by_value == by_name
+    assert labels_to_mask({"unknown": ["x"], "emotion_expression": ["?"]}) == 0
+
+
+def test_record_and_counts():
+    record = LabeledMessageRecord("male", "사랑해", label_message_mask("사랑해"))
+
+    assert record.has("emotion_expression", EmotionExpression.affection)
+    assert record.to_dict()["labels"] == {"emotion_expression": ["애정 표현"]}
+    counts = count_labels([record.mask, record.mask, 0])
+    assert counts[label_id("emotion_expression", EmotionExpression.affection)] == 2
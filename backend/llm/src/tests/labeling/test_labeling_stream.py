@@ -0,0 +1,64 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.labeling import router
+from services.labeling_service import LabelingService, iter_ndjson_lines
+
+app = FastAPI()
+app.include_router(router)
+client = TestClient(app)
+
+
+def _stream(chunks):
+    return [json.loads(line) for line in LabelingService.stream_ndjson_history(chunks)]
+
+
+def test_stream_emits_one_line_per_message():
+    body = "\n".join(
+        [
+            json.dumps({"sender": "male", "text": "사랑해"}, ensure_ascii=False),
+            json.dumps({"sender": "female", "text": "또 이래? 짜증 나"}),
+            "",
+        ]
+    ).encode("utf-8")
+
+    results = _stream([body[:7], body[7:30], body[30:]])
+
+    assert len(results) == 2
+    assert "애정 표현" in results[0]["labels"]["emotion_expression"]
+    assert results[1]["sender"] == "female"
+
+
+def test_stream_reports_invalid_lines_with_location_and_continues():
+    body = "\n".join(
+        [
+            "not json",
+            '{"sender": "x", "text": "hi"}',
+            '{"sender": "male", "text": "고마워"}',
+        ]
+    ).encode("utf-8")
+
+    results = _stream([body])
+
+    assert results[0]["line"] == 1
+    assert results[1]["line"] == 2
+    assert results[1]["error"].startswith("sender:")
+    assert "감사 표현" in results[2]["labels"]["emotion_expression"]
+
+
+def test_lines_split_across_chunks_and_oversized_lines_are_dropped():
+    chunks = [b"ab", b"c\n" + b"x" * 10, b"x" * 10, b"\nd"]
+
+    assert list(iter_ndjson_lines(chunks, max_line_bytes=8)) == [b"abc", None, b"d"]
+
+
+def test_stream_endpoint_returns_ndjson():
+    body = '{"sender": "male", "text": "고마워"}\n{"sender": "female", "text": "응"}\n'
+    res = client.post("/label/history/stream", content=body.encode("utf-8"))
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in res.text.splitlines()]
+    assert [line["sender"] for line in lines] == ["male", "female"]
@@ -0,0 +1,92 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+import main
+from core.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    admission_controller,
+)
+from core.metrics import ADMISSION_SHED
+
+CLASSES = (("interactive", 1, 2, 1.0), ("batch", 1, 0, 0.05))
+
+
+def test_higher_priority_waiter_gets_freed_slot_and_full_queue_is_shed():
+    controller = AdmissionController(CLASSES, max_concurrency=1)
+
+    async def main():
+        assert await controller.acquire("batch") is None
+        # 워커 전체 자리가 찼으므로 interactive는 대기, batch는 대기열이 없어 바로 거절
+        waiting = asyncio.ensure_future(controller.acquire("interactive"))
+        await asyncio.sleep(0)
+        assert await controller.acquire("batch") == "queue_full"
+        controller.release("batch")
+        assert await waiting is None
+        assert controller.classes["interactive"].running == 1
+        controller.release("interactive")
+        assert controller.running == 0
+
+    asyncio.run(main())
+
+
+def test_middleware_rejects_with_retry_after_and_limits_adapt():
+    controller = AdmissionController(CLASSES, max_concurrency=4)
+    sent = []
+
+    async def app(scope, receive, send):
+        await asyncio.sleep(0.2)
+
+    async def send(message):
+        sent.append(message)
+
+    async def main():
+        middleware = AdmissionMiddleware(app, controller)
+        scope = {"type": "http", "path": "/api/v1/batch-couple-analysis"}
+        first = asyncio.ensure_future(middleware(scope, None, send))
+        await asyncio.sleep(0.01)
+        # 배치 클래스(동시 1개, 대기 0.05초)가 차 있으므로 거절
+        await middleware(scope, None, send)
+        await first
+
+    shed = ADMISSION_SHED.value("batch", "queue_full")
+    asyncio.run(main())
+    assert sent[0]["status"] == 503
+    assert dict(sent[0]["headers"])[b"retry-after"] == b"1"
+    assert ADMISSION_SHED.value("batch", "queue_full") == shed + 1
+    assert controller.classify("/chat-history") == "interactive"
+    assert controller.classify("/health/") is None
+
+    # LLM 호출이 평소보다 크게 느려지면 우선순위가 낮은 클래스의 제한만 줄어듦
+    controller.classes["batch"].limit = 8
+    for _ in range(200):
+        controller.observe_llm_latency(1.0)
+    for _ in range(30):
+        controller.observe_llm_latency(6.0)
+    assert controller.gradient() < 0.5
+    assert controller.effective_limit(controller.classes["batch"]) < 4
+    assert controller.effective_limit(controller.classes["interactive"]) == 1
+    assert controller.retry_after() >= 4
+
+
+def test_preflight_skips_admission_and_shed_responses_carry_cors(monkeypatch):
+    controller = AdmissionController(CLASSES, max_concurrency=1)
+    monkeypatch.setattr(admission_controller, "acquire", controller.acquire)
+    monkeypatch.setattr(admission_controller, "release", controller.release)
+    client = TestClient(main.app)
+    origin = {"Origin": "https://saiondo.example"}
+
+    async def fill():
+        assert await controller.acquire("batch") is None
+
+    asyncio.run(fill())
+    # preflight는 자리가 없어도 CORS 응답을 받음
+    preflight = client.options(
+        "/api/v1/batch-couple-analysis",
+        headers={**origin, "Access-Control-Request-Method": "POST"},
+    )
+    assert preflight.status_code == 200
+    response = client.post("/api/v1/batch-couple-analysis", headers=origin, json={})
+    assert response.status_code == 503
+    assert response.headers["access-control-allow-origin"] == origin["Origin"]
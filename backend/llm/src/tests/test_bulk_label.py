@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pytest
+
+import cli.bulk_label as bulk_label
+from cli.bulk_label import BulkLabelJob
+from services.trait_store import TraitStore
+
+MESSAGES = [
+    {"user_id": "u1", "sender": "male", "text": "사랑해 보고 싶어"},
+    {"user_id": "u2", "sender": "female", "text": "왜 연락 안 해?"},
+    {"user_id": "u1", "sender": "male", "text": "고마워 덕분이야"},
+    {"sender": "other", "text": "불안해"},
+]
+
+
+@pytest.fixture
+def export(tmp_path):
+    path = tmp_path / "export.jsonl"
+    lines = [json.dumps(m, ensure_ascii=False) for m in MESSAGES * 50]
+    lines.insert(3, "{not json")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def load(path):
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def test_pool_run_aggregates_per_user(export, tmp_path):
+    output = str(tmp_path / "out" / "traits.npz")
+    job = BulkLabelJob([export], output, workers=2, chunk_bytes=256)
+
+    job.run(store_path=str(tmp_path / "store"))
+
+    result = load(output)
+    users = result["user_id"].tolist()
+    assert sorted(users) == ["other", "u1", "u2"]
+    u1 = users.index("u1")
+    assert result["message_count"][u1] == 100
+    assert result["affection_level"][u1] == pytest.approx(0.5)
+    assert result["gratitude_level"][u1] == pytest.approx(0.5)
+    assert job.errors == 1
+    assert str(result["keyword_version"]) == "builtin"
+    assert TraitStore(str(tmp_path / "store")).get("u2").message_count == 50
+
+
+def test_interrupted_run_resumes_from_checkpoint(export, tmp_path, monkeypatch):
+    expected_path = str(tmp_path / "expected.npz")
+    BulkLabelJob([export], expected_path, chunk_bytes=256).run()
+
+    output = str(tmp_path / "traits.npz")
+    original = bulk_label.label_chunk
+    calls = {"n": 0}
+
+    def flaky(data, user_key, keywords):
+        calls["n"] += 1
+        if calls["n"] == 5:
+            raise KeyboardInterrupt
+        return original(data, user_key, keywords)
+
+    monkeypatch.setattr(bulk_label, "label_chunk", flaky)
+    job = BulkLabelJob([export], output, chunk_bytes=256, checkpoint_every=2)
+    with pytest.raises(KeyboardInterrupt):
+        job.run()
+    monkeypatch.setattr(bulk_label, "label_chunk", original)
+
+    resumed = BulkLabelJob([export], output, chunk_bytes=256, checkpoint_every=2)
+    resumed._load_checkpoint()
+    assert 0 < resumed._offsets[export]
+    resumed = BulkLabelJob([export], output, chunk_bytes=256)
+    resumed.run()
+
+    expected, actual = load(expected_path), load(output)
+    assert actual["user_id"].tolist() == expected["user_id"].tolist()
+    np.testing.assert_array_equal(actual["label_counts"], expected["label_counts"])
+    np.testing.assert_array_equal(actual["message_count"], expected["message_count"])
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+
+from core.metrics import CANCELLED_WORK
+from core.request_context import (
+    RequestContextMiddleware,
+    raise_if_cancelled,
+    sleep_unless_cancelled,
+)
+
+
+def _run(app, disconnect_after=None):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/work",
+        "headers": [(b"content-type", b"application/json")],
+        "query_string": b"",
+    }
+    sent = []
+
+    async def main():
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": b"{}", "more_body": False}
+            if disconnect_after is None:
+                # 클라이언트가 응답을 끝까지 기다림
+                await asyncio.Event().wait()
+            await asyncio.sleep(disconnect_after)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        await app(scope, receive, send)
+
+    asyncio.run(main())
+    return sent
+
+
+def test_disconnect_stops_sync_handler_work():
+    steps = []
+    finished = []
+    done = threading.Event()
+    app = FastAPI()
+
+    @app.post("/work")
+    def work():
+        try:
+            for _ in range(50):
+                raise_if_cancelled("llm_call")
+                steps.append(1)
+                sleep_unless_cancelled(0.02)
+            return {"ok": True}
+        finally:
+            done.set()
+
+    wrapped = RequestContextMiddleware(
+        app, on_finish=[lambda ctx, status, *_: finished.append(status)]
+    )
+    before = CANCELLED_WORK.value("/work", "llm_call")
+    sent = _run(wrapped, disconnect_after=0.1)
+
+    assert done.wait(2)
+    # 연결이 끊긴 뒤에는 더 진행하지 않고 응답도 보내지 않음
+    assert len(steps) < 20
+    assert sent == []
+    assert finished == [499]
+    assert CANCELLED_WORK.value("/work", "llm_call") == before + 1
+    assert CANCELLED_WORK.value("/work", "request") >= 1
+
+
+def test_completed_response_is_not_cancelled():
+    finished = []
+    app = FastAPI()
+
+    @app.post("/work")
+    def work():
+        return {"ok": True}
+
+    wrapped = RequestContextMiddleware(
+        app, on_finish=[lambda ctx, status, *_: finished.append(status)]
+    )
+    sent = _run(wrapped)
+
+    assert sent[0]["status"] == 200
+    assert finished == [200]
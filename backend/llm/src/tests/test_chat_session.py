@@ -0,0 +1,107 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.chat_session import router
+from core.request_context import current_request
+from services import chat_session
+from services.chat_session import ChatSessionNotFound, ChatSessionStore
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def reply(messages, model):
+        calls.append([dict(m) for m in messages])
+        if messages[-1]["content"] == "fail":
+            return "❌ OpenAI 오류: timeout"
+        ctx = current_request()
+        return f"답변{len(calls)} ({ctx.route if ctx else '-'})"
+
+    monkeypatch.setitem(chat_session.SESSION_KINDS, "chat", reply)
+    return calls
+
+
+def test_store_rolls_back_failed_turns_and_evicts(calls):
+    store = ChatSessionStore(ttl=60, max_sessions=2, max_messages=4)
+    system = {"role": "system", "content": "코치"}
+    session = store.create("chat", "openai", [system])
+
+    assert store.send(session, [{"role": "user", "content": "안녕"}], "http") == (
+        "답변1 (-)"
+    )
+    assert store.send(session, [{"role": "user", "content": "fail"}], "http")[0] == "❌"
+    # 실패한 턴은 대화에 남지 않고, 최대 메시지 수를 넘으면 system 다음의 오래된 대화부터 지움
+    assert [m["content"] for m in session.messages] == ["코치", "안녕", "답변1 (-)"]
+    store.send(session, [{"role": "user", "content": "다음"}], "http")
+    assert [m["content"] for m in session.messages] == [
+        "코치",
+        "답변1 (-)",
+        "다음",
+        "답변3 (-)",
+    ]
+
+    # 최대 세션 수를 넘으면 가장 오래 쓰지 않은 세션부터, TTL이 지나면 만료
+    other = store.create("chat", "openai")
+    store.get(session.session_id)
+    store.create("chat", "openai")
+    with pytest.raises(ChatSessionNotFound):
+        store.get(other.session_id)
+    session.last_used = time.monotonic() - 61
+    with pytest.raises(ChatSessionNotFound):
+        store.get(session.session_id)
+
+
+def test_websocket_sends_only_new_messages_and_resumes(calls):
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    with client.websocket_connect("/chat-sessions/ws") as ws:
+        ws.send_json({"type": "message", "content": "안녕"})
+        assert ws.receive_json()["code"] == "no_session"
+        ws.send_text("not json")
+        assert ws.receive_json()["code"] == "invalid_frame"
+
+        ws.send_json(
+            {"type": "start", "messages": [{"role": "system", "content": "코치"}]}
+        )
+        started = ws.receive_json()
+        assert started["type"] == "session" and started["messages"] == 1
+        ws.send_json({"type": "message", "content": "안녕"})
+        reply = ws.receive_json()
+        assert reply["type"] == "reply"
+        assert reply["content"] == "답변1 (/chat-sessions/ws)"
+        assert reply["messages"] == 3
+
+    # 다시 연결해 세션 ID로 이어서 보내면 서버가 보관한 대화 전체가 LLM에 전달됨
+    with client.websocket_connect("/chat-sessions/ws") as ws:
+        ws.send_json({"type": "start", "session_id": started["session_id"]})
+        assert ws.receive_json()["messages"] == 3
+        ws.send_json({"type": "message", "content": "또 왔어요"})
+        assert ws.receive_json()["messages"] == 5
+        ws.send_json({"type": "start", "session_id": "missing"})
+        assert ws.receive_json()["code"] == "session_not_found"
+    assert [m["content"] for m in calls[-1]] == [
+        "코치",
+        "안녕",
+        "답변1 (/chat-sessions/ws)",
+        "또 왔어요",
+    ]
+
+    # 세션 ID HTTP API도 같은 세션을 이어서 사용
+    response = client.post(
+        f"/chat-sessions/{started['session_id']}/messages",
+        json={"messages": [{"role": "user", "content": "HTTP로"}]},
+    )
+    assert response.json()["messages"] == 7
+    assert (
+        client.post(
+            "/chat-sessions/missing/messages",
+            json={"messages": [{"role": "user", "content": "x"}]},
+        ).status_code
+        == 404
+    )
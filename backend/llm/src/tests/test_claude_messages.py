@@ -0,0 +1,96 @@
+import pytest
+
+from core.usage import UsageMeter, estimate_cost
+from providers import claude_client
+from services.llm_provider import llm_provider
+
+COACH_PROMPT = "당신은 연애 코치입니다. " * 50
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def meter(monkeypatch):
+    meter = UsageMeter()
+    monkeypatch.setattr("providers.claude_client.usage_meter", meter)
+    return meter
+
+
+@pytest.fixture
+def posted(monkeypatch, meter):
+    posted = []
+
+    def post(url, headers=None, json=None, timeout=None):
+        posted.append(json)
+        return FakeResponse(
+            {
+                "model": "claude-3-opus-20240229",
+                "content": [{"type": "text", "text": "답변"}],
+                "usage": {
+                    "input_tokens": 20,
+                    "output_tokens": 10,
+                    "cache_read_input_tokens": 1000,
+                    "cache_creation_input_tokens": 0,
+                },
+            }
+        )
+
+    monkeypatch.setattr("providers.claude_client.requests.post", post)
+    monkeypatch.setattr("providers.claude_client.CLAUDE_API_KEY", "test")
+    return posted
+
+
+def test_history_keeps_roles_and_caches_system_prompt(posted):
+    messages = [
+        {"role": "system", "content": COACH_PROMPT},
+        {"role": "system", "content": "이전 대화 요약:\n다툼 이야기"},
+        {"role": "user", "content": "어제 싸웠어요"},
+        {"role": "assistant", "content": "무슨 일이 있었나요?"},
+        {"role": "user", "content": "연락 문제로요"},
+        {"role": "user", "content": "제가 예민한 걸까요?"},
+    ]
+
+    answer = llm_provider.ask_history(messages, "claude", route="coach")
+
+    assert answer == "답변"
+    (payload,) = posted
+    assert payload["system"] == [
+        {"type": "text", "text": COACH_PROMPT, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "이전 대화 요약:\n다툼 이야기"},
+    ]
+    assert payload["messages"] == [
+        {"role": "user", "content": "어제 싸웠어요"},
+        {"role": "assistant", "content": "무슨 일이 있었나요?"},
+        {"role": "user", "content": "연락 문제로요\n\n제가 예민한 걸까요?"},
+    ]
+
+    # 첫 메시지가 assistant면 이어지는 대화임을 알리는 user 메시지를 앞에 넣음
+    _, turns = claude_client.claude_messages([{"role": "assistant", "content": "안녕"}])
+    assert [t["role"] for t in turns] == ["user", "assistant"]
+
+
+def test_cached_prompt_tokens_are_billed_at_cache_price(posted, meter):
+    messages = [
+        {"role": "system", "content": COACH_PROMPT},
+        {"role": "user", "content": "안녕"},
+    ]
+    llm_provider.ask_history(messages, "claude", route="coach")
+
+    totals = meter.snapshot()["total"]
+    assert totals["input_tokens"] == 20
+    assert totals["cache_read_tokens"] == 1000
+    assert totals["cost_usd"] == round(
+        estimate_cost("claude-3-opus-20240229", 20, 10, cache_read_tokens=1000), 6
+    )
+    assert estimate_cost("claude-3-opus-20240229", 0, 0, cache_read_tokens=1000) < (
+        estimate_cost("claude-3-opus-20240229", 1000, 0)
+    )
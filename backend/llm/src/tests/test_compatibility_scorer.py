@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from services.compatibility_scorer import compatibility_scorer
+from services.trait_store import TRAIT_COLUMNS, TRAIT_DIM
+
+
+def make_rows(n, **values):
+    rows = np.zeros((n, TRAIT_DIM), dtype=np.float32)
+    for name, value in values.items():
+        rows[:, TRAIT_COLUMNS[name]] = value
+    return rows
+
+
+def test_secure_warm_couple_scores_above_anxious_avoidant_couple():
+    warm = make_rows(
+        1, affection_level=0.6, secure_ratio=0.8, emotional_stability_score=0.9
+    )
+    anxious = make_rows(1, anxiety_level=0.5, anxious_ratio=0.7)
+    avoidant = make_rows(1, silence_ratio=0.6, avoidant_ratio=0.7)
+
+    good = compatibility_scorer.score_batch(warm, warm)
+    bad = compatibility_scorer.score_batch(anxious, avoidant)
+
+    assert good["compatibility_score"][0] > bad["compatibility_score"][0]
+    assert good["attachment_pairing"][0] == pytest.approx(1.0)
+    assert bad["communication_mismatch"][0] > good["communication_mismatch"][0]
+
+
+def test_batch_matches_single_pair_scoring():
+    rng = np.random.default_rng(7)
+    users = rng.random((100, TRAIT_DIM), dtype=np.float32)
+    partners = rng.random((100, TRAIT_DIM), dtype=np.float32)
+
+    batch = compatibility_scorer.score_batch(users, partners)
+    single = compatibility_scorer.score_batch(users[5], partners[5])
+
+    for name, values in batch.items():
+        assert values.shape == (100,)
+        assert values[5] == pytest.approx(single[name][0])
+    assert np.all(
+        (batch["compatibility_score"] >= 0) & (batch["compatibility_score"] <= 100)
+    )
+
+
+def test_missing_attachment_signal_is_neutral():
+    empty = make_rows(1)
+
+    result = compatibility_scorer.score_batch(empty, empty)
+
+    assert result["attachment_pairing"][0] == pytest.approx(0.5)
+
+
+def test_mismatched_batch_sizes_are_rejected():
+    with pytest.raises(ValueError):
+        compatibility_scorer.score_batch(make_rows(2), make_rows(3))
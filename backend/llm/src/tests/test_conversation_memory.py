@@ -0,0 +1,59 @@
+from services.conversation_memory import (
+    SUMMARY_PREFIX,
+    ConversationMemory,
+    estimate_tokens,
+)
+
+
+def turns(n):
+    messages = [{"role": "system", "content": "당신은 연애 코치입니다."}]
+    for i in range(n):
+        messages.append({"role": "user", "content": f"{i}번째 고민이에요. " * 5})
+        messages.append({"role": "assistant", "content": f"{i}번째 조언입니다. " * 5})
+    return messages
+
+
+def test_estimate_tokens_and_short_conversation_is_unchanged():
+    assert estimate_tokens("hello world!") == 3
+    assert estimate_tokens("안녕하세요") == 5
+    assert estimate_tokens("") == 0
+
+    memory = ConversationMemory(token_budget=1000, recent_tokens=500)
+    messages = turns(2)
+    assert memory.compact(messages, None, route="chat") == messages
+
+
+def test_old_turns_fold_into_incrementally_refreshed_summary():
+    calls = []
+
+    def summarize(summary, messages, model):
+        calls.append((summary, len(messages)))
+        return f"요약{len(calls)}"
+
+    memory = ConversationMemory(
+        token_budget=300, recent_tokens=150, min_recent_messages=2, summarize=summarize
+    )
+    sizes = []
+    for n in range(1, 30):
+        compacted = memory.compact(turns(n), "openai", route="coach")
+        sizes.append(sum(estimate_tokens(m["content"]) + 4 for m in compacted))
+        assert compacted[0]["content"] == "당신은 연애 코치입니다."
+        assert compacted[-1] == turns(n)[-1]
+
+    # 예산을 넘을 때만, 이전 요약 + 새로 접는 대화만 요약하므로 턴마다 보내는 양이 일정함
+    assert max(sizes) <= 300
+    assert 1 < len(calls) < 29 // 2
+    assert calls[0][0] == "" and calls[1][0] == "요약1"
+    assert all(folded <= 2 * 6 for _, folded in calls[1:])
+    assert compacted[1] == {
+        "role": "system",
+        "content": SUMMARY_PREFIX + f"요약{len(calls)}",
+    }
+
+    # 요약이 실패하면 오래된 대화를 요약 없이 버림
+    failing = ConversationMemory(
+        token_budget=300, recent_tokens=150, summarize=lambda *_: "❌ 오류"
+    )
+    compacted = failing.compact(turns(20), None, route="coach")
+    assert all(not m["content"].startswith(SUMMARY_PREFIX) for m in compacted)
+    assert len(compacted) < len(turns(20))
@@ -0,0 +1,33 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def cpu_bench():
+    path = Path(__file__).parents[2] / "benchmarks" / "cpu.py"
+    spec = importlib.util.spec_from_file_location("cpu_bench", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_corpus_is_reproducible(cpu_bench):
+    first = cpu_bench.make_corpus(50, seed=1)
+    second = cpu_bench.make_corpus(50, seed=1)
+
+    assert [m.text for m in first] == [m.text for m in second]
+    assert any(cpu_bench.label_message(m.text) for m in first)
+
+
+def test_compare_flags_regressions_beyond_threshold(cpu_bench):
+    results = cpu_bench.run_suite(
+        ["small"], "rule_engine.label_message", min_time=0.01, repeats=1
+    )
+    (name,) = results
+    slower = {name: {"median_ns": results[name]["median_ns"] / 1.5}}
+    same = {name: {"median_ns": results[name]["median_ns"]}}
+
+    assert cpu_bench.compare(slower, results, 0.1)[0]["regression"]
+    assert not cpu_bench.compare(same, results, 0.1)[0]["regression"]
@@ -0,0 +1,64 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from config import settings
+from core.metrics import LLM_DEADLINE_SKIPPED
+from core.request_context import RequestContextMiddleware, remaining_time
+from services.llm_provider import llm_provider
+
+
+def make_app(calls):
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.post("/pipeline")
+    def pipeline(steps: int = 3, step_seconds: float = 0.0):
+        responses = []
+        for i in range(steps):
+            responses.append(llm_provider.ask("안녕", "fake", call_site=f"step{i}"))
+            calls.append(i)
+            time.sleep(step_seconds)
+        return {"responses": responses, "remaining": remaining_time()}
+
+    return app
+
+
+def test_deadline_from_header_and_route_default(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MIN_CALL_SECONDS", 0.2)
+    monkeypatch.setattr(settings, "REQUEST_ROUTE_TIMEOUTS", "/pipeline=30")
+    client = TestClient(make_app([]))
+
+    # 헤더가 라우트 기본값보다 짧으면 헤더 값을 따름
+    body = client.post(
+        "/pipeline?steps=0", headers={"x-request-timeout-ms": "5000"}
+    ).json()
+    assert 4 < body["remaining"] <= 5
+    body = client.post("/pipeline?steps=0").json()
+    assert 29 < body["remaining"] <= 30
+
+    monkeypatch.setattr(settings, "REQUEST_ROUTE_TIMEOUTS", "")
+    assert client.post("/pipeline?steps=0").json()["remaining"] is None
+
+
+def test_steps_that_cannot_finish_are_skipped_and_marked(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MIN_CALL_SECONDS", 0.2)
+    monkeypatch.setattr(settings, "DEFAULT_MODEL", "fake")
+    calls = []
+    client = TestClient(make_app(calls))
+    skipped = LLM_DEADLINE_SKIPPED.value("/pipeline", "step2")
+
+    # 두 단계가 끝나면 남은 시간이 최소 호출 시간보다 짧아짐
+    res = client.post(
+        "/pipeline?steps=3&step_seconds=0.15",
+        headers={"x-request-timeout-ms": "450"},
+    )
+    responses = res.json()["responses"]
+    assert not responses[0].startswith("❌")
+    assert responses[2].startswith("❌ 마감 시간 초과")
+    assert res.headers["x-degraded"].split(",")[-1] == "step2"
+    assert LLM_DEADLINE_SKIPPED.value("/pipeline", "step2") == skipped + 1
+
+    res = client.post("/pipeline?steps=2")
+    assert "x-degraded" not in res.headers
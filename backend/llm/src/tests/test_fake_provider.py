@@ -0,0 +1,101 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.metrics import LLM_FALLBACKS, LLM_PARSE_FAILURES
+from providers import claude_client
+from providers.fake_client import fake_completion
+from schemas.labeling_trait_vector import ChatMessage, LabelingTraitVectorRequest
+from services.enhanced_couple_analysis_service import enhanced_couple_analysis_service
+from services.labeling_trait_vector_service import LabelingTraitVectorService
+from services.model_router import model_router
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    monkeypatch.setattr("config.settings.DEFAULT_MODEL", "fake")
+
+
+@pytest.fixture
+def stub_client():
+    path = Path(__file__).parents[2] / "benchmarks" / "llm_stub.py"
+    spec = importlib.util.spec_from_file_location("llm_stub", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return TestClient(module.create_app())
+
+
+def test_fake_responses_are_deterministic_and_parse(
+    fake_model, sample_user_data, sample_partner_data
+):
+    failures = LLM_PARSE_FAILURES._totals()
+
+    first = enhanced_couple_analysis_service.analyze_couple(
+        sample_user_data, sample_partner_data
+    )
+    second = enhanced_couple_analysis_service.analyze_couple(
+        sample_user_data, sample_partner_data
+    )
+
+    assert first == second
+    assert 50 <= first.compatibility_score <= 95
+    assert first.relationship_insights
+    assert LLM_PARSE_FAILURES._totals() == failures
+
+
+def test_fake_labeling_matches_rule_engine(fake_model):
+    fallbacks = LLM_FALLBACKS.value("label_trait_vector")
+    request = LabelingTraitVectorRequest(
+        messages=[
+            ChatMessage(sender="male", text="사랑해 보고 싶어"),
+            ChatMessage(sender="female", text="왜 연락 안 해?"),
+        ]
+    )
+
+    response = LabelingTraitVectorService.label_trait_vector(request)
+
+    assert LLM_FALLBACKS.value("label_trait_vector") == fallbacks
+    assert [m.text for m in response.labeled_messages] == [
+        "사랑해 보고 싶어",
+        "왜 연락 안 해?",
+    ]
+    assert response.labeled_messages[0].labels
+    assert response.summary["text"]
+
+
+def test_stub_speaks_anthropic_messages_api(stub_client, monkeypatch):
+    # 실제 Claude 클라이언트가 스텁 응답을 그대로 파싱하는지 확인
+    monkeypatch.setattr("providers.claude_client.requests.post", stub_client.post)
+    monkeypatch.setattr("providers.claude_client.CLAUDE_API_URL", "/v1")
+    monkeypatch.setattr("providers.claude_client.CLAUDE_API_KEY", "stub")
+    prompt = '다음 형식으로 응답해주세요: {"score": 0.5, "tips": ["팁"]}'
+
+    target = model_router.resolve("default", "claude")
+    answer = claude_client.ask_claude(prompt, target)
+
+    assert answer == fake_completion(prompt)
+    assert set(json.loads(answer)) == {"score", "tips"}
+
+
+def test_stub_streams_openai_chunks(stub_client, monkeypatch):
+    monkeypatch.setattr("config.settings.FAKE_LLM_STREAM_INTERVAL_MS", 0)
+    body = {
+        "model": "gpt-3.5-turbo",
+        "stream": True,
+        "stream_options": {"include_usage": True},
+        "messages": [{"role": "user", "content": "안녕"}],
+    }
+
+    with stub_client.stream("POST", "/v1/chat/completions", json=body) as response:
+        lines = [line for line in response.iter_lines() if line]
+
+    assert lines[-1] == "data: [DONE]"
+    chunks = [json.loads(line[len("data: ") :]) for line in lines[:-1]]
+    text = "".join(
+        c["choices"][0]["delta"].get("content", "") for c in chunks if c["choices"]
+    )
+    assert text == fake_completion("안녕")
+    assert chunks[-1]["usage"]["completion_tokens"] > 0
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from config import settings
+from core.metrics import LLM_HEDGES
+from services.hedging import HedgeBudget, Hedger, LatencyTracker
+from services.model_router import ModelTarget
+
+TARGET = ModelTarget(provider="fake", model="fake-llm")
+
+
+def _hedger(ratio=1.0, samples=0.01):
+    tracker = LatencyTracker(window=50)
+    for _ in range(settings.LLM_HEDGE_MIN_SAMPLES):
+        tracker.observe(("fake", "fake-llm"), samples)
+    budget = HedgeBudget(ratio, burst=1.0)
+    return Hedger(tracker, budget, max_workers=4)
+
+
+def test_slow_call_is_hedged_and_first_valid_response_wins(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_MS", 10)
+    hedger = _hedger()
+    release = threading.Event()
+    calls = []
+
+    def call(target):
+        calls.append(target)
+        if len(calls) == 1:
+            # 첫 호출은 헤지가 끝날 때까지 멈춤 (꼬리 지연)
+            release.wait(2)
+            return "느린 응답"
+        return "헤지 응답"
+
+    won = LLM_HEDGES.value("hedge_test", "won")
+    started = time.perf_counter()
+    assert hedger.run(call, TARGET, "hedge_test") == "헤지 응답"
+    assert time.perf_counter() - started < 1
+    assert len(calls) == 2
+    assert LLM_HEDGES.value("hedge_test", "won") == won + 1
+    release.set()
+
+    # 헤지 응답이 오류면 원래 호출을 기다림
+    calls.clear()
+
+    def failing_hedge(target):
+        calls.append(target)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            return "원래 응답"
+        return "❌ 오류"
+
+    assert hedger.run(failing_hedge, TARGET, "hedge_test") == "원래 응답"
+
+
+def test_hedge_budget_and_warm_up(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_MS", 10)
+    hedger = _hedger(ratio=0.0)
+    calls = []
+
+    def slow(target):
+        calls.append(target)
+        time.sleep(0.05)
+        return "응답"
+
+    # 예산이 없으면 헤지하지 않음
+    exhausted = LLM_HEDGES.value("budget_test", "budget_exhausted")
+    assert hedger.run(slow, TARGET, "budget_test") == "응답"
+    assert len(calls) == 1
+    assert LLM_HEDGES.value("budget_test", "budget_exhausted") == exhausted + 1
+
+    # 호출 기록이 부족하면 분위수를 모르므로 헤지하지 않음
+    assert LatencyTracker().percentile(("fake", "fake-llm"), 0.95, 20) is None
+    budget = HedgeBudget(0.5, burst=1.0)
+    assert not budget.try_acquire()
+    budget.record_call()
+    budget.record_call()
+    assert budget.try_acquire() and not budget.try_acquire()
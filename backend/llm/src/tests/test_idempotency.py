@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from core.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+def make_app(calls):
+    app = FastAPI()
+    store = IdempotencyStore(ttl=60, max_entries=100)
+    app.add_middleware(IdempotencyMiddleware, store=store)
+
+    @app.post("/analyze")
+    async def analyze(payload: dict):
+        calls.append(payload)
+        await asyncio.sleep(0.05)
+        if payload.get("fail"):
+            return JSONResponse({"error": len(calls)}, status_code=500)
+        return {"call": len(calls), "echo": payload}
+
+    return app, store
+
+
+def test_completed_result_is_replayed_byte_for_byte():
+    calls = []
+    app, _ = make_app(calls)
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "k1"}
+
+    first = client.post("/analyze", json={"a": 1}, headers=headers)
+    second = client.post("/analyze", json={"a": 1}, headers=headers)
+    assert len(calls) == 1
+    assert second.content == first.content
+    assert second.headers["idempotent-replayed"] == "true"
+
+    # 같은 키에 다른 본문은 거절, 키가 없거나 다른 키면 새로 처리
+    assert client.post("/analyze", json={"a": 2}, headers=headers).status_code == 422
+    client.post("/analyze", json={"a": 1})
+    client.post("/analyze", json={"a": 1}, headers={"Idempotency-Key": "k2"})
+    assert len(calls) == 3
+
+    # 5xx 응답은 저장하지 않으므로 재시도가 다시 처리함
+    fail = {"Idempotency-Key": "k3"}
+    client.post("/analyze", json={"fail": True}, headers=fail)
+    client.post("/analyze", json={"fail": True}, headers=fail)
+    assert len(calls) == 5
+
+
+def test_retry_waits_for_in_progress_original():
+    calls = []
+    app, store = make_app(calls)
+    middleware = app.build_middleware_stack()
+    body = json.dumps({"a": 1}).encode()
+
+    async def request():
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/analyze",
+            "query_string": b"",
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"idempotency-key", b"same"),
+            ],
+        }
+        await middleware(scope, receive, send)
+        return sent
+
+    async def main():
+        return await asyncio.gather(request(), request(), request())
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    bodies = {result[-1]["body"] for result in results}
+    assert len(bodies) == 1
+    assert len(store) == 1
+
+
+def test_eviction_keeps_in_progress_entries():
+    store = IdempotencyStore(ttl=60, max_entries=2)
+
+    async def main():
+        running = store.begin(("/analyze", "running"), "f")
+        done = store.begin(("/analyze", "done"), "f")
+        store.complete(("/analyze", "done"), done, 200, [], b"{}")
+        # 완료된 항목만 밀려나고 처리 중인 항목은 남음
+        assert store.begin(("/analyze", "new"), "f") is not None
+        assert store.get(("/analyze", "running")) is running
+        assert not running.done.is_set()
+        assert store.get(("/analyze", "done")) is None
+        # 처리 중인 항목으로 가득 차면 새 키를 받지 않음
+        assert store.begin(("/analyze", "more"), "f") is None
+
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import importlib.util
+import random
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def loadtest():
+    path = Path(__file__).parents[2] / "benchmarks" / "loadtest.py"
+    spec = importlib.util.spec_from_file_location("loadtest", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_summarize_reports_percentiles_and_errors(loadtest):
+    result = loadtest.LevelResult(concurrency=4, duration=2.0)
+    for i in range(1, 101):
+        status = 500 if i % 10 == 0 else 200
+        result.samples.append(loadtest.Sample("chat", status, i / 1000))
+    result.samples.append(loadtest.Sample("batch", 422, 0.5))
+    result.saturation.extend([0.25, 0.75])
+
+    summary = loadtest.summarize(result)
+
+    assert summary["requests"] == 101
+    assert summary["throughput_rps"] == 50.5
+    assert summary["profiles"]["chat"]["p50_ms"] == 50.5
+    assert summary["profiles"]["chat"]["error_rate"] == 0.1
+    assert summary["profiles"]["batch"]["error_rate"] == 1.0
+    assert summary["saturation_mean"] == 0.5
+    assert summary["saturation_max"] == 0.75
+
+
+def test_parse_mix_and_reproducible_requests(loadtest):
+    assert loadtest.parse_mix("chat=2,batch=0,labeling") == [
+        ("chat", 2.0),
+        ("labeling", 1.0),
+    ]
+    with pytest.raises(ValueError):
+        loadtest.parse_mix("unknown=1")
+
+    for build in loadtest.PROFILES.values():
+        assert build(random.Random(3)) == build(random.Random(3))
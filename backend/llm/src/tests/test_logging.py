@@ -0,0 +1,61 @@
+import json
+import logging
+
+from config import settings
+from core.log import _QueueHandler, log_payload, summarize_payload
+from core.request_context import RequestContext, _current_request
+
+
+def test_queue_handler_renders_json_with_request_id(capsys, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_FORMAT", "json")
+    handler = _QueueHandler(100)
+    logger = logging.getLogger("tests.queue_handler")
+    logger.propagate = False
+    logger.addHandler(handler)
+    token = _current_request.set(RequestContext("req-1"))
+    try:
+        args = {"n": 1}
+        logger.warning("처리 %s", args, extra={"route": "/chat"})
+        args["n"] = 2  # 큐에 넣은 뒤 바뀌어도 호출 시점 메시지가 남아야 함
+        handler.flush()
+    finally:
+        _current_request.reset(token)
+        logger.removeHandler(handler)
+        handler.listener.stop()
+
+    line = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert line["event"] == "처리 {'n': 1}"
+    assert line["level"] == "warning"
+    assert line["request_id"] == "req-1"
+    assert line["route"] == "/chat"
+
+
+def test_log_payload_samples_and_truncates(caplog, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_PAYLOAD_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(settings, "LOG_PAYLOAD_ROUTE_SAMPLE_RATES", "/chat=1")
+    monkeypatch.setattr(settings, "LOG_PAYLOAD_MAX_CHARS", 5)
+    logger = logging.getLogger("tests.payload")
+    text = "가" * 100
+
+    with caplog.at_level(logging.INFO, logger="tests.payload"):
+        token = _current_request.set(RequestContext("r1", path="/other"))
+        log_payload(logger, "응답", text)  # 샘플링되지 않음
+        log_payload(logger, "파싱 실패", text, logging.ERROR)  # 오류는 항상
+        _current_request.reset(token)
+
+        ctx = RequestContext("r2")
+        ctx.route = "/chat"
+        token = _current_request.set(ctx)
+        log_payload(logger, "응답", text)
+        _current_request.reset(token)
+
+    assert [r.getMessage() for r in caplog.records] == ["파싱 실패", "응답"]
+    assert caplog.records[0].payload == summarize_payload(text)
+    assert caplog.records[0].payload["preview"] == "가" * 5 + "…"
+    assert caplog.records[0].payload["chars"] == 100
+
+    caplog.clear()
+    with caplog.at_level(logging.DEBUG, logger="tests.payload"):
+        log_payload(logger, "응답", text)
+    assert caplog.records[0].levelno == logging.DEBUG
+    assert caplog.records[0].payload == text
@@ -0,0 +1,103 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from core.metrics import (
+    LLM_CALL_DURATION,
+    LLM_CALLS_IN_FLIGHT,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+
+
+def test_shards_from_threads_are_merged_on_render():
+    registry = Registry()
+    counter = Counter("jobs_total", "jobs", ("kind",), registry=registry)
+    histogram = Histogram(
+        "job_seconds", "job time", ("kind",), buckets=(0.1, 1), registry=registry
+    )
+
+    def work():
+        for _ in range(1000):
+            counter.inc('a"b')
+            histogram.observe(0.5, "x")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    text = registry.render()
+    assert 'jobs_total{kind="a\\"b"} 4000' in text
+    assert 'job_seconds_bucket{kind="x",le="0.1"} 0' in text
+    assert 'job_seconds_bucket{kind="x",le="1"} 4000' in text
+    assert 'job_seconds_bucket{kind="x",le="+Inf"} 4000' in text
+    assert 'job_seconds_sum{kind="x"} 2000' in text
+    assert "# TYPE job_seconds histogram" in text
+
+
+def test_gauge_function_is_evaluated_at_scrape_time():
+    registry = Registry()
+    items = []
+    gauge = Gauge("items", "items", ("name",), registry=registry)
+    gauge.set_function(lambda: len(items), "list")
+    items.extend([1, 2, 3])
+
+    assert 'items{name="list"} 3' in registry.render()
+
+
+def test_metrics_endpoint_reports_route_templates():
+    from main import app
+
+    client = TestClient(app)
+    client.get("/health/")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health/",'
+        'status="200"}' in response.text
+    )
+    # 스크레이프 요청 자신만 진행 중
+    assert 'http_requests_in_flight{method="GET"} 1' in response.text
+
+
+def test_llm_error_responses_are_recorded_as_errors(monkeypatch):
+    from services.llm_provider import llm_provider
+
+    monkeypatch.setattr(
+        "services.llm_provider.ask_openai",
+        lambda prompt, target: "❌ OpenAI 오류: timeout",
+    )
+    labels = ("openai", "gpt-4o-mini", "metrics_test", "error")
+    before = LLM_CALL_DURATION.count(*labels)
+
+    llm_provider.ask("hi", model="openai", call_site="metrics_test")
+
+    assert LLM_CALL_DURATION.count(*labels) == before + 1
+    assert LLM_CALLS_IN_FLIGHT.value("openai") == 0
+
+
+def test_finished_threads_fold_their_shards_into_retired_totals():
+    registry = Registry()
+    counter = Counter("done_total", "done", registry=registry)
+    histogram = Histogram("done_seconds", "done", buckets=(1,), registry=registry)
+
+    def work():
+        counter.inc()
+        histogram.observe(0.5)
+
+    for _ in range(50):
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+
+    # 끝난 스레드의 샤드는 남지 않고 값은 그대로 보존됨
+    assert len(counter._shards) == 0 and len(histogram._shards) == 0
+    assert counter.value() == 50
+    assert histogram.count() == 50
+    assert "done_seconds_sum 25" in registry.render()
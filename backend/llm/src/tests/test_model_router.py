@@ -0,0 +1,51 @@
+import json
+
+from config import settings
+from core.request_context import RequestContext, _current_request
+from services.model_router import (
+    DEFAULT_ROUTES,
+    ModelRouter,
+    RoutingTable,
+    model_router,
+)
+
+
+def test_routes_pick_tier_provider_and_params(monkeypatch):
+    monkeypatch.setattr(settings, "DEFAULT_MODEL", "claude")
+
+    labeling = model_router.resolve("labeling")
+    assert (labeling.provider, labeling.model) == ("claude", "claude-3-haiku-20240307")
+    assert labeling.temperature == 0.0
+
+    comprehensive = model_router.resolve("comprehensive_analysis", "openai")
+    assert (comprehensive.model, comprehensive.tier) == ("gpt-4o", "deep")
+    assert model_router.resolve("no-such-route").route == "default"
+
+    # 요청이 고른 tier(X-Model-Tier)가 route 기본 tier보다 우선, 모르는 tier는 무시
+    token = _current_request.set(RequestContext("r1", model_tier="deep"))
+    try:
+        assert model_router.resolve("labeling").model == "claude-3-opus-20240229"
+    finally:
+        _current_request.reset(token)
+    token = _current_request.set(RequestContext("r2", model_tier="turbo"))
+    try:
+        assert model_router.resolve("labeling").tier == "fast"
+    finally:
+        _current_request.reset(token)
+
+
+def test_router_reloads_file_and_keeps_table_on_error(tmp_path):
+    path = tmp_path / "routes.json"
+    table = json.loads(json.dumps(DEFAULT_ROUTES))
+    table["routes"]["labeling"] = {"tier": "cheap", "max_tokens": 512}
+    table["tiers"]["cheap"] = {"openai": "gpt-3.5-turbo"}
+    path.write_text(json.dumps(table))
+    router = ModelRouter(RoutingTable.from_json(DEFAULT_ROUTES), str(path), 0)
+
+    target = router.resolve("labeling", "openai")
+    assert (target.model, target.max_tokens) == ("gpt-3.5-turbo", 512)
+
+    path.write_text(json.dumps({"tiers": {}, "routes": {}}))
+    router.reload(force=True)
+
+    assert router.resolve("labeling", "openai").model == "gpt-3.5-turbo"
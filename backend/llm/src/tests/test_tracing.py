@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from core.request_context import RequestContextMiddleware, current_request
+from core.tracing import TraceExporter, Tracer
+
+
+class RecordingExporter(TraceExporter):
+    def __init__(self, **kwargs):
+        super().__init__("http://collector.invalid", **kwargs)
+        self.sent = []
+
+    def _send(self, batch):
+        self.sent.extend(batch)
+
+
+class BlockedExporter(TraceExporter):
+    def __init__(self, **kwargs):
+        super().__init__("http://collector.invalid", **kwargs)
+        self.release = threading.Event()
+
+    def _send(self, batch):
+        self.release.wait(5)
+
+
+def make_app(tracer):
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, on_finish=[tracer.record_request])
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: str):
+        with tracer.span("work", item_id=item_id):
+            return {"request_id": current_request().request_id}
+
+    @app.get("/fail")
+    def fail():
+        with tracer.span("work"):
+            raise HTTPException(status_code=503)
+
+    return app
+
+
+def test_sampled_request_exports_root_and_child_spans(monkeypatch):
+    monkeypatch.setattr("config.settings.TRACE_SAMPLE_RATE", 1.0)
+    exporter = RecordingExporter(flush_interval=0.01)
+    client = TestClient(make_app(Tracer(exporter)))
+
+    response = client.get("/items/42", headers={"x-request-id": "req-1"})
+    exporter.flush()
+
+    assert response.headers["x-request-id"] == "req-1"
+    assert response.json() == {"request_id": "req-1"}
+    spans = {span["name"]: span for span in exporter.sent}
+    assert spans["http.request"]["attributes"]["http.route"] == "/items/{item_id}"
+    assert spans["work"]["parent_id"] == spans["http.request"]["span_id"]
+    assert {s["trace_id"] for s in exporter.sent} == {"req-1"}
+
+
+def test_unsampled_requests_only_export_errors(monkeypatch):
+    monkeypatch.setattr("config.settings.TRACE_SAMPLE_RATE", 0.0)
+    exporter = RecordingExporter(flush_interval=0.01)
+    tracer = Tracer(exporter)
+    client = TestClient(make_app(tracer))
+
+    client.get("/items/1")
+    client.get("/fail")
+    exporter.flush()
+
+    assert [s["name"] for s in exporter.sent] == ["work", "http.request"]
+    assert all("error" in s for s in exporter.sent)
+
+
+def test_full_queue_drops_without_blocking():
+    exporter = BlockedExporter(queue_size=10, batch_size=1, flush_interval=0.01)
+    tracer = Tracer(exporter)
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        with pytest.raises(ValueError):
+            with tracer.span("work"):
+                raise ValueError("boom")
+    elapsed = time.perf_counter() - started
+    exporter.release.set()
+
+    assert exporter.dropped >= 1000 - 11
+    assert elapsed < 1.0
+
+
+def test_disabled_tracer_is_a_noop():
+    tracer = Tracer(None)
+
+    with tracer.span("work", a=1) as span:
+        span.set("b", 2)
+        span.set_error("ignored")
+
+    assert not tracer.enabled
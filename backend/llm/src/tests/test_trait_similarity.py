@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from services import trait_similarity
+from services.trait_similarity import TraitSimilarityIndex
+from services.trait_store import TRAIT_DIM, TraitStore
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(42)
+    centers = rng.random((20, TRAIT_DIM), dtype=np.float32)
+    noise = 0.05 * rng.standard_normal((5000, TRAIT_DIM), dtype=np.float32)
+    return (centers[rng.integers(0, 20, 5000)] + noise).astype(np.float32)
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+def test_partitioned_index_matches_brute_force(vectors, metric):
+    ids = [f"u{i}" for i in range(len(vectors))]
+    brute = TraitSimilarityIndex(metric, brute_force_limit=10**9)
+    ivf = TraitSimilarityIndex(metric, brute_force_limit=1000)
+    brute.build(ids, vectors)
+    ivf.build(ids, vectors)
+    assert ivf.partitioned and not brute.partitioned
+
+    exact, _ = brute.query_batch(vectors[:50], k=10)
+    approx, _ = ivf.query_batch(vectors[:50], k=10)
+    recall = np.mean([len(set(a) & set(e)) / 10 for a, e in zip(approx, exact)])
+    assert recall >= 0.9
+
+
+def test_query_user_excludes_self_and_sees_incremental_inserts(vectors):
+    ids = [f"u{i}" for i in range(1000)]
+    index = TraitSimilarityIndex("euclidean", brute_force_limit=500)
+    index.build(ids, vectors[:1000])
+
+    index.add(["twin"], vectors[3:4])
+    neighbors = index.query_user("u3", k=3)
+
+    assert neighbors[0] == ("twin", pytest.approx(0.0, abs=1e-3))
+    assert all(uid != "u3" for uid, _ in neighbors)
+    assert index.query_user("missing") is None
+
+
+def test_update_moves_existing_user(vectors):
+    index = TraitSimilarityIndex("cosine")
+    index.build(["a", "b", "c"], vectors[[0, 1, 2]])
+
+    index.add(["c"], vectors[0:1])
+
+    assert len(index) == 3
+    assert index.query_user("a", k=1)[0][0] == "c"
+
+
+def test_partitioned_update_does_not_duplicate_rows(vectors):
+    ids = [f"u{i}" for i in range(1000)]
+    index = TraitSimilarityIndex("cosine", brute_force_limit=500)
+    index.build(ids, vectors[:1000])
+
+    index.add(["u5"], vectors[5:6] + 1e-4)
+    neighbors = [uid for uid, _ in index.query(vectors[5], k=3)]
+    assert neighbors[0] == "u5" and len(neighbors) == len(set(neighbors))
+
+    # 다른 파티션으로 옮겨가면 이전 파티션에서 빠짐
+    index.add(["u5"], vectors[900:901])
+    assert "u5" not in [uid for uid, _ in index.query(vectors[5], k=3)]
+    assert sum(5 in index._list_rows(i) for i in range(len(index._lists))) == 1
+
+
+def test_refresh_picks_up_rows_saved_by_other_workers(tmp_path, monkeypatch, vectors):
+    monkeypatch.setattr(trait_similarity, "_indexes", {})
+    monkeypatch.setattr(trait_similarity, "_synced_rows", {})
+    store = TraitStore(str(tmp_path))
+    store.put_arrays(["a", "b"], vectors[[0, 1]])
+    index = trait_similarity.get_similarity_index("cosine", store)
+
+    # 다른 워커 프로세스가 같은 저장소에 추가한 사용자
+    TraitStore(str(tmp_path)).put_arrays(["c"], vectors[0:1])
+    assert index.query_user("c") is None
+
+    refreshed = trait_similarity.refresh_similarity_index("cosine", store)
+    assert refreshed is index and len(index) == 3
+    assert index.query_user("c", k=1)[0][0] == "a"
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from schemas.labeling_trait_vector import TraitVector
+from services.trait_store import (
+    TRAIT_COLUMNS,
+    TRAIT_DIM,
+    TraitStore,
+    array_to_trait_vector,
+    trait_vector_to_array,
+)
+
+
+def make_vector(user_id, affection=0.5):
+    fields = {name: 0.0 for name in TraitVector.model_fields}
+    fields.update(
+        user_id=user_id,
+        message_count=10,
+        reconnection_attempts=2,
+        affection_level=affection,
+        attachment_style="anxious",
+        dominant_emotion="affection",
+        dominant_communication="none",
+    )
+    return TraitVector(**fields)
+
+
+def test_codec_round_trip():
+    vector = make_vector("u1", affection=0.25)
+    row = trait_vector_to_array(vector)
+
+    assert row.dtype == np.float32 and row.shape == (TRAIT_DIM,)
+    assert array_to_trait_vector(row, "u1") == vector
+
+
+def test_put_get_and_reopen_without_reparsing(tmp_path):
+    store = TraitStore(str(tmp_path))
+    store.put(make_vector("u1", 0.1))
+    store.put(make_vector("u2", 0.2))
+    store.put(make_vector("u1", 0.3))  # 갱신
+    store.flush()
+
+    reopened = TraitStore(str(tmp_path))
+    assert len(reopened) == 2
+    assert reopened.get("u1").affection_level == pytest.approx(0.3)
+    assert reopened.get("missing") is None
+    column = reopened.matrix[:, TRAIT_COLUMNS["affection_level"]]
+    np.testing.assert_allclose(column, [0.3, 0.2], rtol=1e-6)
+
+
+def test_bulk_update_grows_and_is_visible_to_other_instances(tmp_path):
+    writer = TraitStore(str(tmp_path))
+    reader = TraitStore(str(tmp_path))
+    ids = [f"user-{i}" for i in range(3000)]
+    rows = np.random.default_rng(0).random((3000, TRAIT_DIM), dtype=np.float32)
+
+    writer.put_arrays(ids, rows)
+
+    np.testing.assert_array_equal(reader.get_array("user-2999"), rows[2999])
+    assert reader.matrix.shape == (3000, TRAIT_DIM)
+
+
+def test_schema_mismatch_is_rejected(tmp_path):
+    TraitStore(str(tmp_path))
+    (tmp_path / "meta.json").write_text('{"dtype": "float32", "fields": ["x"]}')
+
+    with pytest.raises(ValueError):
+        TraitStore(str(tmp_path))
@@ -0,0 +1,101 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import main
+from core.request_context import RequestContextMiddleware
+from core.usage import UsageMeter, estimate_cost
+from providers import claude_client
+from services.model_router import model_router
+
+
+class FakeResponse:
+    def __init__(self, input_tokens, output_tokens):
+        self.payload = {
+            "model": "claude-3-opus-20240229",
+            "content": [{"type": "text", "text": "ok"}],
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+        }
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def make_app(meter, monkeypatch):
+    monkeypatch.setattr("providers.claude_client.usage_meter", meter)
+    monkeypatch.setattr(
+        "providers.claude_client.requests.post",
+        lambda *args, **kwargs: FakeResponse(100, 50),
+    )
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, on_finish=[meter.finish_request])
+
+    @app.post("/couples/{couple_id}/advice")
+    def advice(couple_id: str, calls: int = 1):
+        target = model_router.resolve("coach", "claude")
+        return [claude_client.ask_claude("hi", target) for _ in range(calls)]
+
+    return app
+
+
+def test_usage_is_attributed_to_route_and_request(monkeypatch):
+    meter = UsageMeter()
+    client = TestClient(make_app(meter, monkeypatch))
+
+    client.post("/couples/1/advice?calls=2", headers={"x-request-id": "req-1"})
+    client.post("/couples/2/advice")
+
+    snapshot = meter.snapshot()
+    (row,) = snapshot["by_route"]
+    assert row["route"] == "/couples/{couple_id}/advice"
+    assert row["calls"] == 3
+    assert row["input_tokens"] == 300 and row["output_tokens"] == 150
+    assert snapshot["total"]["cost_usd"] == round(
+        3 * estimate_cost("claude-3-opus-20240229", 100, 50), 6
+    )
+    request = meter.find_request("req-1")
+    assert request["llm_calls"] == 2
+    assert request["total_tokens"] == 300
+
+
+def test_token_budget_stops_further_llm_calls(monkeypatch):
+    meter = UsageMeter()
+    client = TestClient(make_app(meter, monkeypatch))
+
+    response = client.post(
+        "/couples/1/advice?calls=5",
+        headers={"x-request-id": "req-2", "x-token-budget": "200"},
+    )
+
+    assert response.status_code == 429
+    assert response.json()["tokens_used"] == 300
+    # 예산(200)을 넘긴 뒤에는 더 호출하지 않음
+    assert meter.snapshot()["total"]["calls"] == 2
+
+
+def test_token_budget_is_429_through_service_fallbacks(monkeypatch):
+    # 서비스/라우트의 `except Exception` fallback을 지나 실제 라우트에서 429로 응답
+    monkeypatch.setattr("config.settings.DEFAULT_MODEL", "fake")
+    client = TestClient(main.app)
+    profile = {
+        "age": 28,
+        "interests": ["독서"],
+        "personality": "차분함",
+        "communication_style": "논리적",
+        "love_language": "Quality Time",
+    }
+
+    response = client.post(
+        "/api/v1/enhanced-couple-analysis",
+        headers={"x-token-budget": "50"},
+        json={
+            "user_data": {**profile, "name": "김철수", "mbti": "INTJ"},
+            "partner_data": {**profile, "name": "이영희", "mbti": "ENFP"},
+        },
+    )
+
+    assert response.status_code == 429
+    assert response.json()["token_budget"] == 50
+    assert response.headers["x-request-id"]